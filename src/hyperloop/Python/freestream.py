@@ -0,0 +1,73 @@
+"""
+Freestream thermodynamic state of the air in the tube.
+
+`freestream_state` computes the static and total state seen by a pod moving
+at a given Mach number through tube air at (P, T). It is the single place the
+isentropic freestream relations live: `FlowPathInputs` takes the total state
+it feeds to ``FlowPath.fl_start`` from it and `PodMach` takes the density and
+velocity from it. It only uses numpy arithmetic, so complex-step inputs pass
+through.
+
+Notes
+-----
+This is not a shared solve of the tube and pod flow stations. Every
+`TubeAndPod` pass still runs two pycycle equilibrium solves:
+
+* ``SteadyStateVacuum.fl_start`` takes the tube static pressure and
+  temperature as its total state, at the fixed ``vehicle_mach`` of the
+  vacuum model. This is not the pod freestream station, so it cannot reuse
+  the pod solve. ``vacuum_model='ideal'`` removes it.
+* ``Cycle.FlowPath.fl_start`` solves the pod freestream from the total state
+  of `FlowPathInputs` at ``pod_mach``. ``cycle_model='ideal'`` removes it.
+
+Both solves rerun on every Gauss-Seidel iteration of `TubeAndPod`, because
+``tube.temp_boundary`` changes between iterations. `FlowPathInputs` and
+`PodMach` each evaluate `freestream_state`, which is closed form.
+"""
+from __future__ import print_function
+from collections import namedtuple
+
+import numpy as np
+
+FreestreamProperties = namedtuple('FreestreamProperties', 'Ps Ts Pt Tt rho a V')
+
+
+def freestream_state(P, T, mach, gamma=1.4, R=287.0):
+    """Static and total state of tube air seen by a pod
+
+    Args
+    ----
+    P : float
+        static tube pressure (Pa)
+    T : float
+        static tube temperature (K)
+    mach : float
+        pod Mach number (unitless)
+    gamma : float
+        ratio of specific heats (unitless)
+    R : float
+        gas constant (J/(kg*K))
+
+    Returns
+    -------
+    FreestreamProperties
+        static pressure ``Ps`` (Pa) and temperature ``Ts`` (K), total pressure
+        ``Pt`` (Pa) and temperature ``Tt`` (K), density ``rho`` (kg/m**3),
+        speed of sound ``a`` (m/s) and pod velocity ``V`` (m/s)
+    """
+    ratio = 1.0 + 0.5 * (gamma - 1.0) * mach**2
+    a = np.sqrt(gamma * R * T)
+    return FreestreamProperties(Ps=P, Ts=T,
+                                Pt=P * ratio**(gamma / (gamma - 1.0)),
+                                Tt=T * ratio,
+                                rho=P / (R * T),
+                                a=a,
+                                V=mach * a)
+
+if __name__ == "__main__":
+    state = freestream_state(850.0, 320.0, .8)
+
+    print('Pt  %f Pa' % state.Pt)
+    print('Tt  %f K' % state.Tt)
+    print('rho %f kg/m**3' % state.rho)
+    print('V   %f m/s' % state.V)
@@ -14,17 +14,11 @@ from openmdao.solvers.scipy_gmres import ScipyGMRES
 from openmdao.units.units import convert_units as cu
 from openmdao.api import Problem, LinearGaussSeidel
 
-from pycycle.components import Compressor, Shaft, FlowStart, Inlet, Nozzle, Duct, Splitter, FlightConditions
-from pycycle.species_data import janaf
-from pycycle.connect_flow import connect_flow
-from pycycle.constants import AIR_FUEL_MIX, AIR_MIX
-from pycycle.constants import R_UNIVERSAL_ENG, R_UNIVERSAL_SI
-
 from openmdao.solvers.ln_gauss_seidel import LinearGaussSeidel
 from openmdao.solvers.ln_direct import DirectSolver
 from openmdao.api import SqliteRecorder
 
-from hyperloop.Python.pod.cycle.flow_path import FlowPath
+from hyperloop.Python.pod.cycle.ideal_gas_flow_path import IdealGasFlowPath
 from hyperloop.Python.pod.cycle.compressor_mass import CompressorMass
 from hyperloop.Python.pod.cycle.comp_len import CompressorLen
 from hyperloop.Python.pod.cycle.flow_path_inputs import FlowPathInputs
@@ -71,15 +65,32 @@ class Cycle(Group):
     ----------
     .. [1] Miceahal Tong Correlation used.
 	.. [2] NASA-Glenn NPSS compressor cycle model.
+
+    Notes
+    -----
+    ``cycle_model`` selects the flow path: 'pycycle' for the pycycle
+    `FlowPath`, or 'ideal' for the calorically perfect `IdealGasFlowPath`
+    with ratio of specific heats ``gamma`` and gas constant ``R``, which needs
+    no equilibrium solves and no pycycle install. See ideal_gas_cycle.py for
+    its accuracy.
     """
 
-    def __init__(self):
+    def __init__(self, cycle_model='pycycle', gamma=1.4, R=287.0):
         super(Cycle, self).__init__()
 
+        if cycle_model == 'pycycle':
+            # pycycle is only needed by this model
+            from hyperloop.Python.pod.cycle.flow_path import FlowPath
+            flow_path = FlowPath()
+        elif cycle_model == 'ideal':
+            flow_path = IdealGasFlowPath(gamma, R)
+        else:
+            raise ValueError("cycle_model must be 'pycycle' or 'ideal', not '%s'" % cycle_model)
+
         self.add('CompressorLen', CompressorLen(), promotes=['comp_len'])
         self.add('CompressorMass', CompressorMass(), promotes=['comp_mass'])
         self.add('FlowPathInputs', FlowPathInputs(), promotes=['pod_mach', 'tube_pressure', 'tube_temp', 'comp_inlet_area'])
-        self.add('FlowPath', FlowPath(), promotes=['comp.trq', 'comp.power', 'nozzle.Fg', 'inlet.F_ram',
+        self.add('FlowPath', flow_path, promotes=['comp.trq', 'comp.power', 'nozzle.Fg', 'inlet.F_ram',
                                                     'nozzle.Fl_O:stat:W', 'comp.Fl_O:stat:area', 'comp.map.PRdes', 
                                                     'nozzle.Ps_exhaust', 'nozzle.Fl_O:tot:T'])
         
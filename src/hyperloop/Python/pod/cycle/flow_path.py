@@ -46,6 +46,16 @@ class FlowPath(Group):
         Pressure ratio of compressor
     nozzle.Ps_exhaust : float
         Exit pressure of nozzle
+    inlet.area : float
+        Inlet exit area. Off-design only, taken from the design point
+    comp.area : float
+        Compressor exit area. Off-design only, taken from the design point
+    duct.area : float
+        Duct exit area. Off-design only, taken from the design point
+    comp.s_PR, comp.s_Wc, comp.s_eff, comp.s_Nc : float
+        Compressor map scalars. Off-design only, taken from the design point
+    comp.map.RlineMap : float
+        Compressor operating line. Off-design only, see `OffDesignBalance`
 
     Returns
     -------
@@ -71,11 +81,18 @@ class FlowPath(Group):
     Notes
     -----
     [1] see https://github.com/jcchin/pycycle2/wiki
+
+    With ``design=False`` the inlet, compressor and duct are built in
+    off-design mode: their flow areas and the compressor map scalars become
+    params (see `MultiPointFlowPath`) and the design Mach number targets and
+    ``comp.map.PRdes`` are no longer used.
     """
 
-    def __init__(self):
+    def __init__(self, design=True):
         super(FlowPath, self).__init__()
 
+        self.design = design
+
         des_vars = (('ram_recovery', 0.99),
                     ('effDes', 0.9),
                     ('duct_MN', 0.65),
@@ -90,9 +107,9 @@ class FlowPath(Group):
 
         self.add('fl_start', FlowStart(thermo_data=janaf, elements=AIR_MIX))
         # internal flow
-        self.add('inlet', Inlet(thermo_data=janaf, elements=AIR_MIX))
-        self.add('comp', Compressor(thermo_data=janaf, elements=AIR_MIX))
-        self.add('duct', Duct(thermo_data=janaf, elements=AIR_MIX))
+        self.add('inlet', Inlet(thermo_data=janaf, elements=AIR_MIX, design=design))
+        self.add('comp', Compressor(thermo_data=janaf, elements=AIR_MIX, design=design))
+        self.add('duct', Duct(thermo_data=janaf, elements=AIR_MIX, design=design))
         self.add('nozzle', Nozzle(thermo_data=janaf, elements=AIR_MIX))
         self.add('shaft', Shaft(1))
 
@@ -103,14 +120,17 @@ class FlowPath(Group):
         connect_flow(self, 'duct.Fl_O', 'nozzle.Fl_I')
 
         self.connect('input_vars.ram_recovery', 'inlet.ram_recovery')
-        self.connect('input_vars.effDes', 'comp.map.effDes')
-        self.connect('input_vars.duct_MN', 'duct.MN_target')
         self.connect('input_vars.duct_dPqP', 'duct.dPqP')
         self.connect('input_vars.nozzle_Cfg', 'nozzle.Cfg')
         self.connect('input_vars.nozzle_dPqP', 'nozzle.dPqP')
         self.connect('input_vars.shaft_Nmech', 'shaft.Nmech')
-        self.connect('input_vars.inlet_MN', 'inlet.MN_target')
-        self.connect('input_vars.comp_MN', 'comp.MN_target')
+
+        # Mach targets and map design values only size the design point
+        if design:
+            self.connect('input_vars.effDes', 'comp.map.effDes')
+            self.connect('input_vars.duct_MN', 'duct.MN_target')
+            self.connect('input_vars.inlet_MN', 'inlet.MN_target')
+            self.connect('input_vars.comp_MN', 'comp.MN_target')
 
         self.connect('comp.trq', 'shaft.trq_0')
         self.connect('shaft.Nmech', 'comp.Nmech')
@@ -5,6 +5,7 @@ from __future__ import print_function
 import numpy as np
 
 from openmdao.api import Group, Component, IndepVarComp, Problem
+from hyperloop.Python.freestream import freestream_state
 
 class FlowPathInputs(Component):
     """
@@ -96,9 +97,11 @@ class FlowPathInputs(Component):
         R = params['R']
         eta = params['eta']
 
-        Tt = tube_temp*(1+((gamma-1)/2)*(pod_mach**2))
-        Pt = tube_pressure*((1+((gamma-1)/2)*(pod_mach**2))**(gamma/(gamma-1.0)))
-        rho = tube_pressure/(R*tube_temp)
+        # Total state seen by the pod, see freestream.py
+        state = freestream_state(tube_pressure, tube_temp, pod_mach, gamma, R)
+        Tt = state.Tt
+        Pt = state.Pt
+        rho = state.rho
         rho_t = rho*((1+((gamma-1)/2))**(1/(gamma-1)))
 
         p02 = tube_pressure*((1 + eta*((Tt/tube_temp)-1))**(gamma/(gamma-1)))
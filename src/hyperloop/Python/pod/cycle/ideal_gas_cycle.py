@@ -0,0 +1,112 @@
+"""
+Ideal-gas fast mode of the compressor cycle group in cycle_group.py.
+``Cycle(cycle_model='ideal')``, or `IdealGasCycle` for short, replaces the
+pycycle `FlowPath` with `IdealGasFlowPath`, which uses calorically perfect
+ideal-gas relations and needs no equilibrium solves. Use it for early design
+sweeps and switch back to the pycycle model for final points. `PodGroup` and
+`TubeAndPod` select it with their ``cycle_model`` option.
+
+Accuracy report
+---------------
+Against the NPSS/pycycle values used in test_cycle_group.py (PR 12.6,
+Ps_exhaust 0.05588 psi, M 0.8, 850 Pa, 320 K, inlet area 2.3884 m**2),
+as printed by ``python ideal_gas_cycle.py``:
+
+==============================  =============  =============  ========
+Quantity                        pycycle        ideal gas      error
+==============================  =============  =============  ========
+comp_len (m)                    3.579          3.60439        +0.7%
+comp_mass (kg)                  774.18         774.367        +0.0%
+comp.trq (N*m)                  -2622.13       -2643.69       +0.8%
+comp.power (W)                  -2745896.44    -2768470       +0.8%
+comp.Fl_O:stat:area (m**2)      0.314          0.315432       +0.5%
+nozzle.Fg (N)                   6562.36        6588           +0.4%
+inlet.F_ram (N)                 1855.47        1855.32        -0.0%
+nozzle.Fl_O:tot:T (K)           767.132        787.089        +2.6%
+nozzle.Fl_O:stat:W (kg/s)       6.467          6.46768        +0.0%
+==============================  =============  =============  ========
+
+The constant specific heat overpredicts the compressor exit temperature,
+which is the largest error. Everything else is within about 1%.
+"""
+from __future__ import print_function
+
+from openmdao.api import IndepVarComp, Problem, Group
+from openmdao.units.units import convert_units as cu
+
+from hyperloop.Python.pod.cycle.cycle_group import Cycle
+
+# NPSS/pycycle results of the Cycle group at the design point of test_cycle_group.py
+PYCYCLE_REFERENCE = (('comp_len', 'm', 'm', 3.579),
+                     ('comp_mass', 'kg', 'kg', 774.18),
+                     ('comp.trq', 'ft*lbf', 'N*m', -2622.13),
+                     ('comp.power', 'hp', 'W', -2745896.44),
+                     ('comp.Fl_O:stat:area', 'inch**2', 'm**2', 0.314),
+                     ('nozzle.Fg', 'lbf', 'N', 6562.36),
+                     ('inlet.F_ram', 'lbf', 'N', 1855.47),
+                     ('nozzle.Fl_O:tot:T', 'degR', 'K', 767.132),
+                     ('nozzle.Fl_O:stat:W', 'lbm/s', 'kg/s', 6.467))
+
+
+class IdealGasCycle(Cycle):
+    """
+    `Cycle` with ``cycle_model='ideal'``. It has the same params and returns;
+    see `Cycle`.
+    """
+
+    def __init__(self, gamma=1.4, R=287.0):
+        super(IdealGasCycle, self).__init__(cycle_model='ideal', gamma=gamma, R=R)
+
+
+def accuracy_report():
+    """Runs `IdealGasCycle` at the reference design point of the pycycle `Cycle`
+
+    Returns
+    -------
+    list
+        (name, units, pycycle value, ideal-gas value, relative error) per
+        promoted output, in SI units
+    """
+    prob = Problem()
+    prob.root = Group()
+    prob.root.add('Cycle', IdealGasCycle())
+
+    params = (('comp_PR', 12.6, {'units': 'unitless'}),
+              ('PsE', 0.05588, {'units': 'psi'}),
+              ('pod_mach_number', .8, {'units': 'unitless'}),
+              ('tube_pressure', 850., {'units': 'Pa'}),
+              ('tube_temp', 320., {'units': 'K'}),
+              ('comp_inlet_area', 2.3884, {'units': 'm**2'}))
+
+    prob.root.add('des_vars', IndepVarComp(params))
+
+    prob.root.connect('des_vars.comp_PR', 'Cycle.comp.map.PRdes')
+    prob.root.connect('des_vars.PsE', 'Cycle.nozzle.Ps_exhaust')
+    prob.root.connect('des_vars.pod_mach_number', 'Cycle.pod_mach')
+    prob.root.connect('des_vars.tube_pressure', 'Cycle.tube_pressure')
+    prob.root.connect('des_vars.tube_temp', 'Cycle.tube_temp')
+    prob.root.connect('des_vars.comp_inlet_area', 'Cycle.comp_inlet_area')
+
+    prob.setup(check=False)
+
+    prob['Cycle.CompressorMass.comp_eff'] = 91.0
+    prob['Cycle.CompressorLen.h_stage'] = 58.2
+    prob['Cycle.FlowPathInputs.gamma'] = 1.4
+    prob['Cycle.FlowPathInputs.R'] = 287.
+    prob['Cycle.FlowPathInputs.eta'] = 0.99
+    prob['Cycle.FlowPathInputs.comp_mach'] = 0.6
+
+    prob.run()
+
+    report = []
+    for name, units, si_units, ref in PYCYCLE_REFERENCE:
+        val = float(cu(prob['Cycle.%s' % name], units, si_units))
+        report.append((name, si_units, ref, val, (val - ref) / ref))
+    return report
+
+
+if __name__ == "__main__":
+
+    print('%-30s %14s %14s %8s' % ('Quantity', 'pycycle', 'ideal gas', 'error'))
+    for name, units, ref, val, err in accuracy_report():
+        print('%-30s %14.6g %14.6g %+7.1f%%' % ('%s (%s)' % (name, units), ref, val, 100.0 * err))
@@ -0,0 +1,458 @@
+"""
+A calorically perfect ideal-gas version of the inlet->compressor->duct->nozzle
+flow path in flow_path.py. Every element is a closed-form component, so the
+group runs without any chemical equilibrium or Newton solves.
+
+Element, variable names and units follow pycycle (psi, degR, lbm/s, Btu/lbm,
+inch**2, lbf, hp, ft*lbf) so `IdealGasFlowPath` can replace `FlowPath` inside
+a cycle without changing any connections.
+"""
+from __future__ import print_function
+import numpy as np
+
+from openmdao.api import Component, Group, IndepVarComp, Problem
+from openmdao.units.units import convert_units as cu
+
+# English -> SI conversion factors
+PSI2PA = cu(1.0, 'psi', 'Pa')
+DEGR2K = cu(1.0, 'degR', 'degK')
+LBM2KG = cu(1.0, 'lbm', 'kg')
+FT2M = cu(1.0, 'ft', 'm')
+IN2TOM2 = cu(1.0, 'inch**2', 'm**2')
+BTULBM2JKG = cu(1.0, 'Btu/lbm', 'J/kg')
+LBF2N = cu(1.0, 'lbf', 'N')
+HP2W = cu(1.0, 'hp', 'W')
+FTLBF2NM = cu(1.0, 'ft*lbf', 'N*m')
+
+
+def static_properties(Pt, Tt, W, MN, gamma=1.4, R=287.0):
+    """Static state of a flow station from its total state and Mach number
+
+    Args
+    ----
+    Pt : float
+        total pressure (Pa)
+    Tt : float
+        total temperature (K)
+    W : float
+        mass flow rate (kg/s)
+    MN : float
+        Mach number (unitless)
+    gamma : float
+        ratio of specific heats (unitless)
+    R : float
+        gas constant (J/(kg*K))
+
+    Returns
+    -------
+    tuple
+        static pressure (Pa), static temperature (K), velocity (m/s),
+        density (kg/m**3) and flow area (m**2)
+    """
+    ratio = 1.0 + 0.5 * (gamma - 1.0) * MN**2
+    Ts = Tt / ratio
+    Ps = Pt / ratio**(gamma / (gamma - 1.0))
+    V = MN * np.sqrt(gamma * R * Ts)
+    rho = Ps / (R * Ts)
+    area = W / (rho * V) if V > 0.0 else 0.0
+    return Ps, Ts, V, rho, area
+
+
+class IdealGasElement(Component):
+    """Base for the ideal-gas flow path elements.
+
+    Adds the incoming (``Fl_I``) and outgoing (``Fl_O``) flow station
+    variables used by `connect_ideal_flow`.
+    """
+
+    def __init__(self, gamma=1.4, R=287.0, flow_in=True):
+        super(IdealGasElement, self).__init__()
+
+        self.gamma = gamma
+        self.R = R
+        self.cp = gamma * R / (gamma - 1.0)
+
+        if flow_in:
+            self.add_param('Fl_I:tot:P', val=1.0, desc='incoming total pressure', units='psi')
+            self.add_param('Fl_I:tot:T', val=500.0, desc='incoming total temperature', units='degR')
+            self.add_param('Fl_I:stat:W', val=1.0, desc='incoming mass flow rate', units='lbm/s')
+
+        self.add_output('Fl_O:tot:P', val=1.0, desc='exit total pressure', units='psi')
+        self.add_output('Fl_O:tot:T', val=500.0, desc='exit total temperature', units='degR')
+        self.add_output('Fl_O:tot:h', val=0.0, desc='exit total enthalpy', units='Btu/lbm')
+        self.add_output('Fl_O:stat:P', val=1.0, desc='exit static pressure', units='psi')
+        self.add_output('Fl_O:stat:T', val=500.0, desc='exit static temperature', units='degR')
+        self.add_output('Fl_O:stat:V', val=0.0, desc='exit velocity', units='ft/s')
+        self.add_output('Fl_O:stat:MN', val=0.0, desc='exit Mach number', units='unitless')
+        self.add_output('Fl_O:stat:W', val=1.0, desc='exit mass flow rate', units='lbm/s')
+        self.add_output('Fl_O:stat:area', val=0.0, desc='exit flow area', units='inch**2')
+
+    def _inflow(self, params):
+        """Incoming total state in SI units"""
+        return (params['Fl_I:tot:P'] * PSI2PA,
+                params['Fl_I:tot:T'] * DEGR2K,
+                params['Fl_I:stat:W'] * LBM2KG)
+
+    def _set_outflow(self, unknowns, Pt, Tt, W, MN):
+        """Sets the exit flow station from a total state and Mach number in SI units"""
+        Ps, Ts, V, rho, area = static_properties(Pt, Tt, W, MN, self.gamma, self.R)
+
+        unknowns['Fl_O:tot:P'] = Pt / PSI2PA
+        unknowns['Fl_O:tot:T'] = Tt / DEGR2K
+        unknowns['Fl_O:tot:h'] = self.cp * Tt / BTULBM2JKG
+        unknowns['Fl_O:stat:P'] = Ps / PSI2PA
+        unknowns['Fl_O:stat:T'] = Ts / DEGR2K
+        unknowns['Fl_O:stat:V'] = V / FT2M
+        unknowns['Fl_O:stat:MN'] = MN
+        unknowns['Fl_O:stat:W'] = W / LBM2KG
+        unknowns['Fl_O:stat:area'] = area / IN2TOM2
+
+
+class IdealFlowStart(IdealGasElement):
+    """
+    Freestream flow station.
+
+    Params
+    ------
+    P : float
+        Total pressure (psi)
+    T : float
+        Total temperature (degR)
+    W : float
+        Mass flow rate (lbm/s)
+    MN_target : float
+        Freestream Mach number (unitless)
+    """
+
+    def __init__(self, gamma=1.4, R=287.0):
+        super(IdealFlowStart, self).__init__(gamma, R, flow_in=False)
+
+        self.add_param('P', val=0.1879, desc='total pressure', units='psi')
+        self.add_param('T', val=605.06, desc='total temperature', units='degR')
+        self.add_param('W', val=7.2673, desc='mass flow rate', units='lbm/s')
+        self.add_param('MN_target', val=0.8, desc='freestream Mach number', units='unitless')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self._set_outflow(unknowns, params['P'] * PSI2PA, params['T'] * DEGR2K,
+                          params['W'] * LBM2KG, params['MN_target'])
+
+
+class IdealInlet(IdealGasElement):
+    """
+    Inlet with a fixed total pressure recovery.
+
+    Params
+    ------
+    ram_recovery : float
+        Total pressure recovery (unitless)
+    MN_target : float
+        Exit Mach number (unitless)
+    Fl_I:stat:V : float
+        Freestream velocity (ft/s)
+
+    Returns
+    -------
+    F_ram : float
+        Ram drag (lbf)
+    """
+
+    def __init__(self, gamma=1.4, R=287.0):
+        super(IdealInlet, self).__init__(gamma, R)
+
+        self.add_param('Fl_I:stat:V', val=0.0, desc='freestream velocity', units='ft/s')
+        self.add_param('ram_recovery', val=0.99, desc='total pressure recovery', units='unitless')
+        self.add_param('MN_target', val=0.6, desc='exit Mach number', units='unitless')
+
+        self.add_output('F_ram', val=0.0, desc='ram drag', units='lbf')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        Pt, Tt, W = self._inflow(params)
+
+        self._set_outflow(unknowns, params['ram_recovery'] * Pt, Tt, W, params['MN_target'])
+        unknowns['F_ram'] = W * params['Fl_I:stat:V'] * FT2M / LBF2N
+
+
+class IdealCompressorMap(Component):
+    """
+    Design point compressor map: passes the design pressure ratio and
+    adiabatic efficiency on to the compressor.
+
+    Params
+    ------
+    PRdes : float
+        Design pressure ratio (unitless)
+    effDes : float
+        Design adiabatic efficiency (unitless)
+
+    Returns
+    -------
+    PR : float
+        Pressure ratio (unitless)
+    eff : float
+        Adiabatic efficiency (unitless)
+    """
+
+    def __init__(self):
+        super(IdealCompressorMap, self).__init__()
+
+        self.add_param('PRdes', val=12.5, desc='design pressure ratio', units='unitless')
+        self.add_param('effDes', val=0.9, desc='design adiabatic efficiency', units='unitless')
+
+        self.add_output('PR', val=12.5, desc='pressure ratio', units='unitless')
+        self.add_output('eff', val=0.9, desc='adiabatic efficiency', units='unitless')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['PR'] = params['PRdes']
+        unknowns['eff'] = params['effDes']
+
+
+class IdealCompressorPerf(IdealGasElement):
+    """
+    Adiabatic compression with a given pressure ratio and efficiency.
+
+    Params
+    ------
+    PR : float
+        Pressure ratio (unitless)
+    eff : float
+        Adiabatic efficiency (unitless)
+    Nmech : float
+        Shaft speed (rpm)
+    MN_target : float
+        Exit Mach number (unitless)
+
+    Returns
+    -------
+    power : float
+        Shaft power, negative when absorbed by the compressor (hp)
+    trq : float
+        Shaft torque (ft*lbf)
+    """
+
+    def __init__(self, gamma=1.4, R=287.0):
+        super(IdealCompressorPerf, self).__init__(gamma, R)
+
+        self.add_param('PR', val=12.5, desc='pressure ratio', units='unitless')
+        self.add_param('eff', val=0.9, desc='adiabatic efficiency', units='unitless')
+        self.add_param('Nmech', val=10000.0, desc='shaft speed', units='rpm')
+        self.add_param('MN_target', val=0.65, desc='exit Mach number', units='unitless')
+
+        self.add_output('power', val=0.0, desc='shaft power', units='hp')
+        self.add_output('trq', val=0.0, desc='shaft torque', units='ft*lbf')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        Pt, Tt, W = self._inflow(params)
+        PR = params['PR']
+
+        Tt_out = Tt * (1.0 + (PR**((self.gamma - 1.0) / self.gamma) - 1.0) / params['eff'])
+        power = -W * self.cp * (Tt_out - Tt)
+        omega = params['Nmech'] * 2.0 * np.pi / 60.0
+
+        self._set_outflow(unknowns, PR * Pt, Tt_out, W, params['MN_target'])
+        unknowns['power'] = power / HP2W
+        unknowns['trq'] = power / omega / FTLBF2NM
+
+
+class IdealCompressor(Group):
+    """
+    Compressor element: a design point `IdealCompressorMap` (``comp.map``)
+    feeding `IdealCompressorPerf`.
+    """
+
+    def __init__(self, gamma=1.4, R=287.0):
+        super(IdealCompressor, self).__init__()
+
+        self.add('map', IdealCompressorMap())
+        self.add('perf', IdealCompressorPerf(gamma, R), promotes=['*'])
+
+        self.connect('map.PR', 'PR')
+        self.connect('map.eff', 'eff')
+
+
+class IdealDuct(IdealGasElement):
+    """
+    Duct with a fractional total pressure loss.
+
+    Params
+    ------
+    dPqP : float
+        Total pressure loss (unitless)
+    MN_target : float
+        Exit Mach number (unitless)
+    """
+
+    def __init__(self, gamma=1.4, R=287.0):
+        super(IdealDuct, self).__init__(gamma, R)
+
+        self.add_param('dPqP', val=0.0, desc='total pressure loss', units='unitless')
+        self.add_param('MN_target', val=0.65, desc='exit Mach number', units='unitless')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        Pt, Tt, W = self._inflow(params)
+
+        self._set_outflow(unknowns, Pt * (1.0 - params['dPqP']), Tt, W, params['MN_target'])
+
+
+class IdealNozzle(IdealGasElement):
+    """
+    Convergent-divergent nozzle, fully expanded to the exhaust pressure.
+
+    Params
+    ------
+    Ps_exhaust : float
+        Exhaust static pressure (psi)
+    Cfg : float
+        Gross thrust coefficient (unitless)
+    dPqP : float
+        Total pressure loss (unitless)
+
+    Returns
+    -------
+    Fg : float
+        Gross thrust (lbf)
+    """
+
+    def __init__(self, gamma=1.4, R=287.0):
+        super(IdealNozzle, self).__init__(gamma, R)
+
+        self.add_param('Ps_exhaust', val=0.05588, desc='exhaust static pressure', units='psi')
+        self.add_param('Cfg', val=1.0, desc='gross thrust coefficient', units='unitless')
+        self.add_param('dPqP', val=0.0, desc='total pressure loss', units='unitless')
+
+        self.add_output('Fg', val=0.0, desc='gross thrust', units='lbf')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        Pt, Tt, W = self._inflow(params)
+        Pt = Pt * (1.0 - params['dPqP'])
+        Ps = params['Ps_exhaust'] * PSI2PA
+
+        # no expansion (and no thrust) if the exhaust is above the plenum pressure
+        Ts = Tt * min(Ps / Pt, 1.0)**((self.gamma - 1.0) / self.gamma)
+        MN = np.sqrt(2.0 / (self.gamma - 1.0) * (Tt / Ts - 1.0))
+
+        self._set_outflow(unknowns, Pt, Tt, W, MN)
+        unknowns['Fg'] = params['Cfg'] * W * unknowns['Fl_O:stat:V'] * FT2M / LBF2N
+
+
+def connect_ideal_flow(group, fl_src, fl_target):
+    """Connects the total state and mass flow of one ideal-gas flow station
+    to the next element, like pycycle's `connect_flow`."""
+    for var in ('tot:P', 'tot:T', 'stat:W'):
+        group.connect('%s:%s' % (fl_src, var), '%s:%s' % (fl_target, var))
+
+
+class IdealGasFlowPath(Group):
+    """
+    Params
+    ------
+    fl_start.P : float
+        Tube total pressure (psi)
+    fl_start.T : float
+        Tube total temperature (degR)
+    fl_start.W : float
+        Tube total mass flow (lbm/s)
+    fl_start.MN_target : float
+        Vehicle mach number
+    comp.map.PRdes : float
+        Pressure ratio of compressor
+    nozzle.Ps_exhaust : float
+        Exit pressure of nozzle (psi)
+
+    Returns
+    -------
+    comp.trq : float
+        Total torque required by motor (ft*lbf)
+    comp.power : float
+        Total power required by motor (hp)
+    comp.Fl_O:stat:area : float
+        Area of the duct (inch**2)
+    nozzle.Fg : float
+        Nozzle thrust (lbf)
+    inlet.F_ram : float
+        Ram drag (lbf)
+    nozzle.Fl_O:tot:T : float
+        Total temperature at nozzle exit (degR)
+    nozzle.Fl_O:stat:W : float
+        Total mass flow rate at nozzle exit (lbm/s)
+    inlet.Fl_O:tot:h : float
+        Inlet enthalpy of compressor (Btu/lbm)
+    comp.Fl_O:tot:h : float
+        Exit enthalpy of compressor (Btu/lbm)
+
+    Notes
+    -----
+    Uses the same design values as `FlowPath`. Enthalpies are referenced to
+    h = 0 at 0 K, so only enthalpy differences match pycycle.
+    """
+
+    def __init__(self, gamma=1.4, R=287.0):
+        super(IdealGasFlowPath, self).__init__()
+
+        des_vars = (('ram_recovery', 0.99),
+                    ('effDes', 0.9),
+                    ('duct_MN', 0.65),
+                    ('duct_dPqP', 0.),
+                    ('nozzle_Cfg', 1.0),
+                    ('nozzle_dPqP', 0.),
+                    ('shaft_Nmech', 10000.),
+                    ('inlet_MN', 0.6),
+                    ('comp_MN', 0.65))
+
+        self.add('input_vars', IndepVarComp(des_vars))
+
+        self.add('fl_start', IdealFlowStart(gamma, R))
+        self.add('inlet', IdealInlet(gamma, R))
+        self.add('comp', IdealCompressor(gamma, R))
+        self.add('duct', IdealDuct(gamma, R))
+        self.add('nozzle', IdealNozzle(gamma, R))
+
+        # connect components
+        connect_ideal_flow(self, 'fl_start.Fl_O', 'inlet.Fl_I')
+        connect_ideal_flow(self, 'inlet.Fl_O', 'comp.Fl_I')
+        connect_ideal_flow(self, 'comp.Fl_O', 'duct.Fl_I')
+        connect_ideal_flow(self, 'duct.Fl_O', 'nozzle.Fl_I')
+        self.connect('fl_start.Fl_O:stat:V', 'inlet.Fl_I:stat:V')
+
+        self.connect('input_vars.ram_recovery', 'inlet.ram_recovery')
+        self.connect('input_vars.effDes', 'comp.map.effDes')
+        self.connect('input_vars.duct_MN', 'duct.MN_target')
+        self.connect('input_vars.duct_dPqP', 'duct.dPqP')
+        self.connect('input_vars.nozzle_Cfg', 'nozzle.Cfg')
+        self.connect('input_vars.nozzle_dPqP', 'nozzle.dPqP')
+        self.connect('input_vars.shaft_Nmech', 'comp.Nmech')
+        self.connect('input_vars.inlet_MN', 'inlet.MN_target')
+        self.connect('input_vars.comp_MN', 'comp.MN_target')
+
+
+if __name__ == "__main__":
+
+    prob = Problem()
+    root = prob.root = Group()
+
+    root.add('FlowPath', IdealGasFlowPath())
+
+    params = (('P', .1879, {'units': 'psi'}),
+              ('T', 605.06, {'units': 'degR'}),
+              ('W', 7.2673, {'units': 'kg/s'}),
+              ('vehicleMach', 0.8),
+              ('PRdes', 12.5),
+              ('PsE', 0.05588, {'units': 'psi'}))
+
+    prob.root.add('des_vars', IndepVarComp(params))
+
+    prob.root.connect('des_vars.P', 'FlowPath.fl_start.P')
+    prob.root.connect('des_vars.T', 'FlowPath.fl_start.T')
+    prob.root.connect('des_vars.W', 'FlowPath.fl_start.W')
+    prob.root.connect('des_vars.vehicleMach', 'FlowPath.fl_start.MN_target')
+    prob.root.connect('des_vars.PRdes', 'FlowPath.comp.map.PRdes')
+    prob.root.connect('des_vars.PsE', 'FlowPath.nozzle.Ps_exhaust')
+
+    prob.setup()
+    prob.run()
+
+    print("Compressor Power Reqd: %.6f hp" % (prob['FlowPath.comp.power']))
+    print("Compressor trq:        %.6f ft*lbf" % (prob['FlowPath.comp.trq']))
+    print("Compressor Area:       %.6f in^2" % (prob['FlowPath.comp.Fl_O:stat:area']))
+    print("Nozzle Exit Tt:        %.6f degR" % (prob['FlowPath.nozzle.Fl_O:tot:T']))
+    print("Nozzle Thrust:         %.6f lb" % prob['FlowPath.nozzle.Fg'])
+    print("Inlet Ram Drag:        %.6f lb" % prob['FlowPath.inlet.F_ram'])
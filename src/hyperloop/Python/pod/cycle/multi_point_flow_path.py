@@ -0,0 +1,350 @@
+"""
+Multi-point evaluation of the pod compressor flow path.
+The compressor, inlet and duct are sized once at a design point and the
+resulting geometry is shared with N off-design copies of `FlowPath` that run
+as subsystems of a `ParallelGroup`, so a single model returns the power and
+thrust at every operating point along the route.
+
+At a fixed shaft speed the off-design mass flow and compressor operating
+line are unknowns. Each off-design point closes them with an
+`OffDesignBalance` and its own Newton solver: the nozzle keeps the design
+exit area and the compressor flow matches its map.
+"""
+from __future__ import print_function
+import numpy as np
+
+from openmdao.api import Component, Group, ParallelGroup, IndepVarComp, Problem, Newton, ScipyGMRES
+from openmdao.units.units import convert_units as cu
+
+from hyperloop.Python.pod.cycle.flow_path import FlowPath
+from hyperloop.Python.pod.cycle.flow_path_inputs import FlowPathInputs
+
+# Design point geometry handed to every off-design point
+SHARED_MAP_SCALARS = ('s_PR', 's_Wc', 's_eff', 's_Nc')
+SHARED_AREAS = (('inlet.Fl_O:stat:area', 'inlet.area'),
+                ('comp.Fl_O:stat:area', 'comp.area'),
+                ('duct.Fl_O:stat:area', 'duct.area'))
+
+# Sea level standard day used by the compressor corrected flow
+P_STD = 14.696  # psi
+T_STD = 518.67  # degR
+
+
+class OffDesignBalance(Component):
+    """Closes an off-design point at a fixed shaft speed with the mass flow
+    and the compressor operating line as states.
+
+    Params
+    ------
+    nozzle_area : float
+        Nozzle exit area of this point (inch**2)
+    nozzle_area_des : float
+        Nozzle exit area of the design point (inch**2)
+    Pt : float
+        Compressor inlet total pressure (psi)
+    Tt : float
+        Compressor inlet total temperature (degR)
+    W_in : float
+        Compressor inlet mass flow (lbm/s)
+    WcMap : float
+        Corrected flow read from the compressor map (lbm/s)
+    s_Wc : float
+        Compressor map flow scalar of the design point (unitless)
+
+    Unknowns
+    --------
+    W : float
+        Mass flow through the flow path (lbm/s)
+    RlineMap : float
+        Compressor operating line (unitless)
+    """
+
+    def __init__(self):
+        super(OffDesignBalance, self).__init__()
+        self.deriv_options['type'] = 'fd'
+
+        self.add_state('W', val=16.0, desc='mass flow rate', units='lbm/s')
+        self.add_state('RlineMap', val=2.0, desc='compressor operating line', units='unitless')
+
+        self.add_param('nozzle_area', val=1.0, desc='nozzle exit area', units='inch**2')
+        self.add_param('nozzle_area_des', val=1.0, desc='design nozzle exit area', units='inch**2')
+        self.add_param('Pt', val=1.0, desc='compressor inlet total pressure', units='psi')
+        self.add_param('Tt', val=500.0, desc='compressor inlet total temperature', units='degR')
+        self.add_param('W_in', val=1.0, desc='compressor inlet mass flow', units='lbm/s')
+        self.add_param('WcMap', val=1.0, desc='map corrected flow', units='lbm/s')
+        self.add_param('s_Wc', val=1.0, desc='map flow scalar', units='unitless')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        pass
+
+    def apply_nonlinear(self, params, unknowns, resids):
+        Wc = params['W_in'] * np.sqrt(params['Tt'] / T_STD) / (params['Pt'] / P_STD)
+        Wc_map = params['s_Wc'] * params['WcMap']
+
+        resids['W'] = (params['nozzle_area'] - params['nozzle_area_des']) / params['nozzle_area_des']
+        resids['RlineMap'] = (Wc - Wc_map) / Wc_map
+
+
+class FlowPathPoint(Group):
+    """
+    A single operating point: `FlowPathInputs` feeding a `FlowPath`.
+
+    Off-design points take their mass flow and compressor operating line from
+    an `OffDesignBalance` solved by the point's own Newton solver, since the
+    design Mach number targets no longer set them.
+
+    Params
+    ------
+    pod_mach : float
+        Vehicle mach number (unitless)
+    tube_pressure : float
+        Tube static pressure (Pa)
+    tube_temp : float
+        Tube static temperature (K)
+    comp_inlet_area : float
+        Inlet area of compressor (m**2)
+    nozzle.Ps_exhaust : float
+        Exit pressure of nozzle (psi)
+    comp.map.PRdes : float
+        Pressure ratio of compressor. Design point only (unitless)
+
+    Returns
+    -------
+    comp.power : float
+        Total power required by motor (hp)
+    comp.trq : float
+        Total torque required by motor (ft*lbf)
+    nozzle.Fg : float
+        Nozzle thrust (lbf)
+    inlet.F_ram : float
+        Ram drag (lbf)
+    nozzle_area_des : float
+        Nozzle exit area of the design point. Off-design only (inch**2)
+    s_Wc : float
+        Compressor map flow scalar of the design point. Off-design only
+    """
+
+    def __init__(self, design=True):
+        super(FlowPathPoint, self).__init__()
+
+        self.add('FlowPathInputs', FlowPathInputs(), promotes=['pod_mach', 'tube_pressure', 'tube_temp',
+                                                                'comp_inlet_area'])
+        promotes = ['comp.trq', 'comp.power', 'nozzle.Fg', 'inlet.F_ram', 'nozzle.Ps_exhaust']
+        if design:
+            promotes.append('comp.map.PRdes')
+        self.add('FlowPath', FlowPath(design=design), promotes=promotes)
+
+        self.connect('pod_mach', 'FlowPath.fl_start.MN_target')
+        self.connect('FlowPathInputs.Pt', 'FlowPath.fl_start.P')
+        self.connect('FlowPathInputs.Tt', 'FlowPath.fl_start.T')
+
+        if design:
+            self.connect('FlowPathInputs.m_dot', 'FlowPath.fl_start.W')
+            return
+
+        self.add('balance', OffDesignBalance(), promotes=['nozzle_area_des', 's_Wc'])
+        self.connect('balance.W', 'FlowPath.fl_start.W')
+        self.connect('balance.RlineMap', 'FlowPath.comp.map.RlineMap')
+        self.connect('FlowPath.nozzle.Fl_O:stat:area', 'balance.nozzle_area')
+        self.connect('FlowPath.inlet.Fl_O:tot:P', 'balance.Pt')
+        self.connect('FlowPath.inlet.Fl_O:tot:T', 'balance.Tt')
+        self.connect('FlowPath.inlet.Fl_O:stat:W', 'balance.W_in')
+        self.connect('FlowPath.comp.map.readMap.WcMap', 'balance.WcMap')
+
+        self.nl_solver = Newton()
+        self.nl_solver.options['maxiter'] = 50
+        self.nl_solver.options['atol'] = 1e-8
+        self.nl_solver.options['rtol'] = 1e-8
+
+        self.ln_solver = ScipyGMRES()
+        self.ln_solver.options['maxiter'] = 100
+
+
+class MultiPointOutputs(Component):
+    """
+    Collects the per-point scalar outputs of the off-design points into arrays.
+
+    Params
+    ------
+    power<i> : float
+        Compressor power of point i (hp)
+    Fg<i> : float
+        Nozzle thrust of point i (lbf)
+    F_ram<i> : float
+        Ram drag of point i (lbf)
+
+    Returns
+    -------
+    od_power : ndarray
+        Compressor power per operating point (W). Negative, as in `FlowPath`
+    od_Fg : ndarray
+        Nozzle gross thrust per operating point (N)
+    od_F_ram : ndarray
+        Inlet ram drag per operating point (N)
+    od_net_thrust : ndarray
+        Nozzle thrust minus ram drag per operating point (N)
+    """
+
+    def __init__(self, num_points):
+        super(MultiPointOutputs, self).__init__()
+
+        self.num_points = num_points
+
+        for i in range(num_points):
+            self.add_param('power%d' % i, val=0.0, desc='compressor power of point %d' % i, units='hp')
+            self.add_param('Fg%d' % i, val=0.0, desc='nozzle thrust of point %d' % i, units='lbf')
+            self.add_param('F_ram%d' % i, val=0.0, desc='ram drag of point %d' % i, units='lbf')
+
+        self.add_output('od_power', val=np.zeros(num_points), desc='compressor power per point', units='W')
+        self.add_output('od_Fg', val=np.zeros(num_points), desc='nozzle thrust per point', units='N')
+        self.add_output('od_F_ram', val=np.zeros(num_points), desc='ram drag per point', units='N')
+        self.add_output('od_net_thrust', val=np.zeros(num_points), desc='net thrust per point', units='N')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        n = self.num_points
+
+        power = np.array([params['power%d' % i] for i in range(n)], dtype=float)
+        Fg = np.array([params['Fg%d' % i] for i in range(n)], dtype=float)
+        F_ram = np.array([params['F_ram%d' % i] for i in range(n)], dtype=float)
+
+        unknowns['od_power'] = cu(power, 'hp', 'W')
+        unknowns['od_Fg'] = cu(Fg, 'lbf', 'N')
+        unknowns['od_F_ram'] = cu(F_ram, 'lbf', 'N')
+        unknowns['od_net_thrust'] = unknowns['od_Fg'] - unknowns['od_F_ram']
+
+
+class MultiPointFlowPath(Group):
+    """
+    Sizes the flow path at a design point and evaluates it at `num_points`
+    off-design operating points.
+
+    The design point is a `FlowPathPoint` built in design mode. Its inlet,
+    compressor and duct flow areas and the compressor map scalars are
+    connected to every off-design point, so all points share one geometry.
+    Each off-design point converges its own mass flow and compressor
+    operating line with a Newton solver, holding the design nozzle exit area
+    at the shaft speed of the design point. Run at the design condition, an
+    off-design point reproduces the design point.
+    The off-design points live in a `ParallelGroup`; under MPI
+    (``mpirun -n <num_points + 1>`` with ``PETScImpl``) each point is solved
+    on its own process, otherwise the points run one after another.
+
+    Params
+    ------
+    pod_mach : float
+        Design vehicle mach number (unitless)
+    tube_pressure : float
+        Design tube static pressure (Pa)
+    tube_temp : float
+        Design tube static temperature (K)
+    comp_inlet_area : float
+        Inlet area of compressor, shared by all points (m**2)
+    comp.map.PRdes : float
+        Design pressure ratio of compressor (unitless)
+    nozzle.Ps_exhaust : float
+        Exit pressure of nozzle, shared by all points (psi)
+    od_pod_mach : ndarray
+        Vehicle mach number at each off-design point (unitless)
+    od_tube_pressure : ndarray
+        Tube static pressure at each off-design point (Pa)
+    od_tube_temp : ndarray
+        Tube static temperature at each off-design point (K)
+
+    Returns
+    -------
+    comp.power : float
+        Design point compressor power (hp)
+    nozzle.Fg : float
+        Design point nozzle thrust (lbf)
+    inlet.F_ram : float
+        Design point ram drag (lbf)
+    od_power : ndarray
+        Compressor power per off-design point (W)
+    od_Fg : ndarray
+        Nozzle thrust per off-design point (N)
+    od_F_ram : ndarray
+        Ram drag per off-design point (N)
+    od_net_thrust : ndarray
+        Nozzle thrust minus ram drag per off-design point (N)
+
+    Notes
+    -----
+    Off-design variable names follow the pycycle design/off-design convention
+    (``comp.s_PR``, ``comp.s_Wc``, ``comp.s_eff``, ``comp.s_Nc`` and the
+    element ``area`` params).
+    """
+
+    def __init__(self, num_points=3):
+        super(MultiPointFlowPath, self).__init__()
+
+        self.num_points = num_points
+
+        od_vars = (('od_pod_mach', 0.8 * np.ones(num_points), {'units': 'unitless'}),
+                   ('od_tube_pressure', 850.0 * np.ones(num_points), {'units': 'Pa'}),
+                   ('od_tube_temp', 320.0 * np.ones(num_points), {'units': 'K'}))
+        self.add('od_vars', IndepVarComp(od_vars), promotes=['od_pod_mach', 'od_tube_pressure', 'od_tube_temp'])
+
+        self.add('design', FlowPathPoint(design=True), promotes=['pod_mach', 'tube_pressure', 'tube_temp',
+                                                                 'comp_inlet_area', 'comp.power', 'comp.trq',
+                                                                 'nozzle.Fg', 'inlet.F_ram', 'nozzle.Ps_exhaust',
+                                                                 'comp.map.PRdes'])
+
+        off_design = self.add('off_design', ParallelGroup(), promotes=['comp_inlet_area', 'nozzle.Ps_exhaust'])
+        self.add('outputs', MultiPointOutputs(num_points), promotes=['od_power', 'od_Fg', 'od_F_ram',
+                                                                     'od_net_thrust'])
+
+        for i in range(num_points):
+            name = 'pt%d' % i
+            off_design.add(name, FlowPathPoint(design=False), promotes=['comp_inlet_area', 'nozzle.Ps_exhaust'])
+            pt = 'off_design.%s' % name
+
+            self.connect('od_pod_mach', '%s.pod_mach' % pt, src_indices=[i])
+            self.connect('od_tube_pressure', '%s.tube_pressure' % pt, src_indices=[i])
+            self.connect('od_tube_temp', '%s.tube_temp' % pt, src_indices=[i])
+
+            # Share the design point geometry
+            for scalar in SHARED_MAP_SCALARS:
+                self.connect('design.FlowPath.comp.%s' % scalar, '%s.FlowPath.comp.%s' % (pt, scalar))
+            self.connect('design.FlowPath.comp.s_Wc', '%s.s_Wc' % pt)
+            self.connect('design.FlowPath.nozzle.Fl_O:stat:area', '%s.nozzle_area_des' % pt)
+            for src, tgt in SHARED_AREAS:
+                self.connect('design.FlowPath.%s' % src, '%s.FlowPath.%s' % (pt, tgt))
+
+            self.connect('%s.comp.power' % pt, 'outputs.power%d' % i)
+            self.connect('%s.nozzle.Fg' % pt, 'outputs.Fg%d' % i)
+            self.connect('%s.inlet.F_ram' % pt, 'outputs.F_ram%d' % i)
+
+
+if __name__ == "__main__":
+
+    prob = Problem()
+    root = prob.root = Group()
+
+    root.add('MultiPoint', MultiPointFlowPath(num_points=3))
+
+    params = (('comp_PR', 12.6, {'units': 'unitless'}),
+              ('PsE', 0.05588, {'units': 'psi'}),
+              ('pod_mach_number', .8, {'units': 'unitless'}),
+              ('tube_pressure', 850., {'units': 'Pa'}),
+              ('tube_temp', 320., {'units': 'K'}),
+              ('comp_inlet_area', 2.3884, {'units': 'm**2'}))
+
+    prob.root.add('des_vars', IndepVarComp(params))
+
+    prob.root.connect('des_vars.comp_PR', 'MultiPoint.comp.map.PRdes')
+    prob.root.connect('des_vars.PsE', 'MultiPoint.nozzle.Ps_exhaust')
+    prob.root.connect('des_vars.pod_mach_number', 'MultiPoint.pod_mach')
+    prob.root.connect('des_vars.tube_pressure', 'MultiPoint.tube_pressure')
+    prob.root.connect('des_vars.tube_temp', 'MultiPoint.tube_temp')
+    prob.root.connect('des_vars.comp_inlet_area', 'MultiPoint.comp_inlet_area')
+
+    prob.setup()
+
+    prob['MultiPoint.od_pod_mach'] = np.array([0.6, 0.7, 0.8])
+
+    prob.run()
+
+    print('Design power     %f W' % (cu(prob['MultiPoint.comp.power'], 'hp', 'W')))
+    print('Off-design mach  %s' % prob['MultiPoint.od_pod_mach'])
+    print('Off-design power %s W' % prob['MultiPoint.od_power'])
+    print('Off-design net thrust %s N' % prob['MultiPoint.od_net_thrust'])
@@ -1,7 +1,106 @@
 import numpy as np
-import scipy.interpolate, scipy.integrate
 from openmdao.api import Component, Problem, Group
-import os
+
+from hyperloop.Python.pod.drivetrain.discharge_curve import load_discharge_curve
+from hyperloop.Python.pod.drivetrain import cell_database
+
+
+def total_discharge(time, current):
+    """Total discharge (A*h) of a constant `current` (A) load over `time` (h)"""
+    return time * current
+
+
+def size_batteries(des_power, des_current, des_time, time_of_flight, q_l=0.1, q_n=None,
+                   e_nom=None, battery_cross_section_area=15000.0, curve=None, cell=None):
+    """Sizes battery packs for arrays of design points in one vectorized pass
+
+    Uses the same model as `Battery`. All array arguments broadcast against
+    each other, so a whole set of mission variants is sized at once.
+
+    Args
+    ----
+    des_power : float or ndarray
+        design power (W)
+    des_current : float or ndarray
+        design current (A)
+    des_time : float or ndarray
+        time until design power point (h)
+    time_of_flight : float or ndarray
+        total mission time (h)
+    q_l : float or ndarray
+        discharge limit (unitless)
+    q_n : float or ndarray
+        single cell capacity (A*h). Defaults to 3.5
+    e_nom : float or ndarray
+        voltage at end of nominal voltage (V). Defaults to 1.2
+    battery_cross_section_area : float or ndarray
+        cross_sectional area of battery used to compute length (cm^2)
+    curve : DischargeCurve
+        single cell discharge curve. Defaults to the 18650 curve
+    cell : str
+        key of a cell in `cell_database`. The cell's discharge curve,
+        capacity, nominal voltage, mass, volume and cost replace `curve`,
+        `q_n`, `e_nom` and the generic li-ion density and cost figures, so
+        passing any of those with `cell` raises a `ValueError`
+
+    Returns
+    -------
+    dict
+        ``n_cells`` (unitless), ``battery_mass`` (kg), ``battery_volume``
+        (cm^3), ``output_voltage`` (V), ``battery_cost`` (USD) and
+        ``battery_length`` (cm), each an ndarray of the broadcast shape
+    """
+    if cell is not None:
+        if q_n is not None or e_nom is not None or curve is not None:
+            raise ValueError('q_n, e_nom and curve are taken from cell %r, do not pass them' % cell)
+        spec = cell_database.get_cell(cell)
+        curve = cell_database.get_curve(cell)
+        q_n = spec.capacity
+        e_nom = spec.e_nom
+    else:
+        q_n = 3.5 if q_n is None else q_n
+        e_nom = 1.2 if e_nom is None else e_nom
+        curve = load_discharge_curve() if curve is None else curve
+
+    # FIXME using ceiling for cell calculations, despite advice against
+    # need to change to proper way of constraining to integer values as
+    # battery falls apart for n_paralell < 0 (i.e. if n_paralell = 0.01 and
+    # not 1.0, then we get absurd output voltage levels
+    cap_discharge = total_discharge(np.asarray(time_of_flight, dtype=float), des_current)
+    n_parallel = cap_discharge / (q_n * (1 - q_l))
+    single_bat_current = des_current / n_parallel
+    single_bat_discharge = total_discharge(des_time, single_bat_current)
+
+    # single battery power at design power point
+    v_batt = curve.voltage(single_bat_discharge)
+    p_bat = v_batt * single_bat_current
+    energy_cap = curve.energy(single_bat_discharge)
+
+    # total number of battery cells
+    n_cells = np.ceil(des_power / p_bat)
+    n_parallel = np.ceil(n_parallel)
+    n_series = np.ceil(n_cells / n_parallel)
+
+    # calculate mass and volume of cells, accounting for hexagonal packing
+    # efficiency of 0.9069
+    if cell is not None:
+        battery_mass = n_cells * spec.mass / 1000.0
+        battery_volume = n_cells * cell_database.cell_volume(spec) / 0.9069
+        battery_cost = n_cells * spec.cost
+    else:
+        # rough approx of li-ion energy density
+        # TODO dev real model
+        battery_mass = energy_cap * n_cells / 265
+        battery_volume = energy_cap * n_cells / 730 * 1000 / 0.9069
+        battery_cost = n_cells * 12.95
+
+    return {'n_cells': n_cells,
+            'battery_mass': battery_mass,
+            'battery_volume': battery_volume,
+            # output voltage of battery in the nominal zone
+            'output_voltage': n_series * e_nom,
+            'battery_cost': battery_cost,
+            'battery_length': battery_volume / battery_cross_section_area}
 
 
 class Battery(Component):
@@ -66,6 +165,13 @@ class Battery(Component):
 
     Battery cost based on purchase of 1000 bateries from ecia ([3]_) price listing
 
+    With ``cell`` set to a key of `cell_database`, e.g.
+    ``Battery(cell='samsung_inr21700_50e')``, the pack is built from that cell:
+    its discharge curve, capacity, nominal voltage, mass, volume and cost are
+    used instead of `q_n`, `e_nom` and the generic li-ion figures. The `q_n`
+    and `e_nom` params are then not added, so setting or connecting them is an
+    error instead of being silently ignored.
+
     References
     ----------
 
@@ -75,7 +181,6 @@ class Battery(Component):
     .. [2] D. N. Mavris, "Subsonic Ultra Green Aircraft Research - Phase II," NASA Langley Research Center, 2014
 
     .. [3] eciaauthorized.com/search/HHR650D
-
     """
 
     # TODO rematch battery performance data to 18650 or similar Li-Ion battery instead of
@@ -83,15 +188,25 @@ class Battery(Component):
     # TODO account for additional battery containment hardware
     # TODO fix voltage to certain range?
 
-    def __init__(self):
+    def __init__(self, cell=None):
         """Initializes a `Battery` object
 
         Sets up the given Params/Outputs of the OpenMDAO `Battery` component, initializes their shape, and
         sets them to their default values.
+
+        Args
+        ----
+        cell : str
+            key of the cell in `cell_database`, or None for the generic 18650 model
         """
 
         super(Battery, self).__init__()
 
+        if cell is not None:
+            # fails early on unknown keys
+            cell_database.get_cell(cell)
+        self.cell = cell
+
         # setup mission characteristics
         self.add_param('des_time',
                        val=1.0,
@@ -115,18 +230,21 @@ class Battery(Component):
                        val=1.4,
                        desc='fully charged voltage',
                        units='V')
-        self.add_param('e_nom',
-                       val=1.2,
-                       desc='voltage at  end of nominal zone',
-                       units='V')
+        if cell is None:
+            # taken from the cell database otherwise
+            self.add_param('e_nom',
+                           val=1.2,
+                           desc='voltage at  end of nominal zone',
+                           units='V')
         self.add_param('e_exp',
                        val=1.27,
                        desc='voltage at end of exponential zone',
                        units='V')
-        self.add_param('q_n',
-                       val=3.5,
-                       desc='Single cell capacity',
-                       units='A*h')
+        if cell is None:
+            self.add_param('q_n',
+                           val=3.5,
+                           desc='Single cell capacity',
+                           units='A*h')
         self.add_param('t_exp',
                        val=1.0,
                        desc='time to reach exponential zone',
@@ -197,113 +315,22 @@ class Battery(Component):
             `VecWrapper` containing residuals
 
         """
-        #print(params['des_power'])
-        #print(params['des_current'])
-
         # check representation invariant
         self._check_rep(params, unknowns, resids)
 
-        # FIXME using ceiling for cell calculations, despite advice against
-        # need to change to proper way of constraining to integer values as
-        # battery falls apart for n_paralell < 0 (i.e. if n_paralell = 0.01 and
-        # not 1.0, then we get absurd output voltage levels
-
-        cap_discharge = self._calculate_total_discharge(
-            params['time_of_flight'], params['des_current'])
-        # print((params['q_n'] * (1 - params['q_l'])))
-        # print cap_discharge
-        n_parallel = cap_discharge / (params['q_n'] * (1 - params['q_l']))
-        # print('usaable cap %f ' % (params['q_n'] * (1 - params['q_l'])))
-        # print('cap dis %f' % cap_discharge)
-        # print(n_parallel)
-        single_bat_current = params['des_current'] / n_parallel
-        # print('single bat cur %f' % single_bat_current)
-        # single_bat_current = 7
-        # single_bat_current = 7
-        # n_parallel = -params['des_current'] / single_bat_current
-        # single_bat_current = 13
-        single_bat_discharge = self._calculate_total_discharge(
-            params['des_time'], single_bat_current)
-
-        # # calculate general battery performance curve paramaters
-        # # TODO calculate performance curve parameters from Panasonic 18650
-        # # battery, currently using parameters from SUGAR paper
-        #
-        # # voltage drop over exponential zone
-        # # a = params['params['e_full']'] - params['e_exp']
-        # a = 0.144
-        # # discharge of single cell from full to end of exponential zone
-        # q_exp = self._calculate_total_discharge(
-        #     params['t_exp'], params['des_current']) / n_parallel
-        #
-        # # time constant of the exponential zone
-        # # b = 3 / q_exp
-        # b = 2.3077
-
-        # discharge over the nominal zone
-        # q_nom = self._calculate_total_discharge(
-        #     params['t_nom'], params['des_current']) / n_parallel
-
-        # # polarization voltage
-        # # k = (params['params['e_full']'] - params['e_nom'] + a * (np.exp(-b * q_nom) - 1)) * (params['q_n'] - q_nom)
-        # k = 0.01875
-        #
-        # # no load constant voltage of battery
-        # # k = polarization voltage, params['r'] = resistance,
-        # # e_0 = params['params['e_full']'] + k + params['r'] * single_bat_current - a
-        # e_0 = 1.2848
-        #
-        # # general voltage performance curve
-        # v_batt = e_0 - k * (params['q_n'] / (
-        #     params['q_n'] - single_bat_discharge)) + a * np.exp(
-        #         -b * single_bat_discharge) - params['r'] * single_bat_current
-
-        # single battery power at design power point
-
-        dir = os.path.dirname(__file__)
-        filename = os.path.join(dir, '18650.csv')
-        data = np.loadtxt(filename, dtype='float', delimiter=',').transpose()
-
-        func = scipy.interpolate.UnivariateSpline(data[0], data[1])
-        # print single_bat_discharge
-        v_batt = func(single_bat_discharge * 1000)
-
-        p_bat = v_batt * single_bat_current
-        # print(v_batt)
-        # print('p_bat %f' % p_bat)
-
-        energy_cap = scipy.integrate.quad(func, 0, single_bat_discharge * 1000)[0] / 1000
-        #print('energy cap %f' % energy_cap)
-
-        # total number of battery cells
-        n_cells = params['des_power'] / p_bat
-        #print('n_cells %f' % n_cells)
-        n_cells = np.ceil(n_cells)
-        n_parallel = np.ceil(n_parallel)
-        n_series = np.ceil(n_cells / n_parallel)
-
-        # assert n_cells >= n_parallel
-
-        unknowns['n_cells'] = n_cells
-
-        # calculate volume of cells accounting for hexagonal packing efficiency of 0.9069 and convert from mm^3 to cm^3
-        # unknowns['battery_volume'] =(n_cells * (
-        #     params['cell_height'] * np.pi * np.power(params['cell_diameter'] /
-        #                                              2, 2)) / 0.9069 / 1000) / 3.7
-
-        # calculate mass of cells and convert to kg
-        # including rough approx of li-ion density
-        # TODO dev real model
-        # unknowns['battery_mass'] = params['cell_mass'] * n_cells / 1000 / 5
-        unknowns['battery_mass'] = energy_cap * n_cells / 265
-        unknowns['battery_volume'] = energy_cap * n_cells / 730 * 1000 / 0.9069
-
-        # calculate output voltage of battery in the nominal zone
-        unknowns['output_voltage'] = n_series * params['e_nom']
-
-        unknowns['battery_cost'] = n_cells * 12.95
+        if self.cell is None:
+            cell_params = {'q_n': params['q_n'], 'e_nom': params['e_nom']}
+        else:
+            cell_params = {'cell': self.cell}
+        sizing = size_batteries(params['des_power'], params['des_current'],
+                                params['des_time'], params['time_of_flight'],
+                                q_l=params['q_l'],
+                                battery_cross_section_area=params['battery_cross_section_area'],
+                                **cell_params)
 
-        unknowns['battery_length'] = unknowns['battery_volume'] / params['battery_cross_section_area']
+        for name in ('n_cells', 'battery_mass', 'battery_volume', 'output_voltage',
+                     'battery_cost', 'battery_length'):
+            unknowns[name] = sizing[name]
 
         # check representation invariant
         self._check_rep(params, unknowns, resids)
@@ -326,7 +353,7 @@ class Battery(Component):
             the total discharge over the load profile
 
         """
-        return time * current
+        return total_discharge(time, current)
 
     def _check_rep(self, params, unknowns, resids):
         """Checks that the representation invariant of the `Battery` class holds
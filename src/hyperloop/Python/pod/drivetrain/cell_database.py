@@ -0,0 +1,229 @@
+"""
+Database of battery cell types for pack sizing.
+
+Every cell has a discharge curve, capacity, voltages, resistance, mass,
+dimensions and cost. The specs of all cells are indexed in arrays, so
+`find_cells` filters the whole database with vectorized comparisons. Discharge
+curves are only built when a cell is first used (`get_curve`). They are fitted
+once and then cached, so a cell selection sweep does not parse csv files or
+fit splines per run.
+
+Curves come either from a measured table (csv of discharge in mA*h and voltage
+in V) or from the Shepherd model used in [1]_::
+
+    v(q) = e_0 - k*q_n/(q_n - q) + a*exp(-b*q)
+
+Its parameters are derived from datasheet points by `shepherd_from_datasheet`
+as in [2]_. The specs of the commercial cells are approximate datasheet
+values.
+
+References
+----------
+.. [1] D. N. Mavris, "Subsonic Ultra Green Aircraft Research - Phase II," NASA Langley Research Center, 2014
+
+.. [2] O. Tremblay, L.-A. Dessaint, A.-I. Dekkiche, "A Generic Battery Model for the Dynamic Simulation
+   of Hybrid Electric Vehicles," IEEE Vehicle Power and Propulsion Conference, 2007
+"""
+from __future__ import print_function
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from hyperloop.Python.pod.drivetrain.discharge_curve import DischargeCurve, load_discharge_curve
+
+# capacity (A*h), voltages (V), resistance (Ohms), mass (g), dimensions (mm), cost (USD)
+CellSpec = namedtuple('CellSpec', 'key chemistry capacity e_full e_nom resistance mass '
+                                  'diameter height cost curve')
+
+ShepherdModel = namedtuple('ShepherdModel', 'e_0 k a b')
+
+NUMERIC_SPECS = ('capacity', 'e_full', 'e_nom', 'resistance', 'mass', 'diameter', 'height',
+                 'cost', 'energy', 'volume', 'specific_energy', 'energy_density')
+
+
+def shepherd_from_datasheet(e_full, e_exp, q_exp, e_nom, q_nom, q_n):
+    """Shepherd model parameters from three points of a datasheet discharge curve
+
+    Args
+    ----
+    e_full : float
+        fully charged voltage (V)
+    e_exp : float
+        voltage at end of exponential zone (V)
+    q_exp : float
+        discharge at end of exponential zone (A*h)
+    e_nom : float
+        voltage at end of nominal zone (V)
+    q_nom : float
+        discharge at end of nominal zone (A*h)
+    q_n : float
+        cell capacity (A*h)
+
+    Returns
+    -------
+    ShepherdModel
+        open circuit model parameters, the resistive drop is applied separately
+    """
+    a = e_full - e_exp
+    b = 3.0 / q_exp
+    k = (e_full - e_nom + a * (np.exp(-b * q_nom) - 1.0)) * (q_n - q_nom) / q_nom
+    return ShepherdModel(e_0=e_full + k - a, k=k, a=a, b=b)
+
+
+CELLS = (
+    # 18650
+    CellSpec('panasonic_ncr18650b', 'li-ion nca', 3.4, 4.2, 3.6, 0.03, 48.5, 18.5, 65.3, 4.95,
+             os.path.join(os.path.dirname(__file__), '18650.csv')),
+    CellSpec('panasonic_ncr18650ga', 'li-ion nca', 3.45, 4.2, 3.6, 0.035, 48.0, 18.5, 65.3, 5.25,
+             shepherd_from_datasheet(4.2, 3.95, 0.35, 3.4, 2.9, 3.45)),
+    CellSpec('lg_inr18650_mj1', 'li-ion nmc', 3.5, 4.2, 3.635, 0.035, 49.0, 18.5, 65.2, 4.50,
+             shepherd_from_datasheet(4.2, 3.9, 0.35, 3.5, 3.0, 3.5)),
+    CellSpec('lg_inr18650_hg2', 'li-ion nmc', 3.0, 4.2, 3.6, 0.02, 47.0, 18.5, 65.0, 4.50,
+             shepherd_from_datasheet(4.2, 3.95, 0.3, 3.45, 2.6, 3.0)),
+    CellSpec('lg_inr18650_m36', 'li-ion nmc', 3.6, 4.2, 3.635, 0.04, 49.0, 18.5, 65.1, 4.95,
+             shepherd_from_datasheet(4.2, 3.9, 0.36, 3.5, 3.1, 3.6)),
+    CellSpec('samsung_inr18650_35e', 'li-ion nmc', 3.5, 4.2, 3.6, 0.035, 50.0, 18.4, 65.0, 4.75,
+             shepherd_from_datasheet(4.2, 3.9, 0.35, 3.45, 3.0, 3.5)),
+    CellSpec('samsung_inr18650_30q', 'li-ion nmc', 3.0, 4.2, 3.6, 0.02, 48.0, 18.4, 65.0, 4.50,
+             shepherd_from_datasheet(4.2, 3.95, 0.3, 3.45, 2.6, 3.0)),
+    CellSpec('samsung_inr18650_25r', 'li-ion nmc', 2.5, 4.2, 3.6, 0.018, 45.0, 18.3, 65.0, 3.95,
+             shepherd_from_datasheet(4.2, 3.95, 0.25, 3.45, 2.15, 2.5)),
+    CellSpec('sony_us18650vtc6', 'li-ion nmc', 3.0, 4.2, 3.6, 0.013, 46.6, 18.5, 65.0, 5.95,
+             shepherd_from_datasheet(4.2, 3.95, 0.3, 3.5, 2.6, 3.0)),
+    CellSpec('sony_us18650vtc5a', 'li-ion nmc', 2.6, 4.2, 3.6, 0.013, 47.0, 18.5, 65.0, 5.50,
+             shepherd_from_datasheet(4.2, 3.95, 0.26, 3.5, 2.25, 2.6)),
+    CellSpec('molicel_inr18650_p28a', 'li-ion nmc', 2.8, 4.2, 3.6, 0.012, 46.0, 18.6, 65.0, 5.50,
+             shepherd_from_datasheet(4.2, 3.95, 0.28, 3.5, 2.4, 2.8)),
+    CellSpec('a123_apr18650m1b', 'li-ion lfp', 1.1, 3.6, 3.3, 0.018, 39.0, 18.0, 65.0, 4.25,
+             shepherd_from_datasheet(3.6, 3.35, 0.05, 3.2, 0.95, 1.1)),
+    # 21700
+    CellSpec('samsung_inr21700_50e', 'li-ion nmc', 5.0, 4.2, 3.6, 0.022, 68.5, 21.25, 70.8, 5.50,
+             shepherd_from_datasheet(4.2, 3.95, 0.5, 3.45, 4.3, 5.0)),
+    CellSpec('samsung_inr21700_48g', 'li-ion nmc', 4.8, 4.2, 3.6, 0.03, 68.0, 21.2, 70.2, 5.75,
+             shepherd_from_datasheet(4.2, 3.95, 0.48, 3.45, 4.1, 4.8)),
+    CellSpec('samsung_inr21700_40t', 'li-ion nmc', 4.0, 4.2, 3.6, 0.012, 67.0, 21.2, 70.2, 5.95,
+             shepherd_from_datasheet(4.2, 3.95, 0.4, 3.5, 3.4, 4.0)),
+    CellSpec('lg_inr21700_m50', 'li-ion nmc', 5.0, 4.2, 3.63, 0.025, 69.0, 21.2, 70.2, 5.25,
+             shepherd_from_datasheet(4.2, 3.95, 0.5, 3.45, 4.3, 5.0)),
+    CellSpec('molicel_inr21700_p42a', 'li-ion nmc', 4.2, 4.2, 3.6, 0.012, 70.0, 21.7, 70.2, 6.50,
+             shepherd_from_datasheet(4.2, 3.95, 0.42, 3.5, 3.6, 4.2)),
+    CellSpec('molicel_inr21700_p45b', 'li-ion nmc', 4.5, 4.2, 3.6, 0.011, 70.0, 21.7, 70.2, 7.50,
+             shepherd_from_datasheet(4.2, 3.95, 0.45, 3.5, 3.85, 4.5)),
+    CellSpec('murata_us21700vtc6a', 'li-ion nmc', 4.0, 4.2, 3.6, 0.013, 67.0, 21.3, 70.3, 6.95,
+             shepherd_from_datasheet(4.2, 3.95, 0.4, 3.5, 3.4, 4.0)),
+    # larger formats
+    CellSpec('a123_anr26650m1b', 'li-ion lfp', 2.5, 3.6, 3.3, 0.006, 76.0, 26.0, 65.0, 9.00,
+             shepherd_from_datasheet(3.6, 3.35, 0.1, 3.2, 2.2, 2.5)),
+    CellSpec('k2_lfp26650ev', 'li-ion lfp', 3.2, 3.65, 3.2, 0.01, 86.0, 26.0, 65.0, 7.50,
+             shepherd_from_datasheet(3.65, 3.35, 0.15, 3.15, 2.8, 3.2)),
+    CellSpec('lishen_ifr32700', 'li-ion lfp', 6.0, 3.65, 3.2, 0.008, 143.0, 32.0, 70.0, 4.50,
+             shepherd_from_datasheet(3.65, 3.35, 0.3, 3.15, 5.2, 6.0)),
+    CellSpec('headway_38120s', 'li-ion lfp', 10.0, 3.65, 3.2, 0.006, 330.0, 38.0, 120.0, 14.00,
+             shepherd_from_datasheet(3.65, 3.35, 0.5, 3.15, 8.7, 10.0)),
+    CellSpec('yinlong_lto66160h', 'li-ion lto', 40.0, 2.8, 2.3, 0.0012, 1100.0, 66.0, 160.0, 60.00,
+             shepherd_from_datasheet(2.8, 2.6, 2.0, 2.2, 34.0, 40.0)),
+    # Ni-MH
+    CellSpec('panasonic_bk3hcd', 'ni-mh', 2.5, 1.45, 1.2, 0.025, 30.0, 14.5, 50.5, 4.00,
+             shepherd_from_datasheet(1.45, 1.3, 0.25, 1.15, 2.1, 2.5)),
+    # SUGAR Ni-MH model, previously hard coded in `Battery`, with the HHR650D
+    # cell ecia price listing
+    CellSpec('sugar_nimh', 'ni-mh', 6.5, 1.4, 1.2, 0.0046, 170.0, 33.0, 61.0, 12.95,
+             ShepherdModel(e_0=1.2848, k=0.01875, a=0.144, b=2.3077)),
+)
+
+_cells = dict((cell.key, cell) for cell in CELLS)
+_curves = {}
+
+
+def cell_volume(cell):
+    """Volume of a cylindrical cell (cm^3)"""
+    return np.pi * (cell.diameter / 20.0)**2 * cell.height / 10.0
+
+
+def _build_index(cells):
+    capacity = np.array([c.capacity for c in cells])
+    e_nom = np.array([c.e_nom for c in cells])
+    mass = np.array([c.mass for c in cells])
+    volume = np.array([cell_volume(c) for c in cells])
+    index = dict((name, np.array([getattr(c, name) for c in cells]))
+                 for name in ('capacity', 'e_full', 'e_nom', 'resistance', 'mass', 'diameter',
+                              'height', 'cost'))
+    index['energy'] = capacity * e_nom
+    # cm^3
+    index['volume'] = volume
+    # W*h/kg
+    index['specific_energy'] = capacity * e_nom / mass * 1000.0
+    # W*h/L
+    index['energy_density'] = capacity * e_nom / volume * 1000.0
+    index['key'] = np.array([c.key for c in cells])
+    index['chemistry'] = np.array([c.chemistry for c in cells])
+    return index
+
+_index = _build_index(CELLS)
+
+
+def cell_keys():
+    """Keys of all cells in the database"""
+    return [cell.key for cell in CELLS]
+
+
+def get_cell(key):
+    """Returns the `CellSpec` of cell `key`"""
+    try:
+        return _cells[key]
+    except KeyError:
+        raise KeyError('unknown cell %r, choose one of: %s' % (key, ', '.join(cell_keys())))
+
+
+def get_curve(key):
+    """Returns the fitted `DischargeCurve` of cell `key`, building it on first use"""
+    curve = _curves.get(key)
+    if curve is None:
+        cell = get_cell(key)
+        if isinstance(cell.curve, ShepherdModel):
+            m = cell.curve
+            q = np.linspace(0.0, 0.95 * cell.capacity, 200)
+            v = m.e_0 - m.k * cell.capacity / (cell.capacity - q) + m.a * np.exp(-m.b * q)
+            curve = DischargeCurve(q * 1000.0, v, smoothing=0)
+        else:
+            curve = load_discharge_curve(cell.curve)
+        _curves[key] = curve
+    return curve
+
+
+def find_cells(chemistry=None, **criteria):
+    """Filters the database by cell specs
+
+    Criteria are ``min_<spec>`` or ``max_<spec>`` keyword arguments, where
+    ``<spec>`` is one of `NUMERIC_SPECS`, e.g.
+    ``find_cells(min_specific_energy=200.0, max_cost=6.0)``. `chemistry`
+    matches the start of the chemistry name (``'li-ion'`` matches all
+    lithium-ion cells).
+
+    Returns
+    -------
+    list
+        keys of the matching cells
+    """
+    mask = np.ones(len(CELLS), dtype=bool)
+    if chemistry is not None:
+        mask &= np.array([c.startswith(chemistry) for c in _index['chemistry']])
+    for name, value in criteria.items():
+        bound, _, spec = name.partition('_')
+        if bound not in ('min', 'max') or spec not in NUMERIC_SPECS:
+            raise ValueError('unknown criterion %r' % name)
+        if bound == 'min':
+            mask &= _index[spec] >= value
+        else:
+            mask &= _index[spec] <= value
+    return list(_index['key'][mask])
+
+
+if __name__ == '__main__':
+    for key in find_cells(chemistry='li-ion', min_specific_energy=200.0):
+        cell = get_cell(key)
+        curve = get_curve(key)
+        print('%-22s %5.2f A*h  %6.1f W*h/kg  %5.2f V at half discharge' %
+              (key, cell.capacity, cell.capacity * cell.e_nom / cell.mass * 1000.0,
+               curve.voltage(cell.capacity / 2.0)))
@@ -0,0 +1,81 @@
+"""
+Precomputed cell discharge curve shared by the drivetrain models.
+
+The measured discharge curve of a cell (``18650.csv``: discharge in mA*h vs.
+terminal voltage in V) is loaded and fit with a smoothing spline once per
+process. The spline antiderivative is precomputed as well, so the energy
+delivered up to a given discharge is a closed-form evaluation instead of a
+quadrature.
+"""
+from __future__ import print_function
+import os
+
+import numpy as np
+import scipy.interpolate
+
+from hyperloop.Python.tools.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_CURVE = os.path.join(os.path.dirname(__file__), '18650.csv')
+
+# absolute file name -> DischargeCurve
+_curves = {}
+
+
+class DischargeCurve(object):
+    """Spline fit of a cell discharge curve and its antiderivative
+
+    Parameters
+    ----------
+    discharge : ndarray
+        cell discharge at each data point (mA*h)
+    voltage : ndarray
+        cell terminal voltage at each data point (V)
+    smoothing : float
+        smoothing factor of the spline, ``0`` to interpolate the data. Defaults
+        to the scipy default, suited to measured curves
+
+    Attributes
+    ----------
+    capacity : float
+        largest discharge of the data (A*h). The spline is not valid past it
+    """
+
+    def __init__(self, discharge, voltage, smoothing=None):
+        self.spline = scipy.interpolate.UnivariateSpline(discharge, voltage, s=smoothing)
+        self.antiderivative = self.spline.antiderivative()
+        self._energy_zero = float(self.antiderivative(0.0))
+        self.capacity = float(np.max(discharge)) / 1000.0
+
+    def voltage(self, discharge):
+        """Terminal voltage (V) of a single cell after `discharge` (A*h)"""
+        return self.spline(np.asarray(discharge) * 1000.0)
+
+    def energy(self, discharge):
+        """Energy (W*h) delivered by a single cell from full charge to `discharge` (A*h)"""
+        return (self.antiderivative(np.asarray(discharge) * 1000.0) - self._energy_zero) / 1000.0
+
+
+def load_discharge_curve(filename=DEFAULT_CURVE):
+    """Returns the `DischargeCurve` of a csv file, reading and fitting it only
+    the first time it is requested
+
+    Args
+    ----
+    filename : str
+        csv file with discharge (mA*h) and voltage (V) columns. Defaults to
+        the Panasonic 18650 curve next to this module.
+
+    Returns
+    -------
+    DischargeCurve
+        the shared fitted curve
+    """
+    filename = os.path.abspath(filename)
+    curve = _curves.get(filename)
+    if curve is None:
+        log.debug('fitting discharge curve %s', filename)
+        data = np.loadtxt(filename, dtype='float', delimiter=',').transpose()
+        curve = _curves[filename] = DischargeCurve(data[0], data[1])
+    return curve
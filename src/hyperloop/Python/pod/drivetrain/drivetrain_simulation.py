@@ -0,0 +1,225 @@
+"""
+Trip level transient simulation of the pod drivetrain (battery, inverter and
+motor).
+
+`Drivetrain` sizes the drivetrain at a single design point. `DrivetrainSimulator`
+takes a compressor shaft power and torque demand history, such as the cycle
+results along a route, and steps the sized drivetrain through it. The
+outputs are motor and inverter losses, motor winding temperature, battery
+state of charge and the energy used. Every chunk of the profile is evaluated
+in vectorized form, and only the battery and thermal states are carried
+between chunks, so long routes can be streamed and no OpenMDAO model runs per
+time step.
+"""
+from __future__ import print_function
+from collections import namedtuple
+
+import numpy as np
+from scipy.signal import lfilter
+
+from hyperloop.Python.pod.drivetrain.efficiency_map import motor_design, motor_losses
+from hyperloop.Python.pod.drivetrain.state_of_charge import PackDischarge
+
+DrivetrainHistory = namedtuple('DrivetrainHistory',
+                               'time speed torque motor_loss inverter_loss battery_loss '
+                               'motor_temp battery_power battery_current battery_voltage soc energy')
+
+
+class DrivetrainSimulator(object):
+    """Streaming time stepper of a sized drivetrain
+
+    Parameters
+    ----------
+    motor : dict
+        motor design returned by `efficiency_map.motor_design`
+    n_series : int
+        number of battery cells in series
+    n_parallel : int
+        number of parallel battery strings
+    inverter_efficiency : float
+        power out / power in of the inverter (unitless)
+    motor_heat_capacity : float
+        lumped heat capacity of the motor (J/K)
+    motor_thermal_resistance : float
+        thermal resistance from the motor windings to ambient (K/W)
+    T_ambient : float
+        ambient and initial motor temperature (K)
+    battery_kwargs
+        passed to `state_of_charge.PackDischarge` (``q_n``, ``r``, ``curve``,
+        ``soc``)
+
+    Notes
+    -----
+    The motor losses at each sample come from `efficiency_map.motor_losses`
+    with the motor constants fixed at the design point. The inverter draws
+    the motor input power divided by its efficiency from the battery. The
+    motor temperature follows the first order model
+    ``C*dT/dt = P_loss - (T - T_ambient)/R``. It is discretized exactly for a
+    piecewise constant loss and run through `scipy.signal.lfilter`, so the
+    time samples must be uniformly spaced.
+    """
+
+    def __init__(self, motor, n_series, n_parallel, inverter_efficiency=1.0,
+                 motor_heat_capacity=20.0e3, motor_thermal_resistance=0.02, T_ambient=300.0,
+                 **battery_kwargs):
+        self.motor = motor
+        self.inverter_efficiency = inverter_efficiency
+        self.motor_heat_capacity = motor_heat_capacity
+        self.motor_thermal_resistance = motor_thermal_resistance
+        self.T_ambient = T_ambient
+        self.pack = PackDischarge(n_series, n_parallel, **battery_kwargs)
+
+        self.energy = 0.0
+        self.motor_temp = T_ambient
+        self._dt = None
+        self._t = None
+        self._p = None
+
+    def step(self, t, power, torque):
+        """Advances the drivetrain over one chunk of a demand profile
+
+        Args
+        ----
+        t : ndarray
+            uniformly spaced time of each sample (s)
+        power : ndarray
+            shaft power demand, the sign is ignored (W)
+        torque : ndarray
+            shaft torque demand, the sign is ignored (N*m)
+
+        Returns
+        -------
+        DrivetrainHistory
+            shaft speed (rad/s) and torque (N*m), motor, inverter and battery
+            losses (W), motor temperature (K), battery power (W), current (A),
+            voltage (V), state of charge and cumulative battery energy used
+            (W*h) at each sample of the chunk
+        """
+        t = np.asarray(t, dtype=float)
+        power = np.abs(np.broadcast_to(np.asarray(power, dtype=float), t.shape))
+        torque = np.abs(np.broadcast_to(np.asarray(torque, dtype=float), t.shape))
+
+        # time steps, the first one measured from the end of the previous chunk
+        dt = np.diff(np.concatenate(([t[0] if self._t is None else self._t], t)))
+        steps = dt if self._t is not None else dt[1:]
+        if len(steps):
+            if self._dt is None:
+                self._dt = steps[0]
+            if not np.allclose(steps, self._dt, rtol=1e-6, atol=0.0):
+                raise ValueError('time samples must be uniformly spaced')
+
+        speed = np.zeros(t.shape)
+        np.divide(power, torque, out=speed, where=torque > 0.0)
+        motor = motor_losses(self.motor, speed, torque)
+        motor_loss = np.where(power > 0.0, motor['power_loss'], 0.0)
+        motor_input = power + motor_loss
+
+        battery_power = motor_input / self.inverter_efficiency
+        battery = self.pack.step(t, power=battery_power)
+        battery_loss = battery.loss
+
+        motor_temp = self._motor_temperature(motor_loss, first=self._t is None)
+
+        # battery energy from the delivered power plus the cell resistive losses
+        cell_power = battery_power + battery_loss
+        p_prev = cell_power[0] if self._t is None else self._p
+        energy = self.energy + np.cumsum(
+            0.5 * (np.concatenate(([p_prev], cell_power[:-1])) + cell_power) * dt) / 3600.0
+
+        self.energy = energy[-1]
+        self._t = t[-1]
+        self._p = cell_power[-1]
+
+        return DrivetrainHistory(time=t,
+                                 speed=speed,
+                                 torque=torque,
+                                 motor_loss=motor_loss,
+                                 inverter_loss=battery_power - motor_input,
+                                 battery_loss=battery_loss,
+                                 motor_temp=motor_temp,
+                                 battery_power=battery_power,
+                                 battery_current=battery.current,
+                                 battery_voltage=battery.voltage,
+                                 soc=battery.soc,
+                                 energy=energy)
+
+    def _motor_temperature(self, motor_loss, first):
+        """Filters the motor losses through the first order thermal model
+
+        The temperature at each sample is reached after holding that sample's
+        loss over the preceding time step. The first sample of the profile
+        is at the initial temperature.
+        """
+        if self._dt is None:
+            return np.full(motor_loss.shape, self.motor_temp)
+        R = self.motor_thermal_resistance
+        alpha = np.exp(-self._dt / (R * self.motor_heat_capacity))
+        rise0 = self.motor_temp - self.T_ambient
+        if first:
+            motor_loss = np.concatenate(([0.0], motor_loss[1:]))
+            zi = [rise0]
+        else:
+            zi = [alpha * rise0]
+        rise, _ = lfilter([(1.0 - alpha) * R], [1.0, -alpha], motor_loss, zi=zi)
+        self.motor_temp = self.T_ambient + rise[-1]
+        return self.T_ambient + rise
+
+
+def simulate_drivetrain(t, power, torque, motor, n_series, n_parallel, chunk_size=4096, **kwargs):
+    """Simulates a drivetrain over a whole demand profile
+
+    The profile is processed `chunk_size` samples at a time with
+    `DrivetrainSimulator`. Keyword arguments are passed to
+    `DrivetrainSimulator`.
+
+    Args
+    ----
+    t : ndarray
+        uniformly spaced time of each sample (s)
+    power : ndarray
+        shaft power demand (W)
+    torque : ndarray
+        shaft torque demand (N*m)
+    motor : dict
+        motor design returned by `efficiency_map.motor_design`
+    n_series : int
+        number of battery cells in series
+    n_parallel : int
+        number of parallel battery strings
+    chunk_size : int
+        number of samples simulated per chunk
+
+    Returns
+    -------
+    DrivetrainHistory
+        the concatenated history of the whole profile
+    """
+    sim = DrivetrainSimulator(motor, n_series, n_parallel, **kwargs)
+    t = np.asarray(t, dtype=float)
+    power = np.broadcast_to(np.asarray(power, dtype=float), t.shape)
+    torque = np.broadcast_to(np.asarray(torque, dtype=float), t.shape)
+
+    chunks = []
+    for start in range(0, len(t), chunk_size):
+        sl = slice(start, start + chunk_size)
+        chunks.append(sim.step(t[sl], power[sl], torque[sl]))
+
+    return DrivetrainHistory(*[np.concatenate(field) for field in zip(*chunks)])
+
+
+if __name__ == '__main__':
+    motor = motor_design(design_power=-110000.0, design_torque=-420.169, motor_max_current=450.0,
+                         motor_LD_ratio=0.83, kappa=0.5, core_radius_ratio=0.7)
+
+    # 30 minute trip at 1 s steps, compressor power varying with pod speed
+    t = np.arange(0.0, 1800.0, 1.0)
+    power = 110000.0 * (0.7 + 0.3 * np.sin(np.pi * t / 1800.0))
+    torque = power / motor['w_operating']
+
+    history = simulate_drivetrain(t, power, torque, motor, n_series=100, n_parallel=60,
+                                  inverter_efficiency=0.97)
+
+    print('energy used:         %f kW*h' % (history.energy[-1] / 1000.0))
+    print('final SOC:           %f' % history.soc[-1])
+    print('peak motor temp:     %f K' % np.max(history.motor_temp))
+    print('mean inverter loss:  %f W' % np.mean(history.inverter_loss))
@@ -0,0 +1,259 @@
+"""
+Efficiency and loss maps of a BLDC motor over the speed-torque plane.
+
+The motor is sized with `motor_sizing.size_motors` and its no-load current is
+solved at the design point, as in `MotorGroup`. With the motor constants
+fixed, the current, voltage, iron, copper and windage losses follow in closed
+form at every (speed, torque) point, so a dense map is a single vectorized
+evaluation. Maps are cached to disk per motor design, and `EfficiencyMap`
+interpolates them for mission level lookups::
+
+    motor_map = load_efficiency_map(design_power=-110000.0, design_torque=-420.169,
+                                    motor_max_current=450.0, motor_LD_ratio=0.83,
+                                    kappa=0.5, core_radius_ratio=0.7)
+    eta = motor_map(speed_profile, torque_profile)
+"""
+from __future__ import print_function
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+
+from hyperloop.Python.pod.drivetrain import motor_sizing
+from hyperloop.Python.tools.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'hyperloop_motor_maps')
+
+# part of the cache key; bump it whenever the loss model or motor sizing
+# changes so maps cached by an older version are recomputed
+MODEL_VERSION = 1
+
+MAP_NAMES = ('efficiency', 'power_input', 'power_loss', 'power_iron_loss',
+             'power_copper_loss', 'power_windage_loss', 'current', 'voltage')
+
+# defaults of `MotorGroup`
+DESIGN_DEFAULTS = (('design_power', -0.394 * 746),
+                   ('design_torque', -1.0),
+                   ('motor_LD_ratio', 0.822727),
+                   ('motor_max_current', 42.0),
+                   ('pole_pairs', 6.0),
+                   ('n_phases', 3.0),
+                   ('kappa', 1 / 1.75),
+                   ('core_radius_ratio', 0.0),
+                   ('motor_oversize_factor', 1.0))
+
+
+def motor_design(**kwargs):
+    """Sizes a motor and solves its no-load current at the design point
+
+    Keyword arguments are the parameters of `motor_sizing.size_motors`, with
+    the `MotorGroup` defaults for the ones not given.
+
+    Returns
+    -------
+    dict
+        the design parameters, the outputs of `size_motors` and ``I0``, the
+        no-load current (A)
+    """
+    design = dict(DESIGN_DEFAULTS)
+    unknown = set(kwargs) - set(design)
+    if unknown:
+        raise ValueError('unknown motor design parameters: %s' % ', '.join(sorted(unknown)))
+    design.update((name, float(value)) for name, value in kwargs.items())
+
+    sizing = motor_sizing.size_motors(**design)
+    I0, converged = motor_sizing.solve_no_load_current(
+        design['design_torque'], design['motor_max_current'], sizing['max_torque'],
+        sizing['w_operating'], sizing['winding_resistance'], sizing['power_mech'],
+        sizing['power_iron_loss'], sizing['power_windage_loss'])
+    if not converged:
+        raise RuntimeError('motor balance did not converge for the design point')
+
+    design.update((name, float(value)) for name, value in sizing.items())
+    design['I0'] = float(I0)
+    return design
+
+
+def motor_losses(design, speed, torque):
+    """Evaluates the losses and efficiency of a motor at given operating points
+
+    Args
+    ----
+    design : dict
+        motor design returned by `motor_design`
+    speed : float or ndarray
+        shaft speed (rad/s)
+    torque : float or ndarray
+        shaft torque magnitude (N*m)
+
+    Returns
+    -------
+    dict
+        arrays of the broadcast shape of `speed` and `torque` for every name
+        in `MAP_NAMES`: ``efficiency`` (unitless), the powers (W),
+        ``current`` (A) and ``voltage`` (V)
+    """
+    w, trq = np.broadcast_arrays(np.asarray(speed, dtype=float), np.asarray(torque, dtype=float))
+    I0 = design['I0']
+    i_max = design['motor_max_current']
+    t_max = design['max_torque']
+    r_w = design['winding_resistance']
+
+    # motor constants are fixed by the design point, see `Motor`
+    current = I0 + trq * (i_max - I0) / t_max
+    voltage = current * r_w + w * t_max / (i_max - I0)
+
+    power_mech = w * trq
+    power_iron_loss = motor_sizing.iron_loss(design['motor_diameter'], w, design['motor_length'],
+                                             design['core_radius_ratio'], design['pole_pairs'])
+    power_copper_loss = current**2 * r_w
+    power_windage_loss = motor_sizing.windage_loss(w, design['motor_diameter'], design['motor_length'])
+    power_loss = power_iron_loss + power_copper_loss + power_windage_loss
+    power_input = power_mech + power_loss
+
+    efficiency = np.zeros(power_input.shape)
+    np.divide(power_mech, power_input, out=efficiency, where=power_input > 0.0)
+
+    return {'efficiency': efficiency,
+            'power_input': power_input,
+            'power_loss': power_loss,
+            'power_iron_loss': power_iron_loss,
+            'power_copper_loss': power_copper_loss,
+            'power_windage_loss': power_windage_loss,
+            'current': current,
+            'voltage': voltage}
+
+
+def compute_efficiency_map(design, speed, torque):
+    """Evaluates the losses and efficiency of a motor over a speed x torque grid
+
+    Args
+    ----
+    design : dict
+        motor design returned by `motor_design`
+    speed : ndarray
+        shaft speeds (rad/s)
+    torque : ndarray
+        shaft torque magnitudes (N*m)
+
+    Returns
+    -------
+    dict
+        the `motor_losses` maps, each of shape ``(len(speed), len(torque))``
+    """
+    w, trq = np.meshgrid(np.asarray(speed, dtype=float), np.asarray(torque, dtype=float),
+                         indexing='ij')
+    return motor_losses(design, w, trq)
+
+
+class EfficiencyMap(object):
+    """Interpolated efficiency and loss maps of one motor design
+
+    Parameters
+    ----------
+    speed : ndarray
+        speed grid (rad/s)
+    torque : ndarray
+        torque magnitude grid (N*m)
+    maps : dict
+        map name -> array of shape ``(len(speed), len(torque))``
+    """
+
+    def __init__(self, speed, torque, maps):
+        self.speed = speed
+        self.torque = torque
+        self.maps = maps
+        self._interpolators = {}
+
+    def __call__(self, speed, torque, name='efficiency'):
+        """Interpolates map `name` at operating points (`speed`, `torque`)
+
+        Args
+        ----
+        speed : float or ndarray
+            shaft speed (rad/s)
+        torque : float or ndarray
+            shaft torque, the sign is ignored (N*m)
+        name : str
+            one of `MAP_NAMES`
+
+        Returns
+        -------
+        ndarray
+            the interpolated values, of the broadcast shape of the inputs
+        """
+        interp = self._interpolators.get(name)
+        if interp is None:
+            interp = self._interpolators[name] = RegularGridInterpolator(
+                (self.speed, self.torque), self.maps[name])
+        speed, torque = np.broadcast_arrays(np.asarray(speed, dtype=float),
+                                            np.abs(np.asarray(torque, dtype=float)))
+        points = np.column_stack((speed.ravel(), torque.ravel()))
+        return interp(points).reshape(speed.shape)
+
+
+def _cache_file(design, n_speed, n_torque, cache_dir):
+    key = repr([MODEL_VERSION] + [(name, repr(design[name])) for name, _ in DESIGN_DEFAULTS] +
+               [n_speed, n_torque])
+    return os.path.join(cache_dir, 'motor_map_%s.npz' % hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+
+def load_efficiency_map(n_speed=200, n_torque=200, cache_dir=DEFAULT_CACHE_DIR, **kwargs):
+    """Returns the `EfficiencyMap` of a motor design, computing and saving it
+    to `cache_dir` only if it is not cached yet
+
+    The grid spans zero to the design (maximum) speed and zero to the maximum
+    torque of the motor. Keyword arguments are the design parameters of
+    `motor_design`. Pass ``cache_dir=None`` to skip the disk cache. Cached
+    maps are keyed on `MODEL_VERSION` as well as the design and grid size.
+
+    Args
+    ----
+    n_speed : int
+        number of speed grid points
+    n_torque : int
+        number of torque grid points
+    cache_dir : str
+        directory of the cached .npz files
+    """
+    design = motor_design(**kwargs)
+
+    filename = None
+    if cache_dir is not None:
+        filename = _cache_file(design, n_speed, n_torque, cache_dir)
+        if os.path.exists(filename):
+            log.debug('loading cached motor map %s', filename)
+            data = np.load(filename)
+            return EfficiencyMap(data['speed'], data['torque'],
+                                 dict((name, data[name]) for name in MAP_NAMES))
+
+    speed = np.linspace(0.0, abs(design['w_operating']), n_speed)
+    torque = np.linspace(0.0, abs(design['max_torque']), n_torque)
+    maps = compute_efficiency_map(design, speed, torque)
+
+    if filename is not None:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        np.savez(filename, speed=speed, torque=torque, **maps)
+        log.debug('saved motor map %s', filename)
+
+    return EfficiencyMap(speed, torque, maps)
+
+
+if __name__ == '__main__':
+    motor_map = load_efficiency_map(design_power=-110000.0, design_torque=-420.169,
+                                    motor_max_current=450.0, motor_LD_ratio=0.83,
+                                    kappa=0.5, core_radius_ratio=0.7)
+
+    # 10000 point mission profile
+    t = np.linspace(0.0, 1.0, 10000)
+    speed = motor_map.speed[-1] * (0.2 + 0.8 * t)
+    torque = 420.169 * (1.0 - 0.5 * t)
+
+    eta = motor_map(speed, torque)
+    print('mean efficiency: %f' % np.mean(eta))
+    print('peak loss:       %f W' % np.max(motor_map(speed, torque, 'power_loss')))
@@ -7,6 +7,8 @@ from __future__ import print_function
 import numpy as np
 from openmdao.api import Component, Problem, Group, Newton, IndepVarComp, ScipyGMRES
 
+from hyperloop.Python.pod.drivetrain import motor_sizing
+
 class MotorBalance(Component):
     """Creates an implicit connection used to balance conservation of energy
     across the motor by computing the residual of power_in - power_out.
@@ -319,41 +321,13 @@ class MotorSize(Component):
             `VecWrapper` containing residuals
 
         """
-        # following sign convention for pycycle
-        design_torque = -params['design_torque']
-        design_power = -params['design_power'] * params['motor_oversize_factor']
-
-        # calc max torque, rotational velocity, power
-        # w_max = params['max_rpm'] * 2.0 * np.pi / 60.0  # rad/sec
-        unknowns['w_operating'] = design_power / design_torque # operating at maximum speed
-        unknowns['w_base'] = params['kappa'] * unknowns['w_operating']
-        unknowns['max_torque'] = design_power / unknowns['w_base']
-        # unknowns['torque'] = design_power / w_max
-
-        # unknowns['w_operating'] = params['speed'] * 2 * np.pi / 60.0
-        unknowns['power_mech'] = unknowns['w_operating'] * design_torque
-
-        # calc size
-        # print('max_torque %f' % unknowns['max_torque'])
-        unknowns['motor_volume'] = 293722.0 * np.power(unknowns['max_torque'],
-                                              0.7592)  # mm^3
-        unknowns['motor_diameter'] = np.power(unknowns['motor_volume'] / params['motor_LD_ratio'],
-                                      1.0 / 3.0) / 1000.0  # m
-        unknowns['motor_length'] = unknowns['motor_diameter'] * params['motor_LD_ratio']  # m
-
-        unknowns['motor_mass'] = 0.0000070646 * np.power(
-            unknowns['motor_volume'],
-            0.9386912061)  # kg, relation in GT paper (Figure 6)
-
-        # calc loss parameters
-        unknowns['power_iron_loss'] = self.calculate_iron_loss(
-            unknowns['motor_diameter'], unknowns['w_operating'], unknowns['motor_length'],
-            params['core_radius_ratio'], params['pole_pairs'])
-        unknowns['winding_resistance'] = self.calculate_copper_loss(
-            unknowns['motor_diameter'], params['motor_max_current'], params['n_phases'])
-        unknowns['power_windage_loss'] = self.calculate_windage_loss(
-            unknowns['w_operating'], unknowns['motor_diameter'], unknowns['motor_length'])
+        sizing = motor_sizing.size_motors(params['design_power'], params['design_torque'],
+                                          params['motor_LD_ratio'], params['motor_max_current'],
+                                          params['pole_pairs'], params['n_phases'], params['kappa'],
+                                          params['core_radius_ratio'], params['motor_oversize_factor'])
 
+        for name, value in sizing.items():
+            unknowns[name] = value
 
     def calculate_windage_loss(self, w_operating, motor_diameter, motor_length):
         """Calculates the windage or frictional losses of a BLDC motor with
@@ -373,7 +347,7 @@ class MotorSize(Component):
         float
             the total windage losses of the motor (W)
         """
-        return 0
+        return motor_sizing.windage_loss(w_operating, motor_diameter, motor_length)
 
     #      # calc Reynolds number losses
     #      Re = np.power(diameter, 2.0) / 4.0 * w_operating / 2.075e-5 * 0.05
@@ -417,19 +391,7 @@ class MotorSize(Component):
             the total resistive losses of the copper winding (W)
 
         """
-        # D-axis resistance per motor phase at very high-speed (short-cruit)
-        Rd = 0.0
-
-        # calc static loading factor from GT paper
-        As = 688.7 * motor_max_current
-
-        # calc total resistance in winding
-        n_coil_turns = As * np.pi * motor_diameter / motor_max_current / n_phases / 2.0
-        resistance_per_km_per_turn = 48.8387296964863 * np.power(
-            motor_max_current, -1.00112597971171)
-        winding_len = motor_diameter * 3.14159
-        resistance_per_turn = resistance_per_km_per_turn * winding_len / 1000.
-        return resistance_per_turn * n_coil_turns * n_phases
+        return motor_sizing.winding_resistance(motor_diameter, motor_max_current, n_phases)
 
     def calculate_iron_loss(self, motor_diameter, motor_speed, motor_length, core_radius_ratio,
                             pole_pairs):
@@ -453,24 +415,8 @@ class MotorSize(Component):
             the total iron core losses of the motor (W)
         """
 
-        stator_core_density = 7650.0  # kg/m^3
-        # hysteresis loss constant
-        Kh = 0.0275  # W/(kg T^2 Hz)
-        # iron eddy loss constant
-        Kc = 1.83e-5  # W/(kg T^2 Hz^2)
-        # correction factor
-        Ke = 2.77e-5  # W/(kg T^1.5 Hz^1.5)
-        # stator magnetic flux density
-        Bp = 1.22  # T
-        # Bp = 1.5
-        # iron losses
-        freq = motor_speed / (2.0 * np.pi) * pole_pairs
-        volume_iron = np.pi * motor_length * np.power(motor_diameter / 2.0, 2.0) * (
-            1.0 - np.power(core_radius_ratio, 2.0))
-        iron_core_mass = stator_core_density * volume_iron
-        power_iron_loss = (Kh * np.power(Bp, 2.0) * freq + Kc * np.power(
-            Bp * freq, 2.0) + Ke * np.power(Bp * freq, 1.5)) * iron_core_mass
-        return power_iron_loss
+        return motor_sizing.iron_loss(motor_diameter, motor_speed, motor_length,
+                                      core_radius_ratio, pole_pairs)
 
 
 class Motor(Component):
@@ -600,33 +546,14 @@ class Motor(Component):
                         units='W')
 
     def solve_nonlinear(self, params, unknowns, resids):
-        # following sign convention for pycycle
-        design_torque = -1 * params['design_torque']
-
-        # voltage constant
-        k_v = (params['motor_max_current'] - params['I0']
-               ) / params['max_torque'] * 30.0 / np.pi
-        # torque constant
-        k_t = 30.0 / np.pi * 1.0 / k_v
-
-        # Calculating phase current, phase voltage, frequency, and phase
-        unknowns['current'] = params['I0'] + design_torque / k_t
-        power_copper_loss = np.power(unknowns['current'],
-                                     2.0) * params['winding_resistance']
-        unknowns['motor_power_input'] = params['power_mech'] + params[
-            'power_windage_loss'] + params[
-                'power_iron_loss'] + power_copper_loss
-
-        unknowns['current'] = params['I0'] + design_torque / k_t
-        unknowns['phase_current'] = unknowns['current'] / params['n_phases']
-
-        unknowns['voltage'] = unknowns['current'] * params[
-            'winding_resistance'] + params['w_operating'] / (k_v * np.pi / 30.0
-                                                             )
-        unknowns['phase_voltage'] = unknowns['voltage'] * np.sqrt(3.0 / 2.0)
-
-        unknowns['frequency'] = params['w_operating'] / np.pi * params[
-            'pole_pairs'] / 60.0
+        performance = motor_sizing.motor_performance(
+            params['I0'], params['design_torque'], params['motor_max_current'],
+            params['max_torque'], params['w_operating'], params['winding_resistance'],
+            params['power_mech'], params['power_iron_loss'], params['power_windage_loss'],
+            params['n_phases'], params['pole_pairs'])
+
+        for name, value in performance.items():
+            unknowns[name] = value
 
 
 if __name__ == '__main__':
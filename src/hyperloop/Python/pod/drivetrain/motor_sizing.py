@@ -0,0 +1,243 @@
+"""
+Vectorized BLDC motor sizing, loss and current/voltage balance functions.
+
+These are the equations of `MotorSize`, `Motor` and `MotorBalance` in
+electric_motor.py written for arrays. All inputs broadcast against each
+other, so a trade study over pole pairs, LD ratio, current limits, etc. is
+one call. `solve_no_load_current` replaces the Newton loop of `MotorGroup`
+with an elementwise Newton iteration over all candidates at once. The
+functions only use complex-safe operations, so the components that delegate
+to them keep their complex step derivatives.
+"""
+from __future__ import print_function
+
+import numpy as np
+
+# stator core density (kg/m^3)
+STATOR_CORE_DENSITY = 7650.0
+# hysteresis loss constant (W/(kg T^2 Hz))
+KH = 0.0275
+# iron eddy loss constant (W/(kg T^2 Hz^2))
+KC = 1.83e-5
+# correction factor (W/(kg T^1.5 Hz^1.5))
+KE = 2.77e-5
+# stator magnetic flux density (T)
+BP = 1.22
+
+
+def iron_loss(motor_diameter, motor_speed, motor_length, core_radius_ratio, pole_pairs):
+    """Iron core hysteresis and eddy current losses (W)
+
+    Args
+    ----
+    motor_diameter : float or ndarray
+        diameter of motor winding (m)
+    motor_speed : float or ndarray
+        operating speed of motor (rad/s)
+    motor_length : float or ndarray
+        motor length (m)
+    core_radius_ratio : float or ndarray
+        ratio of inner diameter to outer diameter of core (unitless)
+    pole_pairs : float or ndarray
+        number of motor pole pairs (unitless)
+    """
+    freq = motor_speed / (2.0 * np.pi) * pole_pairs
+    volume_iron = np.pi * motor_length * np.power(motor_diameter / 2.0, 2.0) * (
+        1.0 - np.power(core_radius_ratio, 2.0))
+    iron_core_mass = STATOR_CORE_DENSITY * volume_iron
+    return (KH * np.power(BP, 2.0) * freq + KC * np.power(BP * freq, 2.0) +
+            KE * np.power(BP * freq, 1.5)) * iron_core_mass
+
+
+def winding_resistance(motor_diameter, motor_max_current, n_phases):
+    """Total resistance of the copper winding (ohm)
+
+    Args
+    ----
+    motor_diameter : float or ndarray
+        diameter of motor winding (m)
+    motor_max_current : float or ndarray
+        max motor phase current (A)
+    n_phases : float or ndarray
+        number of motor phases (unitless)
+    """
+    # static loading factor from GT paper
+    As = 688.7 * motor_max_current
+
+    n_coil_turns = As * np.pi * motor_diameter / motor_max_current / n_phases / 2.0
+    resistance_per_km_per_turn = 48.8387296964863 * np.power(motor_max_current, -1.00112597971171)
+    winding_len = motor_diameter * 3.14159
+    resistance_per_turn = resistance_per_km_per_turn * winding_len / 1000.
+    return resistance_per_turn * n_coil_turns * n_phases
+
+
+def windage_loss(w_operating, motor_diameter, motor_length):
+    """Windage (friction) losses (W). Currently neglected, as in `MotorSize`"""
+    return np.zeros(np.broadcast(w_operating, motor_diameter, motor_length).shape)
+
+
+def size_motors(design_power, design_torque, motor_LD_ratio=0.822727, motor_max_current=42.0,
+                pole_pairs=6.0, n_phases=3.0, kappa=1 / 1.75, core_radius_ratio=0.0,
+                motor_oversize_factor=1.0):
+    """Sizes BLDC motors from their design point
+
+    Args
+    ----
+    design_power : float or ndarray
+        desired design value for motor power (W)
+    design_torque : float or ndarray
+        desired torque at max rpm (N*m)
+    motor_LD_ratio : float or ndarray
+        length to diameter ratio of motor (unitless)
+    motor_max_current : float or ndarray
+        max motor phase current (A)
+    pole_pairs : float or ndarray
+        number of motor pole pairs (unitless)
+    n_phases : float or ndarray
+        number of motor phases (unitless)
+    kappa : float or ndarray
+        ratio of base speed to max speed (unitless)
+    core_radius_ratio : float or ndarray
+        ratio of inner diamter to outer diameter of core (unitless)
+    motor_oversize_factor : float or ndarray
+        scales peak motor power by this figure (unitless)
+
+    Returns
+    -------
+    dict
+        the outputs of `MotorSize`: ``w_operating``, ``w_base`` (rad/s),
+        ``max_torque`` (N*m), ``power_mech`` (W), ``motor_volume`` (mm^3),
+        ``motor_diameter``, ``motor_length`` (m), ``motor_mass`` (kg),
+        ``power_iron_loss`` (W), ``winding_resistance`` (ohm) and
+        ``power_windage_loss`` (W)
+    """
+    # following sign convention for pycycle
+    design_torque = -design_torque
+    design_power = -design_power * motor_oversize_factor
+
+    # operating at maximum speed
+    w_operating = design_power / design_torque
+    w_base = kappa * w_operating
+    max_torque = design_power / w_base
+
+    motor_volume = 293722.0 * np.power(max_torque, 0.7592)  # mm^3
+    motor_diameter = np.power(motor_volume / motor_LD_ratio, 1.0 / 3.0) / 1000.0  # m
+    motor_length = motor_diameter * motor_LD_ratio  # m
+
+    return {'w_operating': w_operating,
+            'w_base': w_base,
+            'max_torque': max_torque,
+            'power_mech': w_operating * design_torque,
+            'motor_volume': motor_volume,
+            'motor_diameter': motor_diameter,
+            'motor_length': motor_length,
+            # kg, relation in GT paper (Figure 6)
+            'motor_mass': 0.0000070646 * np.power(motor_volume, 0.9386912061),
+            'power_iron_loss': iron_loss(motor_diameter, w_operating, motor_length,
+                                         core_radius_ratio, pole_pairs),
+            'winding_resistance': winding_resistance(motor_diameter, motor_max_current, n_phases),
+            'power_windage_loss': windage_loss(w_operating, motor_diameter, motor_length)}
+
+
+def motor_performance(I0, design_torque, motor_max_current, max_torque, w_operating,
+                      winding_resistance, power_mech, power_iron_loss, power_windage_loss=0.0,
+                      n_phases=3.0, pole_pairs=6.0):
+    """Current, voltage and input power of BLDC motors for a given no-load current
+
+    Args
+    ----
+    I0 : float or ndarray
+        motor no-load current (A)
+    design_torque : float or ndarray
+        torque at max rpm (N*m)
+    motor_max_current : float or ndarray
+        max motor phase current (A)
+    max_torque : float or ndarray
+        maximum possible torque for motor (N*m)
+    w_operating : float or ndarray
+        operating speed of motor (rad/s)
+    winding_resistance : float or ndarray
+        total resistance of copper winding (ohm)
+    power_mech : float or ndarray
+        mechanical power output of motor (W)
+    power_iron_loss : float or ndarray
+        total power loss due to iron core (W)
+    power_windage_loss : float or ndarray
+        friction loss from motor operation (W)
+    n_phases : float or ndarray
+        number of motor phases (unitless)
+    pole_pairs : float or ndarray
+        number of motor pole pairs (unitless)
+
+    Returns
+    -------
+    dict
+        the outputs of `Motor`: ``current``, ``phase_current`` (A),
+        ``voltage``, ``phase_voltage`` (V), ``frequency`` (Hz) and
+        ``motor_power_input`` (W)
+    """
+    # following sign convention for pycycle
+    design_torque = -1 * design_torque
+
+    # voltage constant
+    k_v = (motor_max_current - I0) / max_torque * 30.0 / np.pi
+    # torque constant
+    k_t = 30.0 / np.pi * 1.0 / k_v
+
+    current = I0 + design_torque / k_t
+    power_copper_loss = np.power(current, 2.0) * winding_resistance
+    voltage = current * winding_resistance + w_operating / (k_v * np.pi / 30.0)
+
+    return {'current': current,
+            'phase_current': current / n_phases,
+            'voltage': voltage,
+            'phase_voltage': voltage * np.sqrt(3.0 / 2.0),
+            'frequency': w_operating / np.pi * pole_pairs / 60.0,
+            'motor_power_input': power_mech + power_windage_loss + power_iron_loss + power_copper_loss}
+
+
+def solve_no_load_current(design_torque, motor_max_current, max_torque, w_operating,
+                          winding_resistance, power_mech, power_iron_loss, power_windage_loss=0.0,
+                          I0=40.0, atol=1e-4, maxiter=100):
+    """Solves the energy balance ``current * voltage = motor_power_input`` of
+    `MotorBalance` for the no-load current of every candidate at once
+
+    Arguments are those of `motor_performance` and broadcast against each
+    other. `I0` is the initial guess.
+
+    Returns
+    -------
+    I0 : ndarray
+        motor no-load current (A)
+    converged : ndarray
+        True where the residual is below `atol` (W)
+    """
+    tau = -design_torque
+    args = np.broadcast_arrays(I0, tau, motor_max_current, max_torque, w_operating,
+                               winding_resistance, power_mech, power_iron_loss, power_windage_loss)
+    I0, tau, i_max, t_max, w, r_w, p_mech, p_fe, p_wind = [np.array(a, dtype=float) for a in args]
+    p_losses = p_mech + p_fe + p_wind
+
+    for _ in range(maxiter):
+        resid, d_resid = _balance_residual(I0, tau, i_max, t_max, w, r_w, p_losses)
+        active = np.abs(resid) >= atol
+        if not np.any(active):
+            break
+        I0 = np.where(active, I0 - resid / d_resid, I0)
+
+    resid, d_resid = _balance_residual(I0, tau, i_max, t_max, w, r_w, p_losses)
+    return I0, np.abs(resid) < atol
+
+
+def _balance_residual(I0, tau, i_max, t_max, w, r_w, p_losses):
+    """Residual of the `MotorBalance` energy balance and its derivative with
+    respect to the no-load current"""
+    current = I0 + tau * (i_max - I0) / t_max
+    emf = w * t_max / (i_max - I0)
+    voltage = current * r_w + emf
+    resid = current * voltage - (p_losses + current**2 * r_w)
+
+    d_current = 1.0 - tau / t_max
+    d_voltage = r_w * d_current + emf / (i_max - I0)
+    d_resid = d_current * voltage + current * d_voltage - 2.0 * current * r_w * d_current
+    return resid, d_resid
@@ -0,0 +1,216 @@
+"""
+Transient state of charge simulation of a battery pack along a mission profile.
+
+`Battery` sizes the pack for a constant design current. The functions here
+check a candidate pack against a real load profile instead, e.g. the current or
+power history of a trajectory solution or a boost/coast profile. The state of
+charge, the terminal voltage from the cell discharge curve and the I**2*R
+losses are integrated over the trip. Long profiles are processed in chunks,
+so the state carried between chunks is a single discharge value and profiles
+can be streamed from disk or from a solver without holding them in memory.
+"""
+from __future__ import print_function
+from collections import namedtuple
+
+import numpy as np
+
+from hyperloop.Python.pod.drivetrain.discharge_curve import load_discharge_curve
+from hyperloop.Python.tools.log import get_logger
+
+log = get_logger(__name__)
+
+DischargeHistory = namedtuple('DischargeHistory',
+                              'time current voltage soc discharge loss energy_loss')
+
+
+class PackDischarge(object):
+    """Streaming discharge integrator of a pack of identical cells
+
+    Parameters
+    ----------
+    n_series : int
+        number of cells in series
+    n_parallel : int
+        number of parallel strings
+    q_n : float
+        single cell capacity (A*h)
+    r : float
+        internal resistance of a single cell (Ohms)
+    curve : DischargeCurve
+        single cell discharge curve. Defaults to the 18650 curve
+    soc : float
+        initial state of charge (unitless)
+    tol : float
+        convergence tolerance on the cell current of the fixed point
+        iteration used for power profiles (A)
+    maxiter : int
+        maximum number of fixed point iterations per chunk
+
+    Notes
+    -----
+    The cell voltage before the resistive drop is read from the discharge curve
+    at the current depth of discharge. The discharge is integrated with the
+    trapezoidal rule. For a power profile the cell current depends on the
+    terminal voltage, which depends on the discharge. Each chunk therefore
+    iterates ``i = (v - sqrt(v**2 - 4*r*p)) / (2*r)`` to a fixed point.
+
+    The pack is depleted when the cell discharge reaches ``q_n`` or the end of
+    the discharge curve data, whichever comes first. `step` raises a
+    `ValueError` instead of extrapolating the curve past that point.
+    """
+
+    def __init__(self, n_series, n_parallel, q_n=3.5, r=0.0046, curve=None, soc=1.0,
+                 tol=1e-9, maxiter=50):
+        self.n_series = float(n_series)
+        self.n_parallel = float(n_parallel)
+        self.q_n = q_n
+        self.r = r
+        self.curve = load_discharge_curve() if curve is None else curve
+        self.tol = tol
+        self.maxiter = maxiter
+        self.q_max = min(q_n, self.curve.capacity)
+
+        self.discharge = (1.0 - soc) * q_n
+        self.energy_loss = 0.0
+        self._t = None
+        self._i = None
+
+    def _integrate(self, t, i_cell):
+        """Cell discharge (A*h) at `t` (s) for cell currents `i_cell` (A)"""
+        if self._t is None:
+            t_prev, i_prev = t[0], i_cell[0]
+        else:
+            t_prev, i_prev = self._t, self._i
+        dt = np.diff(np.concatenate(([t_prev], t)))
+        i_mid = 0.5 * (np.concatenate(([i_prev], i_cell[:-1])) + i_cell)
+        return self.discharge + np.cumsum(i_mid * dt) / 3600.0
+
+    def _cell_current(self, t, p_cell):
+        """Fixed point iteration for the cell currents of a power chunk"""
+        q = np.full(len(t), self.discharge)
+        i_cell = p_cell / self.curve.voltage(q)
+        for _ in range(self.maxiter):
+            q = self._integrate(t, i_cell)
+            v_oc = self.curve.voltage(q)
+            disc = v_oc**2 - 4.0 * self.r * p_cell
+            if np.any(disc < 0.0):
+                raise ValueError('power demand exceeds the maximum power of the pack')
+            i_new = 2.0 * p_cell / (v_oc + np.sqrt(disc))
+            step = np.max(np.abs(i_new - i_cell))
+            i_cell = i_new
+            if step < self.tol:
+                return i_cell
+        log.warning('pack current did not converge in %d iterations, max update %g A',
+                    self.maxiter, step)
+        return i_cell
+
+    def step(self, t, current=None, power=None):
+        """Advances the pack over one chunk of a load profile
+
+        Args
+        ----
+        t : ndarray
+            increasing time of each sample (s)
+        current : ndarray
+            pack current (A). Exactly one of `current` and `power` is given
+        power : ndarray
+            pack power delivered to the load (W)
+
+        Returns
+        -------
+        DischargeHistory
+            pack current (A), terminal voltage (V), state of charge, cell
+            discharge (A*h), I**2*R loss (W) and cumulative loss energy (W*h)
+            at each sample of the chunk
+        """
+        if (current is None) == (power is None):
+            raise ValueError('specify exactly one of current and power')
+        t = np.asarray(t, dtype=float)
+
+        if current is not None:
+            i_cell = np.broadcast_to(np.asarray(current, dtype=float), t.shape) / self.n_parallel
+        else:
+            p_cell = np.broadcast_to(np.asarray(power, dtype=float), t.shape) / (self.n_series * self.n_parallel)
+            i_cell = self._cell_current(t, p_cell)
+
+        q = self._integrate(t, i_cell)
+        if q[-1] > self.q_max:
+            raise ValueError('pack depleted at t = %g s, cell discharge reaches %g A*h'
+                             % (t[np.argmax(q > self.q_max)], self.q_max))
+        v_cell = self.curve.voltage(q) - self.r * i_cell
+        loss = self.n_series * self.n_parallel * self.r * i_cell**2
+
+        if self._t is None:
+            t_prev, loss_prev = t[0], loss[0]
+        else:
+            t_prev, loss_prev = self._t, self.n_series * self.n_parallel * self.r * self._i**2
+        dt = np.diff(np.concatenate(([t_prev], t)))
+        energy_loss = self.energy_loss + np.cumsum(
+            0.5 * (np.concatenate(([loss_prev], loss[:-1])) + loss) * dt) / 3600.0
+
+        self.discharge = q[-1]
+        self.energy_loss = energy_loss[-1]
+        self._t = t[-1]
+        self._i = i_cell[-1]
+
+        return DischargeHistory(time=t,
+                                current=i_cell * self.n_parallel,
+                                voltage=v_cell * self.n_series,
+                                soc=1.0 - q / self.q_n,
+                                discharge=q,
+                                loss=loss,
+                                energy_loss=energy_loss)
+
+
+def simulate_discharge(t, current=None, power=None, n_series=1, n_parallel=1, chunk_size=4096, **kwargs):
+    """Simulates the discharge of a pack over a whole load profile
+
+    The profile is processed `chunk_size` samples at a time with
+    `PackDischarge`. Keyword arguments are passed to `PackDischarge`.
+
+    Args
+    ----
+    t : ndarray
+        increasing time of each sample (s)
+    current : ndarray
+        pack current (A). Exactly one of `current` and `power` is given
+    power : ndarray
+        pack power delivered to the load (W)
+    n_series : int
+        number of cells in series
+    n_parallel : int
+        number of parallel strings
+    chunk_size : int
+        number of samples integrated per chunk
+
+    Returns
+    -------
+    DischargeHistory
+        the concatenated history of the whole profile
+    """
+    pack = PackDischarge(n_series, n_parallel, **kwargs)
+    t = np.asarray(t, dtype=float)
+    load = np.broadcast_to(np.asarray(current if power is None else power, dtype=float), t.shape)
+
+    chunks = []
+    for start in range(0, len(t), chunk_size):
+        sl = slice(start, start + chunk_size)
+        if power is None:
+            chunks.append(pack.step(t[sl], current=load[sl]))
+        else:
+            chunks.append(pack.step(t[sl], power=load[sl]))
+
+    return DischargeHistory(*[np.concatenate(field) for field in zip(*chunks)])
+
+
+if __name__ == '__main__':
+    # boost/coast profile of a 30 minute trip with a 30 s boost every 5 minutes
+    t = np.linspace(0.0, 1800.0, 18001)
+    power = np.where(np.mod(t, 300.0) < 30.0, 110.0e3, 10.0e3)
+
+    history = simulate_discharge(t, power=power, n_series=100, n_parallel=60)
+
+    print('final state of charge: %f' % history.soc[-1])
+    print('minimum voltage:       %f V' % np.min(history.voltage))
+    print('peak current:          %f A' % np.max(history.current))
+    print('resistive losses:      %f W*h' % history.energy_loss[-1])
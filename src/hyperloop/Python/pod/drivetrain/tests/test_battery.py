@@ -1,6 +1,7 @@
 from __future__ import print_function
 
 import numpy as np
+import pytest
 from openmdao.api import Group, Problem
 
 from hyperloop.Python.pod.drivetrain import battery
@@ -41,3 +42,58 @@ class TestBattery(object):
         assert np.isclose(prob['comp.battery_mass'], 0.34, rtol=0.001)
         assert np.isclose(prob['comp.battery_length'], prob['comp.battery_volume'] / 2.0, rtol=0.001)
 
+
+    def test_case2_vs_baseline(self):
+
+        des_power = np.array([7.0, 50.0, 7000.0, 110000.0])
+        des_current = np.array([1.0, 3.0, 40.0, 500.0])
+
+        # outputs of the scalar Battery before size_batteries was introduced
+        # (spline of the 18650 curve integrated with scipy quad)
+        baseline = {'n_cells': [2.0, 9.0, 1216.0, 19108.0],
+                    'battery_mass': [0.0457095301, 0.205692885, 27.7913943, 436.708851],
+                    'battery_volume': [18.2965989, 82.3346953, 11124.3322, 174805.706],
+                    'output_voltage': [2.4, 6.0, 56.4, 73.2],
+                    'battery_cost': [25.9, 116.55, 15747.2, 247448.6],
+                    'battery_length': [0.00121977326, 0.00548897968, 0.741622144, 11.6537138]}
+
+        sizing = battery.size_batteries(des_power, des_current, 1.0, 2.0)
+
+        for i in range(len(des_power)):
+            prob = create_problem(battery.Battery())
+            prob.setup(check=False)
+
+            prob['comp.des_time'] = 1.0
+            prob['comp.time_of_flight'] = 2.0
+            prob['comp.des_power'] = des_power[i]
+            prob['comp.des_current'] = des_current[i]
+
+            prob.run()
+
+            for name, values in baseline.items():
+                assert np.isclose(sizing[name][i], values[i], rtol=1e-8)
+                assert np.isclose(prob['comp.%s' % name], values[i], rtol=1e-8)
+
+    def test_case3_cell_selection(self):
+
+        prob = create_problem(battery.Battery(cell='sugar_nimh'))
+        prob.setup(check=False)
+
+        prob['comp.des_time'] = 1.0
+        prob['comp.time_of_flight'] = 2.0
+        prob['comp.des_power'] = 7000.0
+        prob['comp.des_current'] = 40.0
+
+        prob.run()
+
+        sizing = battery.size_batteries(7000.0, 40.0, 1.0, 2.0, cell='sugar_nimh')
+
+        assert np.isclose(prob['comp.battery_mass'], prob['comp.n_cells'] * 0.170, rtol=1e-12)
+        assert np.isclose(prob['comp.battery_cost'], prob['comp.n_cells'] * 12.95, rtol=1e-12)
+        assert np.isclose(prob['comp.n_cells'], sizing['n_cells'])
+
+        # the cell replaces q_n and e_nom, giving both is an error
+        with pytest.raises(ValueError):
+            battery.size_batteries(7000.0, 40.0, 1.0, 2.0, q_n=6.5, cell='sugar_nimh')
+        with pytest.raises(KeyError):
+            prob['comp.q_n'] = 6.5
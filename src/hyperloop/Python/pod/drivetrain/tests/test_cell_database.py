@@ -0,0 +1,33 @@
+import numpy as np
+
+from hyperloop.Python.pod.drivetrain import cell_database
+
+
+class TestCellDatabase(object):
+    def test_case1_find_cells(self):
+
+        li_ion = cell_database.find_cells(chemistry='li-ion')
+        ni_mh = cell_database.find_cells(chemistry='ni-mh')
+
+        assert len(cell_database.cell_keys()) >= 24
+        assert 'sugar_nimh' in ni_mh
+        assert set(li_ion) | set(ni_mh) == set(cell_database.cell_keys())
+        assert cell_database.find_cells(max_e_full=1.5) == ni_mh
+
+        keys = cell_database.find_cells(min_capacity=4.0, max_cost=6.0)
+        assert 'samsung_inr21700_50e' in keys
+        for key in cell_database.cell_keys():
+            cell = cell_database.get_cell(key)
+            assert (key in keys) == (cell.capacity >= 4.0 and cell.cost <= 6.0)
+
+    def test_case2_lazy_cached_curves(self):
+
+        for key in cell_database.cell_keys():
+            cell = cell_database.get_cell(key)
+            curve = cell_database.get_curve(key)
+
+            assert curve is cell_database.get_curve(key)
+            assert np.isclose(curve.voltage(0.0), cell.e_full, rtol=0.02)
+            # voltage falls monotonically through the nominal zone
+            v = curve.voltage(np.linspace(0.1, 0.8, 20) * cell.capacity)
+            assert np.all(np.diff(v) < 0.0)
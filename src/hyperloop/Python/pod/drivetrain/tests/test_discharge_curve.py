@@ -0,0 +1,24 @@
+from __future__ import print_function
+
+import numpy as np
+import scipy.integrate
+
+from hyperloop.Python.pod.drivetrain import discharge_curve
+
+
+class TestDischargeCurve(object):
+    def test_case1_energy_vs_quadrature(self):
+
+        curve = discharge_curve.load_discharge_curve()
+
+        for q in (0.5, 2.0, 3.4):
+            energy = scipy.integrate.quad(curve.spline, 0, q * 1000)[0] / 1000
+            assert np.isclose(curve.energy(q), energy, rtol=1e-10)
+
+        assert np.allclose(curve.energy([0.5, 2.0]),
+                           [curve.energy(0.5), curve.energy(2.0)])
+        assert np.isclose(curve.voltage(1.5), curve.spline(1500.0))
+
+    def test_case2_loaded_once(self):
+
+        assert discharge_curve.load_discharge_curve() is discharge_curve.load_discharge_curve()
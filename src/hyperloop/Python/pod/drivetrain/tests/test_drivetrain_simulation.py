@@ -0,0 +1,41 @@
+import numpy as np
+
+from hyperloop.Python.pod.drivetrain import drivetrain_simulation
+from hyperloop.Python.pod.drivetrain.efficiency_map import motor_design, motor_losses
+
+MOTOR = motor_design(design_power=-110000.0, design_torque=-420.169, motor_max_current=450.0,
+                     motor_LD_ratio=0.83, kappa=0.5, core_radius_ratio=0.7)
+
+
+class TestDrivetrainSimulation(object):
+    def test_case1_constant_demand_vs_hand_calc(self):
+
+        t = np.arange(0.0, 7200.0, 1.0)
+        history = drivetrain_simulation.simulate_drivetrain(
+            t, 110000.0, 420.169, MOTOR, n_series=100, n_parallel=200,
+            inverter_efficiency=0.95, motor_heat_capacity=20.0e3, motor_thermal_resistance=0.02)
+
+        loss = motor_losses(MOTOR, MOTOR['w_operating'], 420.169)['power_loss']
+        battery_power = (110000.0 + loss) / 0.95
+
+        assert np.allclose(history.battery_power, battery_power, rtol=1e-12)
+        assert np.allclose(history.inverter_loss, 0.05 * battery_power, rtol=1e-12)
+        assert history.motor_temp[0] == 300.0
+        # 18 thermal time constants, at the steady state temperature
+        assert np.isclose(history.motor_temp[-1], 300.0 + 0.02 * loss, rtol=1e-6)
+        assert np.isclose(history.energy[-1],
+                          battery_power * 7199.0 / 3600.0 + np.trapz(history.battery_loss, t) / 3600.0,
+                          rtol=1e-9)
+
+    def test_case2_chunking(self):
+
+        t = np.arange(0.0, 1800.0, 0.5)
+        power = 110000.0 * (0.7 + 0.3 * np.sin(np.pi * t / 1800.0))
+        torque = power / MOTOR['w_operating']
+
+        whole = drivetrain_simulation.simulate_drivetrain(t, power, torque, MOTOR, 100, 60)
+        chunked = drivetrain_simulation.simulate_drivetrain(t, power, torque, MOTOR, 100, 60,
+                                                            chunk_size=333)
+
+        for name in ('motor_temp', 'soc', 'energy'):
+            assert np.allclose(getattr(whole, name), getattr(chunked, name), rtol=1e-10)
@@ -0,0 +1,52 @@
+import shutil
+import tempfile
+
+import numpy as np
+
+from hyperloop.Python.pod.drivetrain import efficiency_map, motor_sizing
+
+DESIGN = dict(design_power=-110000.0, design_torque=-420.169, motor_max_current=450.0,
+              motor_LD_ratio=0.83, kappa=0.5, core_radius_ratio=0.7)
+
+
+class TestEfficiencyMap(object):
+    def test_case1_design_point_vs_motor(self):
+
+        design = efficiency_map.motor_design(**DESIGN)
+        maps = efficiency_map.compute_efficiency_map(design, [design['w_operating']], [420.169])
+
+        perf = motor_sizing.motor_performance(
+            design['I0'], -420.169, 450.0, design['max_torque'], design['w_operating'],
+            design['winding_resistance'], design['power_mech'], design['power_iron_loss'])
+
+        assert np.isclose(design['I0'], 3.66357, rtol=0.001)
+        assert np.isclose(maps['power_input'][0, 0], perf['motor_power_input'], rtol=1e-10)
+        assert np.isclose(maps['current'][0, 0], perf['current'], rtol=1e-10)
+        assert np.isclose(maps['efficiency'][0, 0], 110000.0 / perf['motor_power_input'], rtol=1e-10)
+
+    def test_case2_disk_cache(self):
+
+        cache_dir = tempfile.mkdtemp()
+        try:
+            motor_map = efficiency_map.load_efficiency_map(n_speed=50, n_torque=40,
+                                                           cache_dir=cache_dir, **DESIGN)
+            cached = efficiency_map.load_efficiency_map(n_speed=50, n_torque=40,
+                                                        cache_dir=cache_dir, **DESIGN)
+        finally:
+            shutil.rmtree(cache_dir)
+
+        speed = np.linspace(50.0, 250.0, 1000)
+        torque = np.linspace(-400.0, -10.0, 1000)
+
+        assert motor_map.maps['efficiency'].shape == (50, 40)
+        assert np.array_equal(motor_map(speed, torque), cached(speed, torque))
+        assert np.all((motor_map(speed, torque) > 0.0) & (motor_map(speed, torque) < 1.0))
+
+        # maps cached by another model version are not reused
+        design = efficiency_map.motor_design(**DESIGN)
+        filename = efficiency_map._cache_file(design, 50, 40, cache_dir)
+        efficiency_map.MODEL_VERSION += 1
+        try:
+            assert efficiency_map._cache_file(design, 50, 40, cache_dir) != filename
+        finally:
+            efficiency_map.MODEL_VERSION -= 1
@@ -0,0 +1,34 @@
+import numpy as np
+
+from hyperloop.Python.pod.drivetrain import motor_sizing
+
+
+class TestMotorSizing(object):
+    def test_case1_batch_vs_npss(self):
+
+        # the two design points of test_motor.py sized in one call
+        design_power = np.array([-0.394*746 / 1.844, -110000.0])
+        design_torque = np.array([-0.801933, -420.169])
+        motor_max_current = np.array([42.0, 450.0])
+
+        sizing = motor_sizing.size_motors(design_power, design_torque,
+                                          motor_LD_ratio=np.array([0.822727, 0.83]),
+                                          motor_max_current=motor_max_current,
+                                          kappa=np.array([1/1.75, 0.5]),
+                                          core_radius_ratio=np.array([0.0, 0.7]))
+
+        I0, converged = motor_sizing.solve_no_load_current(
+            design_torque, motor_max_current, sizing['max_torque'], sizing['w_operating'],
+            sizing['winding_resistance'], sizing['power_mech'], sizing['power_iron_loss'],
+            sizing['power_windage_loss'])
+
+        perf = motor_sizing.motor_performance(
+            I0, design_torque, motor_max_current, sizing['max_torque'], sizing['w_operating'],
+            sizing['winding_resistance'], sizing['power_mech'], sizing['power_iron_loss'])
+
+        assert np.all(converged)
+        assert np.allclose(I0, [2.83556, 3.66357], rtol=0.001)
+        assert np.allclose(perf['voltage'], [7.71165, 505.4611], rtol=0.001)
+        assert np.allclose(perf['current'], [25.21524, 226.767489571], rtol=0.001)
+        assert np.isclose(sizing['motor_volume'][0], 379903, rtol=0.001)
+        assert np.isclose(sizing['motor_mass'][0], 1.22089, rtol=0.001)
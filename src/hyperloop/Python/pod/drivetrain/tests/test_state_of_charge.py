@@ -0,0 +1,50 @@
+from __future__ import print_function
+
+import numpy as np
+import pytest
+
+from hyperloop.Python.pod.drivetrain import state_of_charge
+
+
+class TestStateOfCharge(object):
+    def test_case1_constant_current_vs_hand_calc(self):
+
+        t = np.linspace(0.0, 1800.0, 1001)
+        history = state_of_charge.simulate_discharge(t, current=20.0, n_series=10, n_parallel=4,
+                                                     q_n=3.5, r=0.0046)
+
+        # 5 A per cell for half an hour
+        assert np.isclose(history.soc[-1], 1.0 - 2.5 / 3.5, rtol=1e-12)
+        assert np.isclose(history.loss[0], 40 * 0.0046 * 5.0**2, rtol=1e-12)
+        assert np.isclose(history.energy_loss[-1], 40 * 0.0046 * 5.0**2 * .5, rtol=1e-12)
+
+    def test_case2_power_profile_chunking(self):
+
+        t = np.linspace(0.0, 1800.0, 3001)
+        power = np.where(np.mod(t, 300.0) < 30.0, 110.0e3, 10.0e3)
+
+        whole = state_of_charge.simulate_discharge(t, power=power, n_series=100, n_parallel=60)
+        chunked = state_of_charge.simulate_discharge(t, power=power, n_series=100, n_parallel=60,
+                                                     chunk_size=7)
+
+        assert np.allclose(whole.voltage * whole.current, power, rtol=1e-8)
+        assert np.allclose(whole.soc, chunked.soc, rtol=1e-10)
+        assert np.allclose(whole.energy_loss, chunked.energy_loss, rtol=1e-10)
+
+    def test_case3_depletion(self, caplog):
+
+        # 5 A per cell for one hour is more than the 3.4 A*h of the curve data
+        t = np.linspace(0.0, 3600.0, 1001)
+        with pytest.raises(ValueError):
+            state_of_charge.simulate_discharge(t, current=20.0, n_series=10, n_parallel=4)
+
+        # the pack is empty before the rated capacity when q_n exceeds the curve
+        pack = state_of_charge.PackDischarge(10, 4, q_n=5.0)
+        assert pack.q_max == pack.curve.capacity
+        with pytest.raises(ValueError):
+            pack.step(t, current=20.0)
+
+        # an unconverged power chunk is reported
+        pack = state_of_charge.PackDischarge(100, 60, maxiter=1)
+        pack.step(np.linspace(0.0, 60.0, 11), power=110.0e3)
+        assert 'did not converge' in caplog.text
@@ -8,6 +8,10 @@ from math import pi, sin
 from openmdao.api import Group, Component, IndepVarComp, Problem, ExecComp, ScipyOptimizer
 import numpy as np
 
+from hyperloop.Python.tools.log import get_logger
+
+log = get_logger(__name__)
+
 class BreakPointDrag(Component):
     """
     Current Break Point Drag Calculation very rough. Needs refinement.
@@ -308,7 +312,7 @@ class MagMass(Component):
         unknowns['cost'] = cost
         unknowns['total_pod_mass'] = m_mag + m_pod
 
-        print ("barfoo", unknowns['total_pod_mass'])
+        log.debug('total pod mass with magnets %f kg', unknowns['total_pod_mass'])
 
 if __name__ == "__main__":
 
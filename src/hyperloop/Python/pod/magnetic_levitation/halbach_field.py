@@ -0,0 +1,146 @@
+"""
+Fourier series field of a Halbach array.
+
+An ideal Halbach array of `num_mag_hal` magnets per wavelength and thickness
+`mag_thk` has a field below the array made up of the spatial harmonics
+``nu = 1 + n*num_mag_hal`` (n = 0, 1, 2, ...) of its wavelength [1]_::
+
+    B_y(x, y) = sum b_nu * exp(-nu*k*y) * cos(nu*k*x)
+    B_x(x, y) = sum b_nu * exp(-nu*k*y) * sin(nu*k*x)
+    b_nu = b_res * (1 - exp(-nu*k*mag_thk)) * sin(nu*pi/M) / (nu*pi/M)
+
+with ``k = 2*pi/lam``. The first harmonic is the peak field `b0` of
+`BreakPointDrag`. The coefficients depend only on the magnet geometry and are
+cached per geometry, so sweeps over velocity and levitation height reuse
+them. `levitation_curves.levitation_forces` sums the Inductrack lift and drag
+of the ladder track over these harmonics.
+
+References
+----------
+.. [1] K. Halbach, "Design of Permanent Multipole Magnets with Oriented Rare Earth Cobalt Material,"
+   Nuclear Instruments and Methods 169, 1980
+"""
+from __future__ import print_function
+from collections import OrderedDict, namedtuple
+from math import pi
+
+import numpy as np
+
+HalbachHarmonics = namedtuple('HalbachHarmonics', 'lam order amplitude')
+
+# (b_res, num_mag_hal, mag_thk, spacing, n_harmonics) -> HalbachHarmonics,
+# least recently used first
+_cache = OrderedDict()
+_CACHE_SIZE = 1024
+
+
+def halbach_harmonics(b_res=1.48, num_mag_hal=4.0, mag_thk=0.031416, spacing=0.0, n_harmonics=1):
+    """Spatial harmonics of a Halbach array field, cached per magnet geometry
+
+    Only real scalar geometries are cached, complex-step or array inputs are
+    computed by `harmonic_amplitudes` on every call. The least recently used
+    geometry is dropped once the cache holds `_CACHE_SIZE` of them.
+
+    Args
+    ----
+    b_res : float
+        Residual strength of the Neodynium Magnets (T)
+    num_mag_hal : float
+        Number of Magnets per Halbach Array
+    mag_thk : float
+        Thickness of Magnet (m)
+    spacing : float
+        Halbach Spacing Factor (m)
+    n_harmonics : int
+        number of nonzero harmonics kept
+
+    Returns
+    -------
+    HalbachHarmonics
+        wavelength ``lam`` (m), harmonic ``order`` (multiples of the
+        fundamental wavenumber) and field ``amplitude`` at the array face (T)
+        of each harmonic
+    """
+    geometry = (b_res, num_mag_hal, mag_thk, spacing)
+    if any(np.iscomplexobj(val) or np.size(val) != 1 for val in geometry):
+        return harmonic_amplitudes(b_res, num_mag_hal, mag_thk, spacing, n_harmonics)
+
+    key = tuple(float(val) for val in geometry) + (int(n_harmonics),)
+    harmonics = _cache.pop(key, None)
+    if harmonics is None:
+        harmonics = harmonic_amplitudes(*key)
+        harmonics = harmonics._replace(lam=float(harmonics.lam))
+        if len(_cache) >= _CACHE_SIZE:
+            _cache.popitem(last=False)
+    _cache[key] = harmonics
+    return harmonics
+
+
+def harmonic_amplitudes(b_res, num_mag_hal, mag_thk, spacing=0.0, n_harmonics=1):
+    """Uncached `halbach_harmonics` for arrays of magnet thickness
+
+    Returns
+    -------
+    HalbachHarmonics
+        ``lam`` of the shape of `mag_thk` and ``amplitude`` with one more
+        trailing axis of length `n_harmonics`
+    """
+    mag_thk = np.asarray(mag_thk)
+    lam = num_mag_hal * mag_thk + spacing
+    order = 1.0 + num_mag_hal * np.arange(n_harmonics)
+    x = order * pi / num_mag_hal
+    # signed sinc, the harmonics alternate in sign
+    amplitude = b_res * (1. - np.exp(-2. * pi * order * (mag_thk / lam)[..., np.newaxis])) * \
+        np.sin(x) / x
+    return HalbachHarmonics(lam=lam, order=order, amplitude=amplitude)
+
+
+def clear_harmonic_cache():
+    """Empties the Halbach harmonic cache"""
+    _cache.clear()
+
+
+def halbach_field(x, y, harmonics):
+    """Field of a Halbach array from its harmonics
+
+    Args
+    ----
+    x : float or ndarray
+        position along the array (m)
+    y : float or ndarray
+        distance below the array face (m)
+    harmonics : HalbachHarmonics
+        harmonics returned by `halbach_harmonics`
+
+    Returns
+    -------
+    tuple
+        ``(B_x, B_y)`` arrays of the broadcast shape of `x` and `y` (T)
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    k = 2. * pi * harmonics.order / harmonics.lam
+    b = harmonics.amplitude * np.exp(-k * y[..., np.newaxis])
+    phase = k * x[..., np.newaxis]
+    return np.sum(b * np.sin(phase), axis=-1), np.sum(b * np.cos(phase), axis=-1)
+
+
+def lift_factor(h_lev, harmonics):
+    """Sum over the harmonics of ``b_nu**2 * exp(-2*nu*k*h_lev)`` (T**2)
+
+    The Inductrack lift and drag of every harmonic scale with this squared
+    field at the track. For a single harmonic it is the
+    ``b0**2 * exp(-4*pi*h_lev/lam)`` factor of `BreakPointDrag`.
+    """
+    h_lev = np.asarray(h_lev, dtype=float)
+    k = 2. * pi * harmonics.order / harmonics.lam
+    return np.sum(harmonics.amplitude**2 * np.exp(-2. * k * h_lev[..., np.newaxis]), axis=-1)
+
+
+if __name__ == '__main__':
+    harmonics = halbach_harmonics(n_harmonics=5)
+    print('harmonic order:  %s' % harmonics.order)
+    print('amplitude (T):   %s' % harmonics.amplitude)
+
+    h = np.array([0.005, 0.01, 0.02])
+    print('lift factor 1 harmonic:  %s' % lift_factor(h, halbach_harmonics()))
+    print('lift factor 5 harmonics: %s' % lift_factor(h, harmonics))
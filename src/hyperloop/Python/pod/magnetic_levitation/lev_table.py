@@ -0,0 +1,264 @@
+"""
+Precomputed levitation performance tables.
+
+`generate_lev_table` runs `LevGroup` (`BreakPointDrag`, `MagMass` and
+`MagDrag`) once per point of a grid of pod mass, pod diameter, breakpoint
+velocity, levitation height and cruise velocity and stores the magnetic drag
+and magnet mass in a compressed .npz file. `LevLookup` interpolates the table
+as a drop-in replacement of `LevGroup`, so the pod loop no longer runs the
+levitation model on every iteration::
+
+    table = load_lev_table()
+    pod = PodGroup(lev_table=table)
+
+The magnet mass is proportional to the pod length, so the table is computed
+at a reference length and scaled linearly. The velocity axis is spaced
+geometrically since the drag varies as ``1/vel``.
+"""
+from __future__ import print_function
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+from openmdao.api import Component, Group, Problem, IndepVarComp
+
+from hyperloop.Python.pod.magnetic_levitation.levitation_group import LevGroup
+from hyperloop.Python.tools.log import get_logger, WARNING
+
+log = get_logger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'hyperloop_lev_tables')
+
+TABLE_AXES = ('m_pod', 'd_pod', 'vel_b', 'h_lev', 'vel')
+TABLE_OUTPUTS = ('mag_drag', 'm_mag')
+
+L_POD_REF = 22.0
+
+# part of the cache key of the default table; bump it whenever the LevGroup
+# model changes so tables cached by an older version are regenerated
+MODEL_VERSION = 1
+
+# file name -> LevTable
+_tables = {}
+
+
+def default_axes():
+    """Default grid of `generate_lev_table`, covering the `PodGroup` design space"""
+    return {'m_pod': np.linspace(1000.0, 40000.0, 27),
+            'd_pod': np.linspace(0.5, 3.5, 11),
+            'vel_b': np.array([10.0, 23.0, 50.0]),
+            'h_lev': np.array([0.005, 0.01, 0.02]),
+            'vel': np.logspace(np.log10(20.0), np.log10(400.0), 40)}
+
+
+class LevTable(object):
+    """Interpolated `LevGroup` results
+
+    Parameters
+    ----------
+    axes : dict
+        grid values of every name in `TABLE_AXES`
+    tables : dict
+        array of every name in `TABLE_OUTPUTS` over the grid
+    l_pod : float
+        pod length of the tables (m)
+    """
+
+    def __init__(self, axes, tables, l_pod=L_POD_REF):
+        self.axes = axes
+        self.tables = tables
+        self.l_pod = l_pod
+        grid = tuple(axes[name] for name in TABLE_AXES)
+        self._interpolators = dict(
+            (name, RegularGridInterpolator(grid, tables[name], bounds_error=False, fill_value=None))
+            for name in TABLE_OUTPUTS)
+
+    def __call__(self, m_pod, l_pod, d_pod, vel_b, h_lev, vel):
+        """Interpolates the table, all arguments broadcast against each other
+
+        Returns
+        -------
+        dict
+            ``mag_drag`` (N), ``m_mag`` (kg) and ``total_pod_mass`` (kg)
+        """
+        points = np.broadcast_arrays(*[np.asarray(x, dtype=float)
+                                       for x in (m_pod, d_pod, vel_b, h_lev, vel, l_pod)])
+        shape = points[0].shape
+        l_pod = points.pop()
+        points = np.column_stack([x.ravel() for x in points])
+
+        if log.isEnabledFor(WARNING):
+            lower = [self.axes[name][0] for name in TABLE_AXES]
+            upper = [self.axes[name][-1] for name in TABLE_AXES]
+            if np.any(points < lower) or np.any(points > upper):
+                log.warning('levitation table extrapolated outside of its grid')
+
+        mag_drag = self._interpolators['mag_drag'](points).reshape(shape)
+        m_mag = self._interpolators['m_mag'](points).reshape(shape) * l_pod / self.l_pod
+        return {'mag_drag': mag_drag,
+                'm_mag': m_mag,
+                'total_pod_mass': points[:, 0].reshape(shape) + m_mag}
+
+    def save(self, filename):
+        """Saves the table to a compressed .npz file"""
+        directory = os.path.dirname(os.path.abspath(filename))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        arrays = dict(('axis_' + name, self.axes[name]) for name in TABLE_AXES)
+        arrays.update(self.tables)
+        np.savez_compressed(filename, l_pod=self.l_pod, **arrays)
+
+
+def generate_lev_table(l_pod=L_POD_REF, **axes):
+    """Evaluates `LevGroup` over a grid
+
+    Args
+    ----
+    l_pod : float
+        reference pod length (m)
+    axes
+        grid values of any of `TABLE_AXES`, the others come from
+        `default_axes`
+
+    Returns
+    -------
+    LevTable
+        the tabulated results
+    """
+    grid = default_axes()
+    grid.update((name, np.sort(np.asarray(values, dtype=float))) for name, values in axes.items())
+
+    root = Group()
+    root.add('lev', LevGroup())
+    root.add('inputs', IndepVarComp([(name, 1.0) for name in TABLE_AXES + ('l_pod',)]))
+    for name in TABLE_AXES + ('l_pod',):
+        root.connect('inputs.' + name, 'lev.' + name)
+    prob = Problem(root)
+    prob.setup(check=False)
+    prob['inputs.l_pod'] = l_pod
+
+    shape = tuple(len(grid[name]) for name in TABLE_AXES)
+    tables = dict((name, np.zeros(shape)) for name in TABLE_OUTPUTS)
+    log.debug('evaluating LevGroup at %d points', np.prod(shape))
+    for index in np.ndindex(*shape):
+        for name, i in zip(TABLE_AXES, index):
+            prob['inputs.' + name] = grid[name][i]
+        prob.run()
+        tables['mag_drag'][index] = prob['lev.mag_drag']
+        tables['m_mag'][index] = prob['lev.Mass.m_mag']
+
+    return LevTable(grid, tables, l_pod)
+
+
+def _cache_file(cache_dir):
+    key = repr([MODEL_VERSION, L_POD_REF] +
+               [(name, list(values)) for name, values in sorted(default_axes().items())])
+    return os.path.join(cache_dir, 'lev_table_%s.npz' % hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+
+def load_lev_table(filename=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Returns a `LevTable`, reading each file only once per process
+
+    Args
+    ----
+    filename : str
+        .npz file written by `LevTable.save`. Defaults to the table of
+        `default_axes` in `cache_dir`, which is generated on first use
+        (about 10^5 `LevGroup` runs) and keyed on `MODEL_VERSION`.
+    cache_dir : str
+        directory of the default table
+    """
+    if filename is None:
+        filename = _cache_file(cache_dir)
+        if not os.path.exists(filename):
+            generate_lev_table().save(filename)
+            log.debug('saved levitation table %s', filename)
+    filename = os.path.abspath(filename)
+
+    table = _tables.get(filename)
+    if table is None:
+        data = np.load(filename)
+        table = _tables[filename] = LevTable(dict((name, data['axis_' + name]) for name in TABLE_AXES),
+                                             dict((name, data[name]) for name in TABLE_OUTPUTS),
+                                             float(data['l_pod']))
+    return table
+
+
+class LevLookup(Component):
+    """
+    Table lookup replacement of `LevGroup`.
+
+    Params
+    ------
+    m_pod : float
+        mass of the pod (kg)
+    l_pod : float
+        length of the pod (m)
+    d_pod : float
+        diameter of the pod (m)
+    vel_b : float
+        desired breakpoint levitation speed (m/s)
+    h_lev : float
+        Levitation height. Default value is .01
+    vel : float
+        desired magnetic drag speed (m/s)
+
+    Returns
+    -------
+    mag_drag : float
+        magnetic drag from levitation system (N)
+    total_pod_mass : float
+        total mass of the pod including magnets (kg)
+    m_mag : float
+        mass of the magnets (kg)
+
+    Notes
+    -----
+    `table` is a `LevTable` or the .npz file name of one, e.g.
+    ``LevLookup(load_lev_table())``. It is required, so building the
+    component never generates a table.
+    Derivatives are finite differenced across the interpolant.
+    """
+
+    def __init__(self, table):
+        super(LevLookup, self).__init__()
+        if isinstance(table, LevTable):
+            self.table = table
+        else:
+            self.table = load_lev_table(table)
+
+        self.add_param('m_pod', val=3000.0, units='kg', desc='Pod Mass')
+        self.add_param('l_pod', val=22.0, units='m', desc='Length of Pod')
+        self.add_param('d_pod', val=1.0, units='m', desc='Diameter of the Pod')
+        self.add_param('vel_b', val=23.0, units='m/s', desc='Breakpoint Velocity')
+        self.add_param('h_lev', val=0.01, units='m', desc='Levitation Height')
+        self.add_param('vel', val=350.0, units='m/s', desc='Velocity')
+
+        self.add_output('mag_drag', val=0.0, units='N', desc='Magnetic Drag')
+        self.add_output('total_pod_mass', val=0.0, units='kg', desc='Pod Mass with Magnets')
+        self.add_output('m_mag', val=0.0, units='kg', desc='Mass of Magnets')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        result = self.table(params['m_pod'], params['l_pod'], params['d_pod'], params['vel_b'],
+                            params['h_lev'], params['vel'])
+
+        unknowns['mag_drag'] = float(result['mag_drag'])
+        unknowns['total_pod_mass'] = float(result['total_pod_mass'])
+        unknowns['m_mag'] = float(result['m_mag'])
+
+
+if __name__ == '__main__':
+    prob = Problem()
+    root = prob.root = Group()
+
+    root.add('lev', LevLookup(load_lev_table()))
+
+    prob.setup()
+    prob['lev.m_pod'] = 3000.0
+    prob['lev.vel'] = 350.0
+    prob.run()
+
+    print('Mag_drag %f N' % prob['lev.mag_drag'])
+    print('Total pod mass %f kg' % prob['lev.total_pod_mass'])
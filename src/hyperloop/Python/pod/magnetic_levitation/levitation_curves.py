@@ -0,0 +1,283 @@
+"""
+Vectorized levitation lift and drag curves.
+Evaluates the Inductrack model of breakpoint_levitation.py and magnetic_drag.py
+over arrays of velocity and levitation height in one call, for example at
+every node of a trajectory or over a full velocity x height grid.
+
+With ``n_harmonics > 1`` the lift and drag are summed over the spatial
+harmonics of the Halbach field (`halbach_field`). Each harmonic ``nu`` sees a
+ladder track inductance ``track_ind/nu`` at the induced frequency
+``nu*omega``, so all harmonics share the breakpoint ratio
+``track_res/(omega*track_ind)`` and only the field strength at the track
+changes. One harmonic reproduces `BreakPointDrag`.
+
+Notes
+-----
+There is no induced-current solve of the laminated ladder track. The track
+is the lumped resistance and inductance of `BreakPointDrag`, the same for
+every harmonic. Skin depth in the laminations, the mutual inductance of
+neighbouring rungs and any other frequency dependence of the track are
+ignored. This is what makes the breakpoint ratio the same for all harmonics.
+"""
+from __future__ import print_function
+from math import pi
+
+import numpy as np
+from openmdao.api import Group, Component, Problem
+
+from hyperloop.Python.pod.magnetic_levitation.halbach_field import halbach_harmonics, lift_factor
+
+
+def halbach_track(b_res=1.48, num_mag_hal=4.0, mag_thk=0.031416, spacing=0.0, d_pod=1.0,
+                  track_factor=0.75, w_strip=0.005, num_sheets=1.0, delta_c=0.0321,
+                  strip_c=0.0105, rc=1.713e-8, MU0=4.0 * pi * 10**-7, n_harmonics=1):
+    """Halbach array and laminated track properties of `BreakPointDrag`
+
+    Args
+    ----
+    b_res : float
+        Residual strength of the Neodynium Magnets (T)
+    num_mag_hal : float
+        Number of Magnets per Halbach Array
+    mag_thk : float
+        Thickness of Magnet (m)
+    spacing : float
+        Halbach Spacing Factor (m)
+    d_pod : float
+        Diameter of the pod (m)
+    track_factor : float
+        Factor to adjust track width
+    w_strip : float
+        Width of conductive strip (m)
+    num_sheets : float
+        Number of laminated sheets
+    delta_c : float
+        Single layer thickness (m)
+    strip_c : float
+        Center strip spacing (m)
+    rc : float
+        Electric resistivity (ohm*m)
+    MU0 : float
+        Permeability of Free Space (ohm*s/m)
+    n_harmonics : int
+        number of Halbach field harmonics
+
+    Returns
+    -------
+    dict
+        ``lam`` Halbach wavelength (m), ``b0`` Halbach peak strength (T),
+        ``harmonics`` the cached `halbach_field.HalbachHarmonics`,
+        ``w_track`` track width (m), ``track_res`` track resistance (ohm) and
+        ``track_ind`` track inductance (ohm*s)
+    """
+    w_track = d_pod * track_factor
+    harmonics = halbach_harmonics(b_res, num_mag_hal, mag_thk, spacing, n_harmonics)
+    lam = harmonics.lam
+    return {'lam': lam,
+            'b0': harmonics.amplitude[0],
+            'harmonics': harmonics,
+            'w_track': w_track,
+            'track_res': rc * w_track / (delta_c * w_strip * num_sheets),
+            'track_ind': MU0 * w_track / (4 * pi * strip_c / lam)}
+
+
+def levitation_forces(vel, h_lev, m_pod=3000.0, l_pod=22.0, gamma=0.005502, g=9.81, strip_c=0.0105,
+                      n_harmonics=1, grid=False, **track):
+    """Lift, drag and magnetic drag of the Inductrack levitation system
+
+    `vel` and `h_lev` broadcast against each other. With ``grid=True`` they
+    are 1-D axes and the results are evaluated on the ``(len(vel),
+    len(h_lev))`` grid.
+
+    Args
+    ----
+    vel : float or ndarray
+        Velocity of the pod (m/s)
+    h_lev : float or ndarray
+        Levitation height (m)
+    m_pod : float
+        Mass of the pod (kg)
+    l_pod : float
+        Length of the pod (m)
+    gamma : float
+        Percent factor used in magnet area
+    g : float
+        Gravitational acceleration (m/s**2)
+    strip_c : float
+        Center strip spacing (m)
+    n_harmonics : int
+        number of Halbach field harmonics summed
+    grid : bool
+        Evaluate on the outer product of `vel` and `h_lev`
+    track
+        other Halbach array and track parameters of `halbach_track`
+
+    Returns
+    -------
+    dict
+        the `halbach_track` properties and, at each point, ``omega`` induced
+        frequency (rad/s), ``fyu`` levitation force (N), ``fxu`` drag force
+        (N), ``ld_ratio`` lift to drag ratio and ``mag_drag_lev`` magnetic
+        drag when levitating the pod weight (N). All forces are zero at zero
+        velocity, where the pod is not levitating.
+    """
+    props = halbach_track(strip_c=strip_c, n_harmonics=n_harmonics, **track)
+    lam = props['lam']
+    track_res = props['track_res']
+    track_ind = props['track_ind']
+    # magnet array as wide as the track in this simple model
+    w_mag = props['w_track']
+    mag_area = w_mag * l_pod * gamma
+
+    vel = np.asarray(vel, dtype=float)
+    h_lev = np.asarray(h_lev, dtype=float)
+    if grid:
+        vel, h_lev = np.meshgrid(vel, h_lev, indexing='ij')
+    else:
+        vel, h_lev = np.broadcast_arrays(vel, h_lev)
+
+    moving = vel != 0.0
+    omega = 2 * pi * vel / lam
+    # track_res / (omega * track_ind), zero where the pod is at rest
+    ratio = np.zeros(vel.shape)
+    np.divide(track_res, omega * track_ind, out=ratio, where=moving)
+
+    f0 = (w_mag / (4. * pi * track_ind * strip_c / lam)) * lift_factor(
+        h_lev, props['harmonics']) * mag_area
+    fyu = np.where(moving, f0 / (1. + ratio**2), 0.0)
+    fxu = f0 * ratio / (1. + ratio**2)
+
+    ld_ratio = np.zeros(vel.shape)
+    np.divide(fyu, fxu, out=ld_ratio, where=moving)
+
+    props.update(omega=omega,
+                 fyu=fyu,
+                 fxu=fxu,
+                 ld_ratio=ld_ratio,
+                 mag_drag_lev=m_pod * g * ratio)
+    return props
+
+
+class LevitationCurves(Component):
+    """
+    Vectorized version of `BreakPointDrag` and `MagDrag` over a velocity x
+    levitation height grid.
+
+    Params
+    ------
+    vel : ndarray
+        Velocities of the pod (m/s)
+    h_lev : ndarray
+        Levitation heights (m)
+    m_pod : float
+        Mass of the hyperloop pod (kg)
+    b_res : float
+        Residual strength of the Neodynium Magnets (T)
+    num_mag_hal : float
+        Number of Magnets per Halbach Array
+    mag_thk : float
+        Thickness of Magnet (m)
+    l_pod : float
+        Length of the Hyperloop pod (m)
+    gamma : float
+        Percent factor used in Area
+    spacing : float
+        Halbach Spacing Factor (m)
+    d_pod : float
+        Diameter of the pod (m)
+    w_strip : float
+        Width of conductive strip (m)
+    num_sheets : float
+        Number of laminated sheets
+    delta_c : float
+        Single layer thickness (m)
+    strip_c : float
+        Center strip spacing (m)
+    rc : float
+        Electric resistivity (ohm*m)
+    MU0 : float
+        Permeability of Free Space (ohm*s/m)
+    track_factor : float
+        Factor to adjust track width
+    g : float
+        Gravitational Acceleration (m/s**2)
+
+    Returns
+    -------
+    fyu : ndarray
+        Levitation force at each velocity and height (N)
+    fxu : ndarray
+        Drag force at each velocity and height (N)
+    ld_ratio : ndarray
+        Lift to drag ratio at each velocity and height
+    mag_drag_lev : ndarray
+        Magnetic drag levitating the pod weight at each velocity (N)
+
+    Notes
+    -----
+    Outputs have shape ``(n_vel, n_h)``. `n_harmonics` Halbach field
+    harmonics are summed, see `levitation_forces`.
+    """
+
+    def __init__(self, n_vel=1, n_h=1, n_harmonics=1):
+        super(LevitationCurves, self).__init__()
+        self.n_harmonics = n_harmonics
+
+        self.add_param('vel', val=np.linspace(23.0, 350.0, n_vel), units='m/s', desc='Velocities')
+        self.add_param('h_lev', val=np.full(n_h, 0.01), units='m', desc='Levitation Heights')
+
+        # Pod Inputs
+        self.add_param('m_pod', val=3000.0, units='kg', desc='Pod Mass')
+        self.add_param('b_res', val=1.48, units='T', desc='Residual Magnetic Flux')
+        self.add_param('num_mag_hal', val=4.0, desc='Number of Magnets per Halbach Array')
+        self.add_param('mag_thk', val=0.031416, units='m', desc='Thickness of magnet')
+        self.add_param('l_pod', val=22.0, units='m', desc='Length of Pod')
+        self.add_param('gamma', val=0.005502, desc='Percent Factor')
+        self.add_param('spacing', val=0.0, units='m', desc='Halbach Spacing Factor')
+
+        # Track Inputs (laminated track)
+        self.add_param('d_pod', val=1.0, units='m', desc='Diameter of the Pod')
+        self.add_param('w_strip', val=0.005, units='m', desc='Width of Conductive Strip')
+        self.add_param('num_sheets', val=1.0, desc='Number of Laminated Sheets')
+        self.add_param('delta_c', val=0.0321, units='m', desc='Single Layer Thickness')
+        self.add_param('strip_c', val=0.0105, units='m', desc='Center Strip Spacing')
+        self.add_param('rc', val=1.713 * 10 ** -8, units='ohm-m', desc='Electric Resistivity')
+        self.add_param('MU0', val=4.0 * pi * 10 ** -7, units='ohm*s/m', desc='Permeability of Free Space')
+        self.add_param('track_factor', val=0.75, desc='Track Width Factor')
+        self.add_param('g', val=9.81, units='m/s**2', desc='Gravity')
+
+        # Outputs
+        shape = (n_vel, n_h)
+        self.add_output('fyu', val=np.zeros(shape), units='N', desc='Levitation Force')
+        self.add_output('fxu', val=np.zeros(shape), units='N', desc='Drag Force')
+        self.add_output('ld_ratio', val=np.zeros(shape), desc='Lift to Drag Ratio')
+        self.add_output('mag_drag_lev', val=np.zeros(shape), units='N', desc='Magnetic Drag from Levitation')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        track = dict((name, params[name]) for name in
+                     ('b_res', 'num_mag_hal', 'mag_thk', 'spacing', 'd_pod', 'track_factor',
+                      'w_strip', 'num_sheets', 'delta_c', 'strip_c', 'rc', 'MU0'))
+        forces = levitation_forces(params['vel'], params['h_lev'], m_pod=params['m_pod'],
+                                   l_pod=params['l_pod'], gamma=params['gamma'], g=params['g'],
+                                   n_harmonics=self.n_harmonics, grid=True, **track)
+
+        unknowns['fyu'] = forces['fyu']
+        unknowns['fxu'] = forces['fxu']
+        unknowns['ld_ratio'] = forces['ld_ratio']
+        unknowns['mag_drag_lev'] = forces['mag_drag_lev']
+
+
+if __name__ == "__main__":
+    top = Problem()
+    root = top.root = Group()
+
+    root.add('p', LevitationCurves(n_vel=5, n_h=3))
+
+    top.setup()
+    top['p.h_lev'] = np.array([0.005, 0.01, 0.02])
+    top.run()
+
+    print('lift (N)')
+    print(top['p.fyu'])
+    print('magnetic drag (N)')
+    print(top['p.mag_drag_lev'][:, 0])
@@ -0,0 +1,230 @@
+"""
+Multi-start optimizer of the levitation magnet sizing.
+
+Sizes the magnet thickness `mag_thk` and area factor `gamma` of the Halbach
+arrays so the lift at the breakpoint velocity carries the pod, trading magnet
+mass (`MagMass`) against breakpoint drag (`BreakPointDrag`) with the weighted
+objective of the `breakpoint_levitation.py` example::
+
+    minimize   alpha*fxu/1000 + (1 - alpha)*m_mag
+    subject to fyu >= m_pod*g
+
+Lift, drag and magnet mass are evaluated in closed form with analytic
+gradients (`magnet_performance`) and every (alpha, start point) pair is
+solved with SLSQP in a process pool. The nondominated designs of all runs
+form the Pareto set of magnet mass versus breakpoint drag.
+
+Notes
+-----
+The Inductrack drag is ``fxu = track_res/(omega*track_ind)*fyu`` and the
+breakpoint ratio does not depend on the magnets. Wherever the lift
+constraint is active the drag is the pod weight times that ratio, so the
+Pareto set often collapses to the minimum mass design. Extra lift, and so
+extra drag, only comes with extra magnet mass.
+"""
+from __future__ import print_function
+import multiprocessing
+from collections import namedtuple
+from math import pi
+
+import numpy as np
+from scipy.optimize import minimize
+
+from hyperloop.Python.pod.magnetic_levitation.halbach_field import harmonic_amplitudes
+
+MagnetDesign = namedtuple('MagnetDesign', 'mag_thk gamma m_mag fyu fxu alpha success')
+
+# `BreakPointDrag` and `MagMass` defaults
+DESIGN_DEFAULTS = (('vel_b', 23.0),
+                   ('h_lev', 0.01),
+                   ('l_pod', 22.0),
+                   ('d_pod', 1.0),
+                   ('rho_mag', 7500.0),
+                   ('b_res', 1.48),
+                   ('num_mag_hal', 4.0),
+                   ('spacing', 0.0),
+                   ('track_factor', 0.75),
+                   ('w_strip', 0.005),
+                   ('num_sheets', 1.0),
+                   ('delta_c', 0.0321),
+                   ('strip_c', 0.0105),
+                   ('rc', 1.713e-8),
+                   ('MU0', 4.0 * pi * 10**-7),
+                   ('n_harmonics', 1))
+
+
+def magnet_performance(mag_thk, gamma, vel_b=23.0, h_lev=0.01, l_pod=22.0, d_pod=1.0, rho_mag=7500.0,
+                       b_res=1.48, num_mag_hal=4.0, spacing=0.0, track_factor=0.75, w_strip=0.005,
+                       num_sheets=1.0, delta_c=0.0321, strip_c=0.0105, rc=1.713e-8,
+                       MU0=4.0 * pi * 10**-7, n_harmonics=1):
+    """Breakpoint lift and drag and magnet mass with their gradients
+
+    `mag_thk` and `gamma` broadcast against each other, the other parameters
+    are those of `BreakPointDrag` and `MagMass`.
+
+    Args
+    ----
+    mag_thk : float or ndarray
+        Thickness of Magnet (m)
+    gamma : float or ndarray
+        Percent factor used in magnet area
+    n_harmonics : int
+        number of Halbach field harmonics summed
+
+    Returns
+    -------
+    dict
+        ``fyu`` lift (N), ``fxu`` drag (N) and ``m_mag`` magnet mass (kg) at
+        `vel_b` and `h_lev`, and ``d<name>`` their gradients with respect to
+        (`mag_thk`, `gamma`) along a trailing axis of length 2
+    """
+    mag_thk, gamma = np.broadcast_arrays(np.asarray(mag_thk, dtype=float),
+                                         np.asarray(gamma, dtype=float))
+
+    w_track = d_pod * track_factor
+    track_res = rc * w_track / (delta_c * w_strip * num_sheets)
+    mag_area = w_track * l_pod * gamma
+
+    harmonics = harmonic_amplitudes(b_res, num_mag_hal, mag_thk, spacing, n_harmonics)
+    lam = harmonics.lam[..., np.newaxis]
+    order = harmonics.order
+    b = harmonics.amplitude
+    track_ind = MU0 * w_track / (4 * pi * strip_c / lam[..., 0])
+    omegab = 2 * pi * vel_b / lam[..., 0]
+    ratio = track_res / (omegab * track_ind)
+
+    # lift factor sum(b**2 * exp(-4*pi*order*h_lev/lam)) and its mag_thk derivative
+    decay = np.exp(-4. * pi * order * h_lev / lam)
+    field = np.exp(-2. * pi * order * mag_thk[..., np.newaxis] / lam)
+    db = b / (1. - field) * field * 2. * pi * order * spacing / lam**2
+    lift = np.sum(b**2 * decay, axis=-1)
+    dlift = np.sum((2. * b * db + b**2 * 4. * pi * order * h_lev * num_mag_hal / lam**2) * decay, axis=-1)
+
+    # b0**2*w_mag/(4*pi*track_ind*strip_c/lam) reduces to b0**2/MU0
+    fyu = lift / MU0 * mag_area / (1. + ratio**2)
+    fxu = ratio * fyu
+    m_mag = rho_mag * mag_area * mag_thk
+
+    dfyu = np.stack((fyu * dlift / lift, fyu / gamma), axis=-1)
+    return {'fyu': fyu,
+            'fxu': fxu,
+            'm_mag': m_mag,
+            'dfyu': dfyu,
+            'dfxu': ratio[..., np.newaxis] * dfyu,
+            'dm_mag': np.stack((m_mag / mag_thk, m_mag / gamma), axis=-1)}
+
+
+def _optimize_start(args):
+    """Solves one weighted problem from one start point, run in the worker processes"""
+    x0, alpha, weight, bounds, design = args
+    lower = np.array([bounds[0][0], bounds[1][0]])
+    span = np.array([bounds[0][1], bounds[1][1]]) - lower
+
+    def evaluate(z):
+        x = lower + z * span
+        return magnet_performance(x[0], x[1], **design)
+
+    perf0 = evaluate((np.asarray(x0) - lower) / span)
+    scale = 1.0 / max(abs(alpha * perf0['fxu'] / 1000. + (1. - alpha) * perf0['m_mag']), 1.0)
+
+    def objective(z):
+        perf = evaluate(z)
+        f = alpha * perf['fxu'] / 1000. + (1. - alpha) * perf['m_mag']
+        df = alpha * perf['dfxu'] / 1000. + (1. - alpha) * perf['dm_mag']
+        return float(f) * scale, df * span * scale
+
+    def lift(z):
+        return float((evaluate(z)['fyu'] - weight) / weight)
+
+    def lift_jac(z):
+        return evaluate(z)['dfyu'] * span / weight
+
+    result = minimize(objective, (np.asarray(x0) - lower) / span, jac=True, method='SLSQP',
+                      bounds=[(0.0, 1.0), (0.0, 1.0)],
+                      constraints=[{'type': 'ineq', 'fun': lift, 'jac': lift_jac}],
+                      options={'ftol': 1e-10, 'maxiter': 200})
+
+    z = np.clip(result.x, 0.0, 1.0)
+    perf = evaluate(z)
+    x = lower + z * span
+    feasible = perf['fyu'] >= weight * (1. - 1e-6)
+    return MagnetDesign(mag_thk=float(x[0]), gamma=float(x[1]), m_mag=float(perf['m_mag']),
+                        fyu=float(perf['fyu']), fxu=float(perf['fxu']), alpha=alpha,
+                        success=bool(result.success and feasible))
+
+
+def pareto_front(m_mag, fxu, rtol=1e-6):
+    """Indices of the designs not dominated in (magnet mass, drag), by increasing mass"""
+    m_mag = np.asarray(m_mag, dtype=float)
+    fxu = np.asarray(fxu, dtype=float)
+    order = np.lexsort((fxu, m_mag))
+    # lowest drag of all lighter designs
+    best = np.minimum.accumulate(np.concatenate(([np.inf], fxu[order][:-1])))
+    return order[fxu[order] < best * (1. - rtol)]
+
+
+def optimize_magnets(m_pod=3000.0, g=9.81, alphas=None, n_starts=8, processes=None, seed=0,
+                     mag_thk_bounds=(0.01, 0.15), gamma_bounds=(0.1, 1.0), **design):
+    """Multi-start optimization of the magnet sizing of one pod design
+
+    Args
+    ----
+    m_pod : float
+        Mass of the pod with no magnets (kg)
+    g : float
+        Gravitational acceleration (m/s**2)
+    alphas : ndarray
+        drag weights of the objective, defaults to 5 values from 0 to 1
+    n_starts : int
+        number of random start points per weight
+    processes : int
+        size of the process pool, ``None`` for one per cpu and ``1`` to run
+        in this process
+    seed : int
+        seed of the random start points
+    mag_thk_bounds : tuple
+        bounds of the magnet thickness (m)
+    gamma_bounds : tuple
+        bounds of the area factor
+    design
+        other parameters of `magnet_performance` (see `DESIGN_DEFAULTS`)
+
+    Returns
+    -------
+    tuple
+        ``(pareto, designs)``: the feasible nondominated `MagnetDesign` by
+        increasing magnet mass, and the results of every run
+    """
+    unknown = set(design) - set(name for name, _ in DESIGN_DEFAULTS)
+    if unknown:
+        raise ValueError('unknown magnet design parameters: %s' % ', '.join(sorted(unknown)))
+    if alphas is None:
+        alphas = np.linspace(0.0, 1.0, 5)
+
+    bounds = (tuple(mag_thk_bounds), tuple(gamma_bounds))
+    starts = np.random.RandomState(seed).uniform([bounds[0][0], bounds[1][0]],
+                                                 [bounds[0][1], bounds[1][1]], (n_starts, 2))
+    runs = [(x0, float(alpha), m_pod * g, bounds, design) for alpha in alphas for x0 in starts]
+
+    if processes == 1:
+        designs = [_optimize_start(run) for run in runs]
+    else:
+        pool = multiprocessing.Pool(processes)
+        try:
+            designs = pool.map(_optimize_start, runs)
+        finally:
+            pool.close()
+            pool.join()
+
+    feasible = [d for d in designs if d.success]
+    front = pareto_front([d.m_mag for d in feasible], [d.fxu for d in feasible])
+    return [feasible[i] for i in front], designs
+
+
+if __name__ == '__main__':
+    # pod of the breakpoint_levitation.py example
+    pareto, designs = optimize_magnets(m_pod=30000.0, d_pod=2.0, n_starts=16)
+
+    print('%d runs, %d converged' % (len(designs), sum(d.success for d in designs)))
+    for d in pareto:
+        print('mag_thk %f m  gamma %f  m_mag %f kg  fxu %f N' % (d.mag_thk, d.gamma, d.m_mag, d.fxu))
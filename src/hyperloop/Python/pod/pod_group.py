@@ -9,6 +9,7 @@ from hyperloop.Python.pod.pod_mach import PodMach
 from hyperloop.Python.pod.cycle.cycle_group import Cycle
 from hyperloop.Python.pod.pod_geometry import PodGeometry
 from hyperloop.Python.pod.magnetic_levitation.levitation_group import LevGroup
+from hyperloop.Python.pod.magnetic_levitation.lev_table import LevLookup
 from openmdao.api import Newton, ScipyGMRES
 from openmdao.units.units import convert_units as cu
 
@@ -80,18 +81,30 @@ class PodGroup(Group):
     ----------
     .. [1] Friend, Paul. Magnetic Levitation Train Technology 1. Thesis.
        Bradley University, 2004. N.p.: n.p., n.d. Print.
+
+    Notes
+    -----
+    ``cycle_model`` is passed to `Cycle`: 'pycycle' or the ideal-gas fast
+    mode 'ideal'.
+
+    ``lev_table`` is a `LevTable` interpolated by `LevLookup` in place of
+    `LevGroup`, see `lev_table.py`.
     """
-    def __init__(self):
+    def __init__(self, lev_table=None, cycle_model='pycycle'):
         super(PodGroup, self).__init__()
 
-        self.add('cycle', Cycle(), promotes=['comp.map.PRdes', 'nozzle.Ps_exhaust', 'comp_inlet_area',
+        cycle = Cycle(cycle_model=cycle_model)
+        self.add('cycle', cycle, promotes=['comp.map.PRdes', 'nozzle.Ps_exhaust', 'comp_inlet_area',
                                              'nozzle.Fg', 'inlet.F_ram', 'nozzle.Fl_O:tot:T', 'nozzle.Fl_O:stat:W',
                                              'pod_mach', 'tube_pressure', 'tube_temp'])
         self.add('pod_mach', PodMach(), promotes=['A_tube'])
         self.add('drivetrain', Drivetrain(), promotes=['des_time', 'time_of_flight', 'motor_max_current', 'motor_LD_ratio',
                                                        'inverter_efficiency', 'motor_oversize_factor', 'battery_cross_section_area'])
         self.add('pod_geometry', PodGeometry(), promotes=['A_payload', 'n_passengers', 'S', 'L_pod'])
-        self.add('levitation_group', LevGroup(), promotes=['vel_b', 'h_lev', 'vel', 'mag_drag', 'total_pod_mass'])
+        if lev_table is None:
+            self.add('levitation_group', LevGroup(), promotes=['vel_b', 'h_lev', 'vel', 'mag_drag', 'total_pod_mass'])
+        else:
+            self.add('levitation_group', LevLookup(lev_table), promotes=['vel_b', 'h_lev', 'vel', 'mag_drag', 'total_pod_mass'])
         self.add('pod_mass', PodMass())
 
         # Connects pod group level variables to downstream components
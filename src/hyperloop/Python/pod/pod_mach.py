@@ -8,6 +8,7 @@ from __future__ import print_function
 
 import numpy as np
 from openmdao.api import IndepVarComp, Component, Group, Problem, ExecComp
+from hyperloop.Python.freestream import freestream_state
 
 class PodMach(Component):
     """
@@ -151,9 +152,9 @@ class PodMach(Component):
             return A_ratio
 
         #Define intermediate variables
-        rho_inf = p_tube / (R *
-                            T_ambient)  #Calculate density of free stream flow
-        U_inf = M_pod * (np.sqrt((gam * R * T_ambient)))        #Calculate velocity of free stream flow
+        state = freestream_state(p_tube, T_ambient, M_pod, gam, R)
+        rho_inf = state.rho  #Calculate density of free stream flow
+        U_inf = state.V        #Calculate velocity of free stream flow
         r_pod = np.sqrt((A_pod / np.pi))  #Calculate pod radius
 
         Re = (rho_inf * U_inf *
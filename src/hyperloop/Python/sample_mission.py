@@ -3,6 +3,11 @@ from __future__ import print_function
 import numpy as np
 from openmdao.api import IndepVarComp, Component, Group, Problem
 
+from hyperloop.Python.tools.log import get_logger
+
+# logs under the mission subsystem although the module sits at the package root
+log = get_logger('hyperloop.Python.mission.sample_mission')
+
 class SampleMission(Component):
 	'''
 	Notes
@@ -119,7 +124,7 @@ class SampleMission(Component):
 				((dt/m_pod)*(net_thrust - (.5*Cd*rho*S*(v**2.0)) - (m_pod*g*np.sin(theta)) - D_mag)))/2.0
 			x = x + ((v_old+v)/2.0)*dt
 			if v > v_old:
-				print('thrust greater than drag')
+				log.warning('thrust greater than drag at v = %f m/s', v)
 				break
 
 			i = i + 1.0
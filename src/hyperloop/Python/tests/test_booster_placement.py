@@ -0,0 +1,133 @@
+"""
+Test for booster_placement.py. The closed form coast matches an integration
+of the equation of motion, and both placements match a brute force search
+over every set of stations on a short route.
+"""
+import itertools
+
+import numpy as np
+from openmdao.api import Group, Problem
+from scipy.integrate import odeint
+
+from hyperloop.Python.tube.booster_placement import (BoosterPlacement, coast_maps, place_boosters,
+                                                     route_grades)
+
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    prob.setup(check=False)
+    return prob
+
+
+def brute_force(length, theta, weight, vf=335.0, v_min=300.0, eta=.8, m_pod=3100.0):
+    """Cheapest feasible stations by trying every set"""
+    alpha, beta = coast_maps(length, theta=theta, m_pod=m_pod)
+    best = (np.inf, None)
+    for rest in itertools.product((False, True), repeat=len(length) - 1):
+        stations = np.array((True,) + rest)
+        E = 0.0
+        energy = 0.0
+        feasible = True
+        for j in range(len(length)):
+            if stations[j]:
+                energy += m_pod * (.5 * vf**2 - E) / eta
+                E = .5 * vf**2
+            E = alpha[j] * E + beta[j]
+            feasible = feasible and E >= .5 * v_min**2
+        cost = np.sum(stations) + weight * energy
+        if feasible and cost < best[0]:
+            best = (cost, stations)
+    return best
+
+
+class TestBoosterPlacement(object):
+    def test_case1_coast(self):
+        # graded segment against the equation of motion
+        m_pod, g, theta = 3100.0, 9.81, .02
+        rho = 100.0 / (286.9 * 293.0)
+
+        def dvdx(v, x):
+            return -(m_pod * g * np.sin(theta) + 150.0 + .5 * rho * v**2 * .2 * 1.4) / (m_pod * v)
+
+        v = odeint(dvdx, 335.0, [0.0, 20.0e3], rtol=1e-10, atol=1e-10)[-1, 0]
+        alpha, beta = coast_maps(20.0e3, theta=theta, m_pod=m_pod)
+        assert np.isclose(np.sqrt(2 * (alpha * .5 * 335.0**2 + beta)), v, rtol=1e-8)
+
+        # no air leaves only the constant forces
+        alpha, beta = coast_maps(20.0e3, theta=theta, p_tube=0.0)
+        assert alpha == 1.0
+        assert np.isclose(beta, -20.0e3 * (g * np.sin(theta) + 150.0 / m_pod))
+
+        # a single launch covers a short flat route
+        plan = place_boosters(np.full(10, 1.0e3))
+        assert plan.n_stations == 1
+        assert np.isclose(plan.energy, 3100.0 * .5 * 335.0**2 / .8)
+        assert np.isclose(plan.v[1], 335.0, rtol=1e-3)
+        assert np.all(np.diff(plan.v[1:]) < 0.0)
+
+    def test_case2_vs_brute_force(self):
+        rng = np.random.RandomState(1)
+        length = np.full(9, 40.0e3)
+        for i in range(5):
+            theta = rng.uniform(-.01, .02, 9)
+            fewest = place_boosters(length, theta=theta)
+            assert fewest.feasible
+            assert fewest.n_stations == np.sum(brute_force(length, theta, 0.0)[1])
+            assert np.all(fewest.v[1:] >= 300.0 - 1e-9)
+
+            for weight in (1.0 / 50.0e6, 1.0 / 5.0e6):
+                cost, stations = brute_force(length, theta, weight)
+                plan = place_boosters(length, theta=theta, energy_weight=weight)
+                assert plan.feasible
+                assert np.isclose(plan.n_stations + weight * plan.energy, cost)
+                assert plan.n_stations >= fewest.n_stations
+                assert plan.energy <= fewest.energy * (1 + 1e-12)
+
+        # a climb too steep to cover from any station
+        plan = place_boosters(length, theta=np.full(9, .05))
+        assert not plan.feasible
+
+    def test_case3_variants(self):
+        rng = np.random.RandomState(2)
+        x = np.linspace(0.0, 300.0e3, 151)
+        elevation = 1000.0 * np.exp(-((x - rng.uniform(50.0e3, 250.0e3, (20, 1))) / 20.0e3)**2)
+        length = np.diff(x)
+        theta = route_grades(elevation, length)
+        assert np.allclose(np.tan(theta) * length, np.diff(elevation, axis=-1))
+
+        p_tube = np.full(150, 100.0)
+        p_tube[:20] = 1000.0
+        for weight in (0.0, 1.0 / 20.0e6):
+            plan = place_boosters(length, theta=theta, p_tube=p_tube, v_min=320.0, energy_weight=weight)
+            for i in range(0, 20, 7):
+                single = place_boosters(length, theta=theta[i], p_tube=p_tube, v_min=320.0,
+                                        energy_weight=weight)
+                assert np.array_equal(plan.stations[i], single.stations)
+                assert np.isclose(plan.energy[i], single.energy)
+
+        # hills and a leakier stretch never need fewer stations than the flat route
+        flat = place_boosters(length, v_min=320.0)
+        plan = place_boosters(length, theta=theta, p_tube=p_tube, v_min=320.0)
+        assert np.all(plan.n_stations >= flat.n_stations)
+        assert np.any(plan.n_stations > flat.n_stations)
+
+    def test_case4_component(self):
+        length = np.full(60, 10.0e3)
+        theta = np.zeros(60)
+        theta[20:30] = .01
+        prob = create_problem(BoosterPlacement(n_segments=60))
+        prob['comp.segment_length'] = length
+        prob['comp.theta'] = theta
+        prob['comp.v_min'] = 320.0
+        prob['comp.energy_weight'] = 1.0 / 20.0e3
+        prob.run()
+
+        plan = place_boosters(length, theta=theta, v_min=320.0, energy_weight=1.0 / 20.0e6)
+        assert np.array_equal(prob['comp.stations'], plan.stations)
+        assert prob['comp.n_stations'] == plan.n_stations
+        assert np.isclose(prob['comp.energy'], plan.energy)
+        assert np.allclose(prob['comp.v'], plan.v)
+        assert prob['comp.feasible'] == 1.0
+        assert prob['comp.stations'][0] == 1.0
@@ -0,0 +1,135 @@
+"""
+Test for tools/config.py. Config files are parsed once, sections are
+validated against their schema and the cached parameter sets are shared by
+the components built from them.
+"""
+import json
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+from openmdao.api import Group, Problem
+from six import StringIO
+
+from hyperloop.Python.tools import config
+from hyperloop.Python.tools.io_helper import InputHelper
+from hyperloop.Python.tools.log import enable_diagnostics, disable_diagnostics
+from hyperloop.Python.tube.tunnel_cost import TunnelCost, TUNNEL_SCHEMA
+
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    prob.setup(check=False)
+    return prob
+
+
+class TestConfig(object):
+    def test_case1_load_once(self):
+        config.clear_config_cache()
+        stream = StringIO()
+        enable_diagnostics('tools', stream=stream)
+        try:
+            params = TUNNEL_SCHEMA.load('default.JSON')
+            assert TUNNEL_SCHEMA.load('default.JSON') is params
+            InputHelper('default.JSON')
+        finally:
+            disable_diagnostics('tools')
+
+        log = stream.getvalue()
+        assert log.count('parsed config') == 1
+        assert log.count('unknown entries: blah') == 1
+
+        assert params.diameter == config.Param('diameter', 2.27, 'diameter of tunnel', 'm')
+        assert params.length.val == 562.0
+        assert params.cost is TUNNEL_SCHEMA.defaults.cost
+        with pytest.raises(AttributeError):
+            params.length.val = 1.0
+
+    def test_case2_validation(self):
+        params = TUNNEL_SCHEMA.load({'diameter': {'val': 223, 'unit': 'cm'}})
+        assert np.isclose(params.diameter.val, 2.23)
+        assert params.diameter.unit == 'm'
+        assert params.length is TUNNEL_SCHEMA.defaults.length
+
+        for section in ({'diameter': {'val': 'wide', 'unit': 'm'}},
+                        {'diameter': {'val': 2.0, 'unit': 'meters'}},
+                        {'diameter': {'val': 2.0, 'unit': 'USD'}},
+                        {'diameter': 2.0},
+                        []):
+            with pytest.raises(config.ConfigError):
+                TUNNEL_SCHEMA.load(section)
+        with pytest.raises(config.ConfigError):
+            TUNNEL_SCHEMA.load({'blah': {'val': 1.0}}, strict=True)
+
+        config_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(config_dir, 'bad.JSON')
+            with open(filename, 'w') as f:
+                f.write('{"tunnel_data": ')
+            with pytest.raises(config.ConfigError):
+                TUNNEL_SCHEMA.load(filename)
+
+            filename = os.path.join(config_dir, 'other.JSON')
+            with open(filename, 'w') as f:
+                json.dump({'pod_data': {}}, f)
+            with pytest.raises(config.ConfigError):
+                TUNNEL_SCHEMA.load(filename)
+        finally:
+            shutil.rmtree(config_dir)
+
+    def test_case3_tunnel_cost(self):
+        comp = TunnelCost(config='default.JSON')
+        assert TunnelCost(config='default.JSON').defaults is comp.defaults
+        prob = create_problem(comp)
+        prob.run()
+
+        assert prob['comp.diameter'] == 2.27
+        assert prob['comp.length'] == 562.0
+        expected = 1.0e6 * 10**(1.10 + 0.933 * np.log10(562.0) + 0.614 * np.log10(2.27))
+        assert np.isclose(prob['comp.cost'], expected)
+
+        # InputHelper sections still work, and don't share the cache
+        helper = InputHelper('default.JSON')
+        helper.get_config('tunnel_data')['length']['val'] = '100'
+        assert config.load_config('default.JSON')['tunnel_data']['length']['val'] == '562'
+        assert TunnelCost(config=helper.get_config('tunnel_data')).defaults.length.val == 100.0
+
+        # components holding parameter sets can be sent to worker processes
+        copy = pickle.loads(pickle.dumps(comp))
+        assert copy.defaults == comp.defaults
+        assert copy.defaults.length.val == 562.0
+
+    def test_case4_cache_key(self):
+        config.clear_config_cache()
+        params = TUNNEL_SCHEMA.load('default.JSON')
+
+        # same section and names, other units and defaults
+        schema = config.ConfigSchema('tunnel_data', (
+            config.Param('diameter', 223.0, 'diameter of tunnel', 'cm'),
+            config.Param('length', 563.00, 'length of tunnel', 'km'),
+            config.Param('cost', 1.0, 'cost of tunnel', 'USD')))
+        other = schema.load('default.JSON')
+        assert other is not params
+        assert np.isclose(other.diameter.val, 227.0)
+        assert other.cost.val == 1.0
+        assert TUNNEL_SCHEMA.load('default.JSON') is params
+
+        # the configs directory comes before the working directory
+        cwd = os.getcwd()
+        work_dir = tempfile.mkdtemp()
+        try:
+            os.chdir(work_dir)
+            with open('default.JSON', 'w') as f:
+                json.dump({}, f)
+            with open('local.JSON', 'w') as f:
+                json.dump({}, f)
+            assert config.config_path('default.JSON') == os.path.join(config.CONFIG_DIR, 'default.JSON')
+            assert config.config_path('local.JSON') == os.path.join(os.path.realpath(work_dir), 'local.JSON')
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(work_dir)
@@ -0,0 +1,114 @@
+import os
+import tempfile
+
+import numpy as np
+from openmdao.api import Problem
+
+from hyperloop.Python.pod.drivetrain.electric_motor import MotorGroup
+from hyperloop.Python.tools.convergence_trace import ConvergenceTrace, TracedSolver
+
+
+def create_problem(trace):
+    prob = Problem()
+    prob.root = MotorGroup()
+    trace.attach(prob.root)
+    prob.setup(check=False)
+    return prob
+
+
+def set_motor(prob):
+    prob['motor_max_current'] = 450.0
+    prob['design_power'] = -110000
+    prob['design_torque'] = -420.169
+
+
+class TestConvergenceTrace(object):
+    def test_case1_motor_group(self):
+
+        trace = ConvergenceTrace()
+        prob = create_problem(trace)
+
+        prob['motor_max_current'] = 450.0
+        prob['motor_LD_ratio'] = 0.83
+        prob['design_power'] = -110000
+        prob['design_torque'] = -420.169
+        prob['idp1.n_phases'] = 3.0
+        prob['motor_size.kappa'] = 0.5
+        prob['idp2.pole_pairs'] = 6.0
+        prob['motor_size.core_radius_ratio'] = 0.7
+        prob['motor_oversize_factor'] = 1.0
+
+        trace.set_point(design_power=-110000.0)
+        prob.run()
+
+        # tracing must not change the answer
+        assert np.isclose(prob['motor.I0'], 3.66357, rtol=0.001)
+
+        assert len(trace.solves) == 1
+        rec = trace.solves[0]
+        assert rec.converged
+        assert rec.iterations > 0
+        assert rec.point == {'design_power': -110000.0}
+        assert len(trace.iterations) == rec.iterations
+        assert trace.iterations[-1].norm < trace.iterations[0].norm
+        assert trace.summary()['']['solves'] == 1
+        assert trace.failures() == []
+
+    def test_case2_failure_and_dump(self):
+
+        trace = ConvergenceTrace()
+        prob = create_problem(trace)
+        prob.root.nl_solver.options['maxiter'] = 1
+
+        prob['motor_max_current'] = 450.0
+        prob['design_power'] = -110000
+        prob['design_torque'] = -420.169
+        prob.run()
+
+        assert len(trace.failures()) == 1
+
+        fd, file_name = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        try:
+            trace.dump(file_name)
+            with open(file_name) as f:
+                lines = f.read().splitlines()
+        finally:
+            os.remove(file_name)
+
+        assert lines[0].startswith('kind,solve,pathname')
+        assert lines[1].startswith('solve,1,')
+        assert len(lines) == 1 + len(trace.solves) + len(trace.iterations)
+
+    def test_case3_tolerances(self):
+
+        trace = ConvergenceTrace()
+        prob = create_problem(trace)
+        assert isinstance(prob.root.nl_solver, TracedSolver)
+        set_motor(prob)
+        prob.run()
+        iterations = trace.solves[0].iterations
+
+        # converging exactly on the last allowed iteration is a success
+        trace = ConvergenceTrace()
+        prob = create_problem(trace)
+        prob.root.nl_solver.options['maxiter'] = iterations
+        set_motor(prob)
+        prob.run()
+
+        rec = trace.solves[0]
+        assert rec.iterations == iterations
+        assert rec.converged
+        assert trace.failures() == []
+
+        # stopping early on the step size tolerance with a large residual is not
+        trace = ConvergenceTrace()
+        prob = create_problem(trace)
+        prob.root.nl_solver.options['utol'] = 1e10
+        set_motor(prob)
+        prob.run()
+
+        rec = trace.solves[0]
+        assert rec.iterations < prob.root.nl_solver.options['maxiter']
+        assert not rec.converged
+        assert trace.failures() == [rec]
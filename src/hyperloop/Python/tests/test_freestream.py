@@ -0,0 +1,43 @@
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.freestream import freestream_state
+from hyperloop.Python.pod.cycle.flow_path_inputs import FlowPathInputs
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    return prob
+
+
+class TestFreestream(object):
+    def test_case1_vs_hand_calc(self):
+
+        state = freestream_state(850.0, 320.0, .8)
+
+        assert np.isclose(state.Pt, 850.0*1.128**3.5, rtol=1e-10)
+        assert np.isclose(state.Tt, 360.96, rtol=1e-10)
+        assert np.isclose(state.rho, 850.0/(287.0*320.0), rtol=1e-10)
+        assert np.isclose(state.V, .8*np.sqrt(1.4*287.0*320.0), rtol=1e-10)
+
+    def test_case2_flow_path_inputs(self):
+
+        prob = create_problem(FlowPathInputs())
+
+        prob.setup(check=False)
+        prob['comp.pod_mach'] = .7
+        prob.run()
+
+        state = freestream_state(850.0, 320.0, .7)
+        assert prob['comp.Pt'] == state.Pt
+        assert prob['comp.Tt'] == state.Tt
+
+    def test_case3_complex_step(self):
+
+        h = 1e-30
+        state = freestream_state(850.0, 320.0, .8 + 1j*h)
+
+        dPt = 850.0*3.5*1.128**2.5*.4*.8
+        assert np.isclose(state.Pt.imag/h, dPt, rtol=1e-10)
+        assert np.isclose(state.Tt.imag/h, 320.0*.4*.8, rtol=1e-10)
@@ -0,0 +1,105 @@
+"""
+Test for halbach_field.py. The first harmonic must reproduce the peak field
+and forces of BreakPointDrag at the Inductrack values used in
+test_breakpoint_levitation.py.
+"""
+import numpy as np
+
+from hyperloop.Python.pod.magnetic_levitation import halbach_field
+from hyperloop.Python.pod.magnetic_levitation.levitation_curves import levitation_forces
+
+TRACK = {'b_res': 1.48,
+         'num_mag_hal': 4.0,
+         'mag_thk': .15,
+         'spacing': 0.0,
+         'd_pod': 1.0,
+         'w_strip': .005,
+         'num_sheets': 1.0,
+         'delta_c': .0005334,
+         'strip_c': .0105,
+         'rc': 1.713e-8,
+         'MU0': 4.0 * np.pi * 1.0e-7,
+         'track_factor': .75}
+
+
+class TestHalbachField(object):
+    def test_case1_fundamental_vs_breakpoint(self):
+
+        harmonics = halbach_field.halbach_harmonics(1.48, 4.0, .15, 0.0, n_harmonics=1)
+
+        assert np.isclose(harmonics.lam, 0.6, rtol=1e-10)
+        assert np.isclose(harmonics.amplitude[0], 1.055475, rtol=.001)
+
+        forces = levitation_forces(23.0, 0.01, gamma=1.0, n_harmonics=1, **TRACK)
+        assert np.isclose(forces['fyu'], 520814.278077, rtol=.01)
+        assert np.isclose(forces['fxu'], 2430517.899848, rtol=.01)
+
+    def test_case2_harmonic_orders(self):
+
+        harmonics = halbach_field.halbach_harmonics(1.48, 4.0, .15, 0.0, n_harmonics=4)
+
+        assert np.array_equal(harmonics.order, [1.0, 5.0, 9.0, 13.0])
+        assert np.all(np.diff(np.abs(harmonics.amplitude)) < 0.0)
+        # sin(nu*pi/M) alternates in sign for nu = 1, 5, 9, ...
+        assert np.array_equal(np.sign(harmonics.amplitude), [1.0, -1.0, 1.0, -1.0])
+        # cached per geometry
+        assert halbach_field.halbach_harmonics(1.48, 4.0, .15, 0.0, n_harmonics=4) is harmonics
+
+    def test_case3_field(self):
+
+        harmonics = halbach_field.halbach_harmonics(1.48, 4.0, .15, 0.0, n_harmonics=3)
+        x = np.linspace(0.0, harmonics.lam, 101)
+        b_x, b_y = halbach_field.halbach_field(x, 0.01, harmonics)
+
+        # periodic over lam, and the field magnitude repeats every magnet
+        assert np.isclose(b_y[0], b_y[-1])
+        b = np.hypot(b_x, b_y)
+        assert np.allclose(b[:76], b[25:])
+        assert np.isclose(b_y[0], np.sum(harmonics.amplitude *
+                                         np.exp(-2. * np.pi * harmonics.order * 0.01 / harmonics.lam)))
+        assert np.isclose(b_x[0], 0.0)
+
+        # the squared field of every harmonic decays twice as fast
+        assert np.isclose(halbach_field.lift_factor(0.01, harmonics),
+                          np.sum((harmonics.amplitude *
+                                  np.exp(-2. * np.pi * harmonics.order * 0.01 / harmonics.lam))**2))
+
+    def test_case4_higher_harmonics(self):
+
+        h_lev = np.array([0.005, 0.01, 0.02])
+        one = levitation_forces(100.0, h_lev, gamma=1.0, n_harmonics=1, **TRACK)
+        five = levitation_forces(100.0, h_lev, gamma=1.0, n_harmonics=5, **TRACK)
+        many = levitation_forces(100.0, h_lev, gamma=1.0, n_harmonics=50, **TRACK)
+
+        # higher harmonics add lift close to the array and converge
+        assert np.all(five['fyu'] > one['fyu'])
+        assert np.allclose(five['fyu'], many['fyu'], rtol=.01)
+        # all harmonics share the breakpoint ratio
+        assert np.allclose(five['ld_ratio'], one['ld_ratio'])
+        assert np.allclose(five['mag_drag_lev'], one['mag_drag_lev'])
+
+    def test_case5_cache(self):
+
+        halbach_field.clear_harmonic_cache()
+        size = halbach_field._CACHE_SIZE
+        halbach_field._CACHE_SIZE = 2
+        try:
+            first = halbach_field.halbach_harmonics(1.48, 4.0, .15)
+            second = halbach_field.halbach_harmonics(1.48, 4.0, .1)
+            assert halbach_field.halbach_harmonics(1.48, 4.0, .15) is first
+            # the least recently used geometry is dropped
+            halbach_field.halbach_harmonics(1.48, 4.0, .05)
+            assert halbach_field.halbach_harmonics(1.48, 4.0, .15) is first
+            assert halbach_field.halbach_harmonics(1.48, 4.0, .1) is not second
+        finally:
+            halbach_field._CACHE_SIZE = size
+            halbach_field.clear_harmonic_cache()
+
+        # complex step through the magnet thickness is not cached
+        step = 1e-30
+        harmonics = halbach_field.halbach_harmonics(1.48, 4.0, .15 + 1j * step, n_harmonics=3)
+        assert len(halbach_field._cache) == 0
+        plus = halbach_field.halbach_harmonics(1.48, 4.0, .15 + 1e-7, n_harmonics=3)
+        minus = halbach_field.halbach_harmonics(1.48, 4.0, .15 - 1e-7, n_harmonics=3)
+        assert np.allclose(harmonics.amplitude.imag / step,
+                           (plus.amplitude - minus.amplitude) / 2e-7, rtol=1e-5)
@@ -0,0 +1,97 @@
+"""
+Test for ideal_gas_cycle.py. Uses the NPSS values of test_cycle_group.py with
+the tolerances of the ideal-gas accuracy report.
+"""
+from __future__ import print_function
+
+import numpy as np
+import pytest
+from openmdao.api import Group, Problem, IndepVarComp
+from openmdao.units.units import convert_units as cu
+
+from hyperloop.Python.pod.cycle import ideal_gas_cycle
+from hyperloop.Python.pod.cycle.cycle_group import Cycle
+from hyperloop.Python.pod.cycle.ideal_gas_flow_path import IdealGasFlowPath
+from hyperloop.Python.pod.pod_group import PodGroup
+
+def create_problem(GroupName):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('Cycle', GroupName)
+    return prob
+
+class TestIdealGasCycle(object):
+    def test_case1_vs_npss(self):
+
+        CycleGroup = ideal_gas_cycle.IdealGasCycle()
+
+        prob = create_problem(CycleGroup)
+
+        params = (('comp_PR', 12.6, {'units': 'unitless'}),
+              ('PsE', 0.05588, {'units': 'psi'}),
+              ('pod_mach_number', .8, {'units': 'unitless'}),
+              ('tube_pressure', 850., {'units': 'Pa'}),
+              ('tube_temp', 320., {'units': 'K'}),
+              ('comp_inlet_area', 2.3884, {'units': 'm**2'}))
+
+        prob.root.add('des_vars', IndepVarComp(params))
+
+        prob.root.connect('des_vars.comp_PR', 'Cycle.comp.map.PRdes')
+        prob.root.connect('des_vars.PsE', 'Cycle.nozzle.Ps_exhaust')
+        prob.root.connect('des_vars.pod_mach_number', 'Cycle.pod_mach')
+        prob.root.connect('des_vars.tube_pressure', 'Cycle.tube_pressure')
+        prob.root.connect('des_vars.tube_temp', 'Cycle.tube_temp')
+        prob.root.connect('des_vars.comp_inlet_area', 'Cycle.comp_inlet_area')
+
+        prob.setup(check=False)
+
+        prob['Cycle.CompressorMass.comp_eff'] = 91.0
+        prob['Cycle.CompressorLen.h_stage'] = 58.2
+        prob['Cycle.FlowPathInputs.gamma'] = 1.4
+        prob['Cycle.FlowPathInputs.R'] = 287.
+        prob['Cycle.FlowPathInputs.eta'] = 0.99
+        prob['Cycle.FlowPathInputs.comp_mach'] = 0.6
+
+        prob.run()
+
+        assert np.isclose(prob['Cycle.comp_len'], 3.579, rtol=.01)
+        assert np.isclose(prob['Cycle.comp_mass'], 774.18, rtol=.01)
+        assert np.isclose(cu(prob['Cycle.comp.trq'], 'ft*lbf', 'N*m'), -2622.13, rtol=.01)
+        assert np.isclose(cu(prob['Cycle.comp.power'], 'hp', 'W'), -2745896.44, rtol=.01)
+        assert np.isclose(cu(prob['Cycle.comp.Fl_O:stat:area'], 'inch**2', 'm**2'), 0.314, rtol=.01)
+        assert np.isclose(cu(prob['Cycle.nozzle.Fg'], 'lbf', 'N'), 6562.36, rtol=.01)
+        assert np.isclose(cu(prob['Cycle.inlet.F_ram'], 'lbf', 'N'), 1855.47, rtol=.01)
+        assert np.isclose(cu(prob['Cycle.nozzle.Fl_O:tot:T'], 'degR', 'K'), 767.132, rtol=.03)
+        assert np.isclose(cu(prob['Cycle.nozzle.Fl_O:stat:W'], 'lbm/s', 'kg/s'), 6.467, rtol=.01)
+
+    def test_case2_accuracy_report(self):
+
+        report = ideal_gas_cycle.accuracy_report()
+
+        assert len(report) == len(ideal_gas_cycle.PYCYCLE_REFERENCE)
+        assert max(abs(err) for name, units, ref, val, err in report) < .03
+
+    def test_case3_cycle_model(self):
+
+        # the cycle_model option builds the same model as IdealGasCycle
+        report = ideal_gas_cycle.accuracy_report()
+
+        prob = create_problem(Cycle(cycle_model='ideal'))
+        params = (('comp_PR', 12.6, {'units': 'unitless'}),
+                  ('PsE', 0.05588, {'units': 'psi'}),
+                  ('comp_inlet_area', 2.3884, {'units': 'm**2'}))
+        prob.root.add('des_vars', IndepVarComp(params))
+        prob.root.connect('des_vars.comp_PR', 'Cycle.comp.map.PRdes')
+        prob.root.connect('des_vars.PsE', 'Cycle.nozzle.Ps_exhaust')
+        prob.root.connect('des_vars.comp_inlet_area', 'Cycle.comp_inlet_area')
+        prob.setup(check=False)
+        prob['Cycle.CompressorMass.comp_eff'] = 91.0
+        prob['Cycle.CompressorLen.h_stage'] = 58.2
+        prob.run()
+
+        for (name, units, si_units, ref), row in zip(ideal_gas_cycle.PYCYCLE_REFERENCE, report):
+            assert np.isclose(cu(prob['Cycle.%s' % name], units, si_units), row[3])
+
+        assert isinstance(PodGroup(cycle_model='ideal').cycle.FlowPath, IdealGasFlowPath)
+        with pytest.raises(ValueError):
+            Cycle(cycle_model='npss')
@@ -0,0 +1,66 @@
+import numpy as np
+from openmdao.api import Group, Problem, IndepVarComp
+
+from hyperloop.Python.tube.ideal_steady_state_vacuum import IdealSteadyStateVacuum, intercooled_compression_power
+
+
+def create_problem(vacuum):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', vacuum)
+
+    params = (('Pt', 850.0, {'units': 'Pa'}),
+              ('T', 320.0, {'units': 'K'}),
+              ('L_pod', 22.0, {'units' : 'm'}),
+              ('A_tube', 40.0, {'units' : 'm**2'}),
+              ('pod_period', 120.0, {'units' : 's'}))
+
+    prob.root.add('des_vars', IndepVarComp(params))
+    prob.root.connect('des_vars.Pt', 'comp.fl_start.P')
+    prob.root.connect('des_vars.T', 'comp.fl_start.T')
+    prob.root.connect('des_vars.A_tube', 'comp.A_tube')
+    prob.root.connect('des_vars.L_pod', 'comp.L_pod')
+    prob.root.connect('des_vars.pod_period', 'comp.pod_period')
+    return prob
+
+
+class TestIdealSteadyStateVacuum(object):
+    def test_case1_vs_hand_calc(self):
+
+        prob = create_problem(IdealSteadyStateVacuum())
+        prob.setup(check=False)
+        prob.run()
+
+        assert np.isclose(prob['comp.m_dot'], 22.0, rtol=1e-6)
+        assert np.isclose(prob['comp.comp.PR'], 119.176471, rtol=1e-6)
+        assert np.isclose(prob['comp.comp.power'], -34604.471, rtol=1e-5)
+
+    def test_case2_intercooled_stages(self):
+
+        prob = create_problem(IdealSteadyStateVacuum(n_stages=3))
+        prob.setup(check=False)
+        prob.run()
+
+        assert np.isclose(prob['comp.comp.power'], -20506.629, rtol=1e-5)
+
+    def test_case3_partials(self):
+
+        prob = create_problem(IdealSteadyStateVacuum(n_stages=2))
+        prob.setup(check=False)
+        prob.run()
+
+        data = prob.check_partial_derivatives(out_stream=None, comps=['comp.q1', 'comp.fl_start', 'comp.comp'])
+        for comp in ('comp.q1', 'comp.fl_start', 'comp.comp'):
+            for key, err in data[comp].items():
+                # zero partials have an undefined relative error
+                assert err['abs error'][0] < 1e-10 or err['rel error'][0] < 1e-4, (comp, key)
+
+    def test_case4_vectorized(self):
+
+        PR = np.array([10.0, 100.0, 119.176471])
+        power, partials = intercooled_compression_power(22.0, 320.0, PR, 0.8, n_stages=2)
+
+        assert power.shape == (3,)
+        for i in range(3):
+            single, _ = intercooled_compression_power(22.0, 320.0, PR[i], 0.8, n_stages=2)
+            assert np.isclose(power[i], single)
@@ -0,0 +1,82 @@
+"""
+Test for lev_table.py. Compares the interpolated table against LevGroup at
+points between the grid nodes.
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from openmdao.api import Group, Problem, IndepVarComp
+
+from hyperloop.Python.pod.magnetic_levitation import lev_table
+from hyperloop.Python.pod.magnetic_levitation.levitation_group import LevGroup
+
+AXES = {'m_pod': np.linspace(1000.0, 10000.0, 10),
+        'd_pod': np.linspace(0.5, 2.0, 4),
+        'vel_b': np.array([10.0, 50.0]),
+        'h_lev': np.array([0.005, 0.02]),
+        'vel': np.logspace(np.log10(20.0), np.log10(400.0), 40)}
+
+POINT = (('m_pod', 3210.0), ('l_pod', 18.5), ('d_pod', 1.3), ('vel_b', 23.0), ('h_lev', 0.01),
+         ('vel', 287.0))
+
+
+def create_problem(lev):
+    root = Group()
+    root.add('lev', lev)
+    root.add('inputs', IndepVarComp(POINT))
+    for name, _ in POINT:
+        root.connect('inputs.' + name, 'lev.' + name)
+    prob = Problem(root)
+    prob.setup(check=False)
+    return prob
+
+
+class TestLevTable(object):
+    def test_case1_vs_lev_group(self):
+
+        table = lev_table.generate_lev_table(**AXES)
+        assert table.tables['mag_drag'].shape == (10, 4, 2, 2, 40)
+
+        ref = create_problem(LevGroup())
+        ref.run()
+        prob = create_problem(lev_table.LevLookup(table))
+        prob.run()
+
+        assert np.isclose(prob['lev.mag_drag'], ref['lev.mag_drag'], rtol=.005)
+        assert np.isclose(prob['lev.total_pod_mass'], ref['lev.total_pod_mass'], rtol=1e-6)
+        assert np.isclose(prob['lev.m_mag'], ref['lev.Mass.m_mag'], rtol=1e-6)
+
+    def test_case2_save_and_load(self):
+
+        table = lev_table.generate_lev_table(**dict(AXES, vel=np.array([100.0, 200.0, 400.0])))
+        cache_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(cache_dir, 'table.npz')
+            table.save(filename)
+            loaded = lev_table.load_lev_table(filename)
+
+            # read once per process
+            assert lev_table.load_lev_table(filename) is loaded
+            for name in lev_table.TABLE_AXES:
+                assert np.array_equal(loaded.axes[name], table.axes[name])
+
+            m_pod = np.array([2000.0, 5000.0, 8000.0])
+            expected = table(m_pod, 22.0, 1.0, 23.0, 0.01, 150.0)
+            result = loaded(m_pod, 22.0, 1.0, 23.0, 0.01, 150.0)
+            for name in ('mag_drag', 'm_mag', 'total_pod_mass'):
+                assert np.allclose(result[name], expected[name])
+
+            # the lookup takes a table file as well
+            assert lev_table.LevLookup(filename).table is loaded
+        finally:
+            shutil.rmtree(cache_dir)
+
+        # the default table is keyed on the model version
+        filename = lev_table._cache_file(cache_dir)
+        lev_table.MODEL_VERSION += 1
+        try:
+            assert lev_table._cache_file(cache_dir) != filename
+        finally:
+            lev_table.MODEL_VERSION -= 1
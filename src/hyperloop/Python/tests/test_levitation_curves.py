@@ -0,0 +1,102 @@
+"""
+Test for levitation_curves.py. Compares the vectorized curves against the
+scalar BreakPointDrag and MagDrag components at the Inductrack values used in
+test_breakpoint_levitation.py.
+"""
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.pod.magnetic_levitation import breakpoint_levitation, magnetic_drag
+from hyperloop.Python.pod.magnetic_levitation.levitation_curves import LevitationCurves, \
+    levitation_forces
+
+TRACK = {'b_res': 1.48,
+         'num_mag_hal': 4.0,
+         'mag_thk': .15,
+         'spacing': 0.0,
+         'd_pod': 1.0,
+         'w_strip': .005,
+         'num_sheets': 1.0,
+         'delta_c': .0005334,
+         'strip_c': .0105,
+         'rc': 1.713e-8,
+         'MU0': 4.0 * np.pi * 1.0e-7,
+         'track_factor': .75}
+
+
+def create_problem(comp):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', comp)
+    return prob
+
+
+def scalar_reference(vel, h_lev):
+    prob = create_problem(breakpoint_levitation.BreakPointDrag())
+    prob.root.add('mdrag', magnetic_drag.MagDrag())
+    for name in ('track_res', 'track_ind', 'pod_weight', 'lam'):
+        prob.root.connect('comp.%s' % name, 'mdrag.%s' % name)
+    prob.setup(check=False)
+
+    for name, value in TRACK.items():
+        prob['comp.%s' % name] = value
+    prob['comp.m_pod'] = 3000.0
+    prob['comp.l_pod'] = 22.0
+    prob['comp.gamma'] = 1.0
+    prob['comp.vel_b'] = vel
+    prob['comp.h_lev'] = h_lev
+    prob['mdrag.vel'] = vel
+    prob.run()
+    return prob
+
+
+class TestLevitationCurves(object):
+    def test_case1_vs_breakpoint(self):
+        vel = np.array([23.0, 100.0, 350.0])
+        h_lev = np.array([0.005, 0.01, 0.02])
+        forces = levitation_forces(vel, h_lev, m_pod=3000.0, l_pod=22.0, gamma=1.0, grid=True,
+                                   **TRACK)
+
+        assert forces['fyu'].shape == (3, 3)
+        for i, v in enumerate(vel):
+            for j, h in enumerate(h_lev):
+                prob = scalar_reference(v, h)
+                assert np.isclose(forces['fyu'][i, j], prob['comp.fyu'], rtol=1e-10)
+                assert np.isclose(forces['fxu'][i, j], prob['comp.fxu'], rtol=1e-10)
+                assert np.isclose(forces['ld_ratio'][i, j], prob['comp.ld_ratio'], rtol=1e-10)
+                assert np.isclose(forces['mag_drag_lev'][i, j], prob['mdrag.mag_drag_lev'],
+                                  rtol=1e-10)
+
+        # Inductrack values of test_breakpoint_levitation.py
+        assert np.isclose(forces['fyu'][0, 1], 520814.278077, rtol=.01)
+        assert np.isclose(forces['fxu'][0, 1], 2430517.899848, rtol=.01)
+        assert np.isclose(forces['mag_drag_lev'][2, 1], 9025.39, rtol=.01)
+
+    def test_case2_at_rest(self):
+        forces = levitation_forces(np.array([0.0, 23.0]), 0.01, **TRACK)
+
+        assert np.all(np.isfinite(forces['ld_ratio']))
+        assert forces['fyu'][0] == 0.0
+        assert forces['fxu'][0] == 0.0
+        assert forces['mag_drag_lev'][0] == 0.0
+        assert forces['fyu'][1] > 0.0
+
+    def test_case3_component(self):
+        prob = create_problem(LevitationCurves(n_vel=4, n_h=2))
+        prob.setup(check=False)
+
+        for name, value in TRACK.items():
+            prob['comp.%s' % name] = value
+        prob['comp.gamma'] = 1.0
+        prob['comp.vel'] = np.array([23.0, 100.0, 200.0, 350.0])
+        prob['comp.h_lev'] = np.array([0.01, 0.02])
+        prob.run()
+
+        forces = levitation_forces(prob['comp.vel'], prob['comp.h_lev'], gamma=1.0, grid=True,
+                                   **TRACK)
+        assert prob['comp.fyu'].shape == (4, 2)
+        assert np.allclose(prob['comp.fyu'], forces['fyu'])
+        assert np.allclose(prob['comp.mag_drag_lev'], forces['mag_drag_lev'])
+        # lift grows with speed and falls with height
+        assert np.all(np.diff(prob['comp.fyu'], axis=0) > 0.0)
+        assert np.all(np.diff(prob['comp.fyu'], axis=1) < 0.0)
@@ -0,0 +1,73 @@
+from openmdao.api import Group, Problem
+from six import StringIO
+
+from hyperloop.Python.pod.magnetic_levitation.breakpoint_levitation import MagMass
+from hyperloop.Python.sample_mission import SampleMission
+from hyperloop.Python.tools.log import enable_diagnostics, disable_diagnostics
+
+
+def create_problem():
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', MagMass())
+    prob.setup(check=False)
+    return prob
+
+
+class TestLog(object):
+    def test_case1_silent_by_default(self, capsys):
+
+        prob = create_problem()
+        prob.run()
+
+        out, err = capsys.readouterr()
+        assert 'total pod mass' not in out + err
+        assert prob['comp.total_pod_mass'] > prob['comp.m_pod']
+
+    def test_case2_enable_subsystem(self):
+
+        prob = create_problem()
+        stream = StringIO()
+        enable_diagnostics('pod.magnetic_levitation', stream=stream)
+        try:
+            prob.run()
+        finally:
+            disable_diagnostics('pod.magnetic_levitation')
+
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 1
+        assert lines[0].startswith('hyperloop.Python.pod.magnetic_levitation.breakpoint_levitation DEBUG')
+        assert 'total pod mass' in lines[0]
+
+        # removed again
+        prob.run()
+        assert len(stream.getvalue().splitlines()) == 1
+
+    def test_case3_other_subsystem(self):
+
+        prob = create_problem()
+        stream = StringIO()
+        enable_diagnostics('tube', stream=stream)
+        try:
+            prob.run()
+        finally:
+            disable_diagnostics('tube')
+
+        assert stream.getvalue() == ''
+
+    def test_case4_root_level_module(self):
+
+        prob = Problem(Group())
+        prob.root.add('comp', SampleMission())
+        prob.setup(check=False)
+        # net thrust accelerates the pod
+        prob['comp.nozzle_thrust'] = 1.0e5
+
+        stream = StringIO()
+        enable_diagnostics('mission', stream=stream)
+        try:
+            prob.run()
+        finally:
+            disable_diagnostics('mission')
+
+        assert 'thrust greater than drag' in stream.getvalue()
@@ -0,0 +1,68 @@
+"""
+Test for magnet_optimizer.py. Checks the closed form performance and its
+gradients against levitation_curves.py and finite differences, and the
+optimized designs against the lift constraint.
+"""
+import numpy as np
+
+from hyperloop.Python.pod.magnetic_levitation import magnet_optimizer
+from hyperloop.Python.pod.magnetic_levitation.levitation_curves import levitation_forces
+
+
+def fd_gradient(name, mag_thk, gamma, step=1e-7, **design):
+    f = lambda t, g: magnet_optimizer.magnet_performance(t, g, **design)[name]
+    return np.array([(f(mag_thk * (1 + step), gamma) - f(mag_thk * (1 - step), gamma)) / (2 * step * mag_thk),
+                     (f(mag_thk, gamma * (1 + step)) - f(mag_thk, gamma * (1 - step))) / (2 * step * gamma)])
+
+
+class TestMagnetOptimizer(object):
+    def test_case1_vs_levitation_curves(self):
+
+        perf = magnet_optimizer.magnet_performance(np.array([.05, .15]), 0.5, spacing=0.01,
+                                                   n_harmonics=3)
+        for i, mag_thk in enumerate([.05, .15]):
+            forces = levitation_forces(23.0, 0.01, gamma=0.5, mag_thk=mag_thk, spacing=0.01,
+                                       n_harmonics=3, delta_c=0.0321)
+            assert np.isclose(perf['fyu'][i], forces['fyu'], rtol=1e-10)
+            assert np.isclose(perf['fxu'][i], forces['fxu'], rtol=1e-10)
+
+        # MagMass with w_mag equal to the track width
+        assert np.isclose(perf['m_mag'][1], 7500.0 * 0.75 * 22.0 * 0.5 * .15)
+
+    def test_case2_gradients(self):
+
+        design = {'spacing': 0.01, 'n_harmonics': 3, 'h_lev': 0.02}
+        perf = magnet_optimizer.magnet_performance(0.05, 0.4, **design)
+        for name in ('fyu', 'fxu', 'm_mag'):
+            assert np.allclose(perf['d' + name], fd_gradient(name, 0.05, 0.4, **design), rtol=1e-5)
+
+    def test_case3_optimize(self):
+
+        pareto, designs = magnet_optimizer.optimize_magnets(m_pod=30000.0, d_pod=2.0, n_starts=4,
+                                                            processes=1)
+
+        assert len(designs) == 20
+        assert len(pareto) >= 1
+        weight = 30000.0 * 9.81
+        for d in pareto:
+            assert d.fyu >= weight * (1 - 1e-6)
+            assert .01 <= d.mag_thk <= .15
+            assert .1 <= d.gamma <= 1.0
+        # no converged run beats the lightest Pareto design
+        assert min(d.m_mag for d in designs if d.success) >= pareto[0].m_mag * (1 - 1e-6)
+
+    def test_case4_parallel(self):
+
+        serial, _ = magnet_optimizer.optimize_magnets(m_pod=30000.0, d_pod=2.0, n_starts=2,
+                                                      alphas=[0.0, 0.5], processes=1)
+        parallel, _ = magnet_optimizer.optimize_magnets(m_pod=30000.0, d_pod=2.0, n_starts=2,
+                                                        alphas=[0.0, 0.5], processes=2)
+
+        assert np.allclose([d.m_mag for d in serial], [d.m_mag for d in parallel])
+
+    def test_case5_pareto_front(self):
+
+        m_mag = np.array([3.0, 1.0, 2.0, 2.0, 4.0])
+        fxu = np.array([1.0, 3.0, 2.0, 2.5, 1.0])
+
+        assert list(magnet_optimizer.pareto_front(m_mag, fxu)) == [1, 2, 0]
@@ -0,0 +1,71 @@
+"""
+Test for multi_point_flow_path.py. The design point is checked against the
+NPSS values used in test_cycle_group.py and an off-design point run at the
+design condition must converge its balance back onto the design point.
+"""
+from __future__ import print_function
+
+import numpy as np
+from openmdao.api import Group, Problem, IndepVarComp
+from openmdao.units.units import convert_units as cu
+
+from hyperloop.Python.pod.cycle.multi_point_flow_path import MultiPointFlowPath
+
+def create_problem(GroupName):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('MultiPoint', GroupName)
+    return prob
+
+class TestMultiPointFlowPath(object):
+    def test_case1_design_and_off_design(self):
+
+        prob = create_problem(MultiPointFlowPath(num_points=2))
+
+        params = (('comp_PR', 12.6, {'units': 'unitless'}),
+                  ('PsE', 0.05588, {'units': 'psi'}),
+                  ('pod_mach_number', .8, {'units': 'unitless'}),
+                  ('tube_pressure', 850., {'units': 'Pa'}),
+                  ('tube_temp', 320., {'units': 'K'}),
+                  ('comp_inlet_area', 2.3884, {'units': 'm**2'}))
+
+        prob.root.add('des_vars', IndepVarComp(params))
+
+        prob.root.connect('des_vars.comp_PR', 'MultiPoint.comp.map.PRdes')
+        prob.root.connect('des_vars.PsE', 'MultiPoint.nozzle.Ps_exhaust')
+        prob.root.connect('des_vars.pod_mach_number', 'MultiPoint.pod_mach')
+        prob.root.connect('des_vars.tube_pressure', 'MultiPoint.tube_pressure')
+        prob.root.connect('des_vars.tube_temp', 'MultiPoint.tube_temp')
+        prob.root.connect('des_vars.comp_inlet_area', 'MultiPoint.comp_inlet_area')
+
+        prob.setup()
+
+        prob['MultiPoint.od_pod_mach'] = np.array([0.8, 0.7])
+
+        prob.run()
+
+        design_power = cu(prob['MultiPoint.comp.power'], 'hp', 'W')
+        design_Fg = cu(prob['MultiPoint.nozzle.Fg'], 'lbf', 'N')
+
+        assert np.isclose(design_power, -2745896.44, rtol=.01)
+        assert np.isclose(design_Fg, 6562.36, rtol=.01)
+
+        assert prob['MultiPoint.od_power'].shape == (2,)
+        assert np.isclose(prob['MultiPoint.od_power'][0], design_power, rtol=.01)
+        assert np.isclose(prob['MultiPoint.od_Fg'][0], design_Fg, rtol=.01)
+
+        # the balance recovers the design mass flow and operating line
+        pt0 = 'MultiPoint.off_design.pt0'
+        assert np.isclose(cu(prob['%s.balance.W' % pt0], 'lbm/s', 'kg/s'),
+                          prob['MultiPoint.design.FlowPathInputs.m_dot'], rtol=1e-4)
+        assert np.isclose(prob['%s.balance.RlineMap' % pt0],
+                          prob['MultiPoint.design.FlowPath.comp.map.RlineMap'], rtol=1e-4)
+        for pt in (pt0, 'MultiPoint.off_design.pt1'):
+            assert abs(prob.root.resids['%s.balance.W' % pt]) < 1e-6
+            assert abs(prob.root.resids['%s.balance.RlineMap' % pt]) < 1e-6
+
+        # a slower point moves the pod less air for less power
+        assert prob['MultiPoint.od_power'][1] > prob['MultiPoint.od_power'][0]
+        assert prob['MultiPoint.od_F_ram'][1] < prob['MultiPoint.od_F_ram'][0]
+        assert np.allclose(prob['MultiPoint.od_net_thrust'],
+                           prob['MultiPoint.od_Fg'] - prob['MultiPoint.od_F_ram'])
@@ -0,0 +1,86 @@
+"""
+Test for pump_down.py. One pump stage without leaks follows the exponential
+pump-down of tube_vacuum.py.
+"""
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.tube import pump_down
+
+STAGE = pump_down.PumpStage(speed=2.0, pressure_ultimate=0.0, pressure_on=1e9, pwr=10.0)
+
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    prob.setup(check=False)
+    return prob
+
+
+class TestPumpDown(object):
+    def test_case1_exponential(self):
+        V = np.array([1000.0, 4000.0])
+        history = pump_down.simulate_pump_down([pump_down.P_ATM] * 2, V, 0.0, [[5.0], [5.0]],
+                                               pressure_final=100.0, stages=[STAGE],
+                                               max_change=.005)
+
+        expected = V / 10.0 * np.log(pump_down.P_ATM / 100.0)
+        times = pump_down.time_to_pressure(history, 100.0)
+        assert np.allclose(times, expected, rtol=5e-3)
+        assert np.isclose(history.time[-1], times[1], rtol=5e-3)
+        assert np.allclose(history.power, 100.0)
+
+        down = history.time <= times[0]
+        exact = pump_down.P_ATM * np.exp(-10.0 * history.time[down] / V[0])
+        assert np.allclose(history.pressure[down, 0], exact, rtol=2e-2)
+
+    def test_case2_leak_equilibrium(self):
+        stage = pump_down.PumpStage(speed=2.0, pressure_ultimate=1.0, pressure_on=1e9, pwr=10.0)
+        leak = np.array([50.0, 500.0])
+        history = pump_down.simulate_pump_down([pump_down.P_ATM] * 2, 1000.0, 0.0, [[5.0], [5.0]],
+                                               stages=[stage], leak_rate=leak, t_max=5000.0,
+                                               stop_at_pressure=False)
+
+        p_eq = (leak + 10.0 * 1.0) / (10.0 + leak / pump_down.P_ATM)
+        assert np.isclose(history.time[-1], 5000.0)
+        assert np.allclose(history.pressure[-1], p_eq, rtol=1e-6)
+
+    def test_case3_valves(self):
+        n_pumps = [[10.0], [0.0], [0.0]]
+        closed = pump_down.simulate_pump_down([pump_down.P_ATM] * 3, 1000.0, 0.0, n_pumps,
+                                              stages=[STAGE], t_max=1000.0, stop_at_pressure=False)
+        assert np.allclose(closed.pressure[-1, 1:], pump_down.P_ATM)
+
+        opened = pump_down.simulate_pump_down([pump_down.P_ATM] * 3, 1000.0, 0.0, n_pumps,
+                                              stages=[STAGE], t_max=1000.0, stop_at_pressure=False,
+                                              valve_conductance=[5.0, 5.0])
+        p = opened.pressure[-1]
+        assert p[0] < p[1] < p[2] < pump_down.P_ATM
+        assert p[0] > closed.pressure[-1, 0]
+
+        # backward Euler removes exactly the pumped gas
+        removed = 1000.0 * np.sum(opened.pressure[0] - p)
+        pumped = np.sum(np.diff(opened.time) * 20.0 * opened.pressure[1:, 0])
+        assert np.isclose(removed, pumped, rtol=1e-6)
+
+    def test_case4_section_vent(self):
+        prob = create_problem(pump_down.PumpDown(n_sections=4))
+        prob.run()
+
+        full_time = prob['comp.time_down']
+        full_energy = prob['comp.energy_tot']
+        assert np.allclose(prob['comp.time_to_pressure'], full_time)
+        assert np.isclose(prob['comp.pwr_peak'], 4 * (200 * 18.5 + 20 * 7.5), rtol=1e-6)
+        assert np.all(prob['comp.pressure_end'] <= 850.0)
+
+        pressure = np.full(4, 700.0)
+        pressure[1] = pump_down.P_ATM
+        prob['comp.pressure_initial'] = pressure
+        prob['comp.pressure_hold'] = 800.0
+        prob.run()
+
+        assert np.isclose(prob['comp.time_down'], full_time, rtol=1e-2)
+        assert np.isclose(prob['comp.time_to_pressure'][1], full_time, rtol=1e-2)
+        assert np.isclose(prob['comp.energy_tot'], full_energy / 4, rtol=1e-2)
+        assert np.isclose(prob['comp.pwr_peak'], 200 * 18.5 + 20 * 7.5, rtol=1e-3)
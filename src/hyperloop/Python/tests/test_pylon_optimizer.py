@@ -0,0 +1,92 @@
+"""
+Test for pylon_optimizer.py. The batched barrier method finds a span cost
+no higher than the SLSQP one.
+"""
+import numpy as np
+from scipy.optimize import minimize
+
+from hyperloop.Python.tube import pylon_optimizer
+from hyperloop.Python.tube.tube_and_pylon import tube_and_pylon_sizing
+
+SPAN = {'m_pod': 15000.0, 'p_tunnel': 850.0, 'tube_area': 36.190520}
+
+
+def slsqp_span(h, x0):
+    # log of the design variables and the cost relative to the start
+    scale = float(pylon_optimizer.span_performance(x0[0], x0[1], h, **SPAN)['total_material_cost'])
+
+    def objective(z):
+        x = np.exp(z)
+        perf = pylon_optimizer.span_performance(x[0], x[1], h, **SPAN)
+        return float(perf['total_material_cost']) / scale, perf['dcost'] * x / scale
+
+    def con(z):
+        x = np.exp(z)
+        return pylon_optimizer.span_performance(x[0], x[1], h, **SPAN)['con']
+
+    def con_jac(z):
+        x = np.exp(z)
+        return pylon_optimizer.span_performance(x[0], x[1], h, **SPAN)['dcon'] * x
+
+    result = minimize(objective, np.log(x0), jac=True, method='SLSQP',
+                      constraints=[{'type': 'ineq', 'fun': con, 'jac': con_jac}],
+                      options={'ftol': 1e-12, 'maxiter': 500})
+    result.fun *= scale
+    return result
+
+
+class TestPylonOptimizer(object):
+    def test_case1_performance_gradients(self):
+        t = np.array([.05, .2, 1.0])
+        r_pylon = np.array([.3, .8, 2.0])
+        h = np.array([5.0, 20.0, 60.0])
+        perf = pylon_optimizer.span_performance(t, r_pylon, h, **SPAN)
+
+        ref = tube_and_pylon_sizing(SPAN['tube_area'], t, r_pylon, h, m_pod=SPAN['m_pod'],
+                                    p_tunnel=SPAN['p_tunnel'])
+        for name in ('total_material_cost', 'von_mises', 't_crit', 'dx', 'R', 'R_buckle'):
+            assert np.allclose(perf[name], ref[name])
+
+        step = 1e-5
+        for j in range(2):
+            x = [t, r_pylon]
+            x[j] = x[j] * (1 + step)
+            plus = pylon_optimizer.span_performance(x[0], x[1], h, **SPAN)
+            x[j] = x[j] / (1 + step) * (1 - step)
+            minus = pylon_optimizer.span_performance(x[0], x[1], h, **SPAN)
+            dx = 2 * step * [t, r_pylon][j]
+            fd = (plus['total_material_cost'] - minus['total_material_cost']) / dx
+            assert np.allclose(perf['dcost'][:, j], fd, rtol=1e-5)
+            fd = (plus['con'] - minus['con']) / dx[:, np.newaxis]
+            assert np.allclose(perf['dcon'][..., j], fd, rtol=1e-5, atol=1e-8)
+
+    def test_case2_vs_slsqp(self):
+        h = np.array([2.0, 10.0, 30.0, 60.0])
+        design = pylon_optimizer.optimize_spans(h, **SPAN)
+
+        assert np.all(design.success)
+        assert np.all(design.t >= design.t_crit)
+        assert np.all(design.R <= design.R_buckle)
+        # tall pylons are sized by buckling
+        assert np.isclose(design.R[-1], design.R_buckle[-1], rtol=1e-6)
+
+        for i in range(len(h)):
+            # on short pylons the cost is nearly flat in r_pylon and SLSQP
+            # can stop on a line search failure, so only the costs compare
+            result = slsqp_span(h[i], [design.t[i] * 1.2, design.r_pylon[i] * 1.2])
+            assert design.total_material_cost[i] <= result.fun * (1 + 1e-5)
+            assert np.isclose(design.total_material_cost[i], result.fun, rtol=1e-3)
+
+    def test_case3_batches(self):
+        h = np.linspace(2.0, 60.0, 12).reshape(3, 4)
+        m_pod = np.array([3100.0, 15000.0, 30000.0])[:, np.newaxis]
+        serial = pylon_optimizer.optimize_spans(h, m_pod=m_pod)
+        parallel = pylon_optimizer.optimize_spans(h, processes=2, m_pod=m_pod)
+
+        assert serial.t.shape == (3, 4)
+        assert np.all(serial.success)
+        for name in pylon_optimizer.SpanDesign._fields:
+            assert np.allclose(getattr(serial, name), getattr(parallel, name))
+
+        single = pylon_optimizer.optimize_spans(h[2, 1], m_pod=30000.0)
+        assert np.isclose(single.total_material_cost, serial.total_material_cost[2, 1], rtol=1e-6)
@@ -0,0 +1,90 @@
+"""
+Test for route_structure.py. Each segment matches TubeAndPylon at its own
+pylon height, and sizing the spans keeps tall pylons from buckling.
+"""
+import numpy as np
+import pytest
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.tube import pylon_optimizer, route_structure, tube_and_pylon
+
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    prob.setup(check=False)
+    return prob
+
+
+class TestRouteStructure(object):
+    def test_case1_track_profile(self):
+        x = np.linspace(0.0, 10000.0, 1001)
+        elevation = np.where(np.abs(x - 5000.0) < 500.0, 40.0, 0.0)
+        track = route_structure.track_profile(x, elevation, max_grade=.01, h_min=2.0)
+
+        assert np.all(track >= elevation + 2.0 - 1e-12)
+        assert np.all(np.abs(np.diff(track) / np.diff(x)) <= .01 + 1e-12)
+        # ramps up to the plateau at the grade limit and then follows the ground
+        assert np.isclose(track[0], 2.0)
+        assert np.isclose(track[500], 42.0)
+        assert np.isclose(track[430], 42.0 - .01 * (4510.0 - 4300.0))
+
+        # brute force envelope of the cones
+        brute = np.max(elevation + 2.0 - .01 * np.abs(x[:, np.newaxis] - x), axis=1)
+        assert np.allclose(track, brute)
+
+    def test_case2_vs_tube_and_pylon(self):
+        n = 6
+        prob = create_problem(route_structure.RouteStructure(n_segments=n))
+        prob['comp.segment_length'] = np.array([1000.0, 1000.0, 2000.0, 500.0, 500.0, 1000.0])
+        prob['comp.elevation'] = np.array([0.0, 10.0, 50.0, 0.0, 5.0, 0.0])
+        prob['comp.max_grade'] = .02
+        prob.run()
+
+        h = prob['comp.h']
+        assert np.all(h >= 2.0)
+        assert np.isclose(h[3], 50.0 + 2.0 - .02 * 1250.0)
+
+        ref = create_problem(tube_and_pylon.TubeAndPylon())
+        for i in range(n):
+            ref['comp.h'] = h[i]
+            ref.run()
+            for name in ('dx', 'von_mises', 't_crit', 'm_prime', 'total_material_cost'):
+                assert np.isclose(prob['comp.' + name][i], ref['comp.' + name])
+            assert np.isclose(prob['comp.buckling_margin'][i], 1.0 - ref['comp.R'] / ref['comp.R_buckle'])
+
+        cost = np.sum(prob['comp.total_material_cost'] * prob['comp.segment_length'])
+        assert np.isclose(prob['comp.route_cost'], cost)
+        assert np.isclose(prob['comp.route_pylons'], np.sum(prob['comp.segment_length'] / prob['comp.dx']))
+        assert np.isclose(prob['comp.max_von_mises'], np.max(prob['comp.von_mises']))
+
+    def test_case3_size_spans(self):
+        n = 5
+        segment_length = np.full(n, 1000.0)
+        elevation = np.array([0.0, 0.0, -59.0, 0.0, 0.0])
+
+        # the track bridges the valley on a 60 m pylon, which buckles with the
+        # shared 1.1 m radius
+        shared = route_structure.route_structure(segment_length, elevation, max_grade=.001,
+                                                 tube_area=3.8013, t=.05, r_pylon=1.1)
+        assert np.isclose(shared['h'][2], 60.0)
+        assert shared['buckling_margin'][2] < 0.0
+        assert np.all(shared['buckling_margin'][[0, 1, 3, 4]] > 0.0)
+
+        prob = create_problem(route_structure.RouteStructure(n_segments=n, size_spans=True))
+        prob['comp.segment_length'] = segment_length
+        prob['comp.elevation'] = elevation
+        prob['comp.max_grade'] = .001
+        prob.run()
+
+        sized = pylon_optimizer.optimize_spans(prob['comp.h'])
+        assert np.allclose(prob['comp.t_segment'], sized.t)
+        assert np.allclose(prob['comp.r_pylon_segment'], sized.r_pylon)
+        assert np.allclose(prob['comp.total_material_cost'], sized.total_material_cost)
+        assert prob['comp.min_buckling_margin'] >= -1e-9
+        # the tall pylon gets a thicker column
+        assert prob['comp.r_pylon_segment'][2] > prob['comp.r_pylon_segment'][0]
+
+        with pytest.raises(ValueError):
+            route_structure.route_structure(segment_length, elevation, size_spans=True, t=.05)
@@ -0,0 +1,68 @@
+"""
+Test for segmented_submerged_tube.py. Each segment matches SubmergedTube at
+its own depth, and the aggregates feed TicketCost.
+"""
+import numpy as np
+from openmdao.api import Group, Problem
+
+from hyperloop.Python.ticket_cost import TicketCost
+from hyperloop.Python.tube.segmented_submerged_tube import SegmentedSubmergedTube
+from hyperloop.Python.tube.submerged_tube import SubmergedTube
+
+
+def create_problem(component):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('comp', component)
+    prob.setup(check=False)
+    return prob
+
+
+class TestSegmentedSubmergedTube(object):
+    def test_case1_vs_submerged_tube(self):
+        depth = np.array([5.0, 20.0, 40.0, 80.0, 30.0])
+        length = np.array([1000.0, 2000.0, 500.0, 1500.0, 1000.0])
+        prob = create_problem(SegmentedSubmergedTube(n_segments=5))
+        prob['comp.depth'] = depth
+        prob['comp.segment_length'] = length
+        prob.run()
+
+        ref = create_problem(SubmergedTube())
+        for i in range(5):
+            ref['comp.depth'] = depth[i]
+            ref.run()
+            for name in ('t', 'dF_buoyancy', 'm_prime', 'material_cost'):
+                assert np.isclose(prob['comp.' + name][i], ref['comp.' + name])
+
+        assert np.all(np.diff(prob['comp.t'][:4]) > 0.0)
+        assert np.isclose(prob['comp.water_length'], 6000.0)
+        assert np.isclose(prob['comp.water_cost'],
+                          np.sum(prob['comp.material_cost'] * length) / 6000.0)
+        assert np.isclose(prob['comp.crossing_cost'], prob['comp.water_cost'] * 6000.0)
+
+        # buoyant outer volume less the tube weight
+        r = np.sqrt(30.0 / np.pi) + prob['comp.t']
+        anchor = (1025.0 * np.pi * r**2 - prob['comp.m_prime']) * 9.81
+        assert np.allclose(prob['comp.anchor_load'], anchor)
+        assert np.isclose(prob['comp.anchor_load_max'], np.max(anchor))
+
+    def test_case2_ticket_cost(self):
+        root = Group()
+        root.add('water', SegmentedSubmergedTube(n_segments=3))
+        root.add('cost', TicketCost())
+        root.connect('water.water_cost', 'cost.water_cost')
+        root.connect('water.water_length', 'cost.water_length')
+        prob = Problem(root)
+        prob.setup(check=False)
+        prob['water.segment_length'] = np.array([20.0e3, 20.0e3, 20.0e3])
+        prob['water.depth'] = np.array([10.0, 10.0, 10.0])
+        prob.run()
+
+        # the defaults reproduce the TicketCost default water cost
+        assert np.isclose(prob['water.water_cost'], 389.346941)
+        assert np.isclose(prob['cost.water_length'], 60.0e3)
+
+        ref = create_problem(TicketCost())
+        ref['comp.water_length'] = 60.0e3
+        ref.run()
+        assert np.isclose(prob['cost.ticket_cost'], ref['comp.ticket_cost'])
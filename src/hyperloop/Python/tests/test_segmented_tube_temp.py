@@ -0,0 +1,84 @@
+"""
+Test for segmented_tube_temp.py. A single segment reproduces the NPSS values
+of test_tube_temp.py.
+"""
+from __future__ import print_function
+import numpy as np
+
+from openmdao.api import Problem, Group
+
+from hyperloop.Python.tube.segmented_tube_temp import SegmentedTubeTemp, solve_segment_temps, \
+    wall_heat_rates
+
+
+def create_problem(n_segments):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('tt', SegmentedTubeTemp(n_segments=n_segments))
+    prob.setup(check=False)
+
+    prob['tt.nozzle_air_W'] = 1.08
+    prob['tt.nozzle_air_Cp'] = 0.28
+    prob['tt.nozzle_air_Tt'] = 1710.
+    prob['tt.tube_thickness'] = .05
+    prob['tt.tube_area'] = 3.9057
+    return prob
+
+
+class TestSegmentedTubeTemp(object):
+    def test_case1_vs_npss(self):
+        prob = create_problem(1)
+        prob['tt.segment_length'] = np.array([482803.])
+        prob['tt.num_pods'] = np.array([34.])
+        prob['tt.temp_outside_ambient'] = np.array([305.6])
+        prob.run()
+
+        rtol = 2.1e-2
+        assert np.isclose(prob['tt.q_total_out'][0], 394673364., rtol=rtol)
+        assert np.isclose(prob['tt.q_total_in'][0], prob['tt.q_total_out'][0], rtol=1e-8)
+
+        D = 2 * np.sqrt(3.9057 / np.pi) + .05
+        q = wall_heat_rates(prob['tt.temp_boundary'], 305.6, D, 482803., num_pods=34.,
+                            nozzle_air_W=1.08, nozzle_air_Cp=0.28, nozzle_air_Tt=1710.)
+        assert np.isclose(q['total_heat_rate_pods'], 12010290., rtol=rtol)
+        assert np.isclose(q['q_total_solar'], 385276479., rtol=rtol)
+        assert np.isclose(q['h'], 3.3611, rtol=rtol)
+        assert np.isclose(q['q_rad_tot'], 201533208., rtol=rtol)
+        assert np.isclose(q['total_q_nat_conv'], 192710349., rtol=rtol)
+
+    def test_case2_segments(self):
+        prob = create_problem(4)
+        prob['tt.segment_length'] = np.array([100000., 100000., 200000., 82803.])
+        prob['tt.num_pods'] = np.array([7., 7., 14., 6.])
+        prob['tt.temp_outside_ambient'] = np.array([300., 305.6, 305.6, 310.])
+        prob['tt.solar_insolation'] = np.array([1000., 1000., 1000., 1100.])
+        prob['tt.surface_reflectance'] = np.array([0.5, 0.5, 0.6, 0.5])
+        prob.run()
+
+        T = prob['tt.temp_boundary']
+        assert np.allclose(prob['tt.q_total_in'], prob['tt.q_total_out'], rtol=1e-8)
+        # same pod density, ambient and sun, more reflective
+        assert T[2] < T[1]
+        assert T[0] < T[1] < T[3]
+        assert prob['tt.temp_max'] == T[3]
+
+    def test_case3_vectorized_newton(self):
+        D = 2 * np.sqrt(3.9057 / np.pi) + .05
+        Ta = np.linspace(280., 320., 1000)
+        T, converged = solve_segment_temps(Ta, D, 1000., num_pods=0.07, nozzle_air_W=1.08,
+                                           nozzle_air_Cp=0.28, nozzle_air_Tt=1710.)
+
+        assert converged
+        q = wall_heat_rates(T, Ta, D, 1000., num_pods=0.07, nozzle_air_W=1.08,
+                            nozzle_air_Cp=0.28, nozzle_air_Tt=1710.)
+        assert np.allclose(q['q_total_out'], q['q_total_in'], rtol=1e-8)
+        assert np.all(np.diff(T) > 0.0)
+
+        # derivative of the net heat release
+        dT = 1e-4
+        qp = wall_heat_rates(T + dT, Ta, D, 1000., num_pods=0.07, nozzle_air_W=1.08,
+                             nozzle_air_Cp=0.28, nozzle_air_Tt=1710.)
+        qm = wall_heat_rates(T - dT, Ta, D, 1000., num_pods=0.07, nozzle_air_W=1.08,
+                             nozzle_air_Cp=0.28, nozzle_air_Tt=1710.)
+        fd = ((qp['q_total_out'] - qp['q_total_in']) - (qm['q_total_out'] - qm['q_total_in'])) / (2 * dT)
+        assert np.allclose(q['dq_net'], fd, rtol=1e-5)
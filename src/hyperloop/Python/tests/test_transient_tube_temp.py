@@ -0,0 +1,77 @@
+"""
+Test for transient_tube_temp.py. Under constant weather the wall relaxes to
+the steady state of segmented_tube_temp.py.
+"""
+from __future__ import print_function
+import numpy as np
+
+from openmdao.api import Problem, Group
+
+from hyperloop.Python.tube.segmented_tube_temp import solve_segment_temps
+from hyperloop.Python.tube.transient_tube_temp import TransientTubeTemp, simulate_tube_temp, \
+    diurnal_ambient, diurnal_insolation, DAY
+
+NOZZLE = {'nozzle_air_W': 1.08, 'nozzle_air_Cp': 0.28, 'nozzle_air_Tt': 1710.}
+D = 2 * np.sqrt(3.9057 / np.pi) + .05
+
+
+def create_problem(n_times, n_segments):
+    root = Group()
+    prob = Problem(root)
+    prob.root.add('tt', TransientTubeTemp(n_times=n_times, n_segments=n_segments))
+    prob.setup(check=False)
+
+    for name, value in NOZZLE.items():
+        prob['tt.' + name] = value
+    return prob
+
+
+class TestTransientTubeTemp(object):
+    def test_case1_relaxes_to_steady_state(self):
+        length = np.array([1000., 2000., 5000.])
+        t = np.linspace(0.0, 5 * DAY, 121)
+        Ta = np.full((len(t), 1), 305.6)
+        sun = np.full((len(t), 1), 1000.)
+
+        history = simulate_tube_temp(t, Ta, sun, length, temp_initial=280., num_pods=0.07, **NOZZLE)
+        T_steady, converged = solve_segment_temps(305.6, D, length, num_pods=0.07, **NOZZLE)
+
+        assert converged
+        assert history.temp_boundary.shape == (121, 3)
+        assert np.all(np.diff(history.temp_boundary[:, 0]) >= 0.0)
+        assert np.allclose(history.temp_boundary[-1], T_steady, rtol=1e-6)
+        assert np.allclose(history.q_total_in[-1], history.q_total_out[-1], rtol=1e-4)
+
+    def test_case2_energy_balance(self):
+        # backward Euler conserves the stored heat step by step
+        length = 1000.
+        t = np.linspace(0.0, DAY, 49)
+        history = simulate_tube_temp(t, diurnal_ambient(t)[:, np.newaxis],
+                                     diurnal_insolation(t)[:, np.newaxis], length, num_pods=0.07,
+                                     **NOZZLE)
+
+        r = np.sqrt(3.9057 / np.pi)
+        C = 7820.0 * 490.0 * np.pi * ((r + .05)**2 - r**2) * length
+        stored = C * np.diff(history.temp_boundary[:, 0])
+        net = (history.q_total_in - history.q_total_out)[1:, 0] * np.diff(t)
+        assert np.allclose(stored, net, rtol=1e-6, atol=1e-6 * np.max(np.abs(net)))
+
+    def test_case3_daily_peak(self):
+        prob = create_problem(97, 2)
+        t = np.linspace(0.0, 2 * DAY, 97)
+        prob['tt.time'] = t
+        prob['tt.temp_outside_ambient'] = np.broadcast_to(diurnal_ambient(t)[:, np.newaxis], (97, 2))
+        sun = diurnal_insolation(t)[:, np.newaxis] * np.array([1.0, 0.5])
+        prob['tt.solar_insolation'] = sun
+        prob.run()
+
+        T = prob['tt.temp_boundary']
+        # the peak lags the sun, and beats the steady state of the average day
+        T_avg, _ = solve_segment_temps(305.6, D, prob['tt.segment_length'],
+                                       num_pods=prob['tt.num_pods'],
+                                       solar_insolation=np.mean(sun, axis=0), **NOZZLE)
+        assert np.all(prob['tt.temp_peak'] > T_avg)
+        assert prob['tt.temp_peak'][0] > prob['tt.temp_peak'][1]
+        assert prob['tt.temp_max'] == prob['tt.temp_peak'][0]
+        assert 12.0 < (t[np.argmax(T[48:, 0]) + 48] / 3600.0) % 24.0 < 20.0
+        assert np.min(T) < prob['tt.temp_mean'] < prob['tt.temp_max']
@@ -0,0 +1,224 @@
+"""
+Cached, validated component defaults from JSON config files.
+
+Each component declares its defaults once as a `ConfigSchema`, a config
+section name and a `Param` per parameter::
+
+    TUNNEL_SCHEMA = ConfigSchema('tunnel_data', (
+        Param('diameter', 2.23, 'diameter of tunnel', 'm'),
+        Param('length', 563.00, 'length of tunnel', 'km')))
+
+    params = TUNNEL_SCHEMA.load('default.JSON')
+    params.diameter.val
+
+Every config file is parsed once per process (`load_config`), and every
+section is validated against its schema once per file: values must be
+numbers, units must convert to the schema units, and unknown entries are
+reported. The resulting `ParamSet` is an immutable, picklable tuple of
+`Param`, so the same object is shared by every component built from the same
+file and components holding it can be sent to worker processes.
+"""
+from __future__ import print_function
+import json
+import os
+from collections import namedtuple
+
+import six
+from openmdao.units.units import convert_units
+
+from hyperloop.Python.tools.log import get_logger
+
+log = get_logger(__name__)
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'configs')
+
+Param = namedtuple('Param', 'name val desc unit')
+
+# abs path -> parsed JSON
+_configs = {}
+# (abs path, section, schema params, strict) -> ParamSet
+_param_sets = {}
+
+
+class ConfigError(ValueError):
+    """A config file or section that does not match its schema"""
+    pass
+
+
+class ParamSet(tuple):
+    """Immutable tuple of `Param`, each also an attribute by its name
+
+    A plain module-level tuple subclass rather than a namedtuple per schema,
+    so parameter sets pickle like any tuple.
+    """
+    __slots__ = ()
+
+    def __new__(cls, params):
+        return tuple.__new__(cls, params)
+
+    def __getattr__(self, name):
+        for param in self:
+            if param.name == name:
+                return param
+        raise AttributeError(name)
+
+    def __setattr__(self, name, val):
+        raise AttributeError("can't set attribute %s" % name)
+
+    def __reduce__(self):
+        return (ParamSet, (tuple(self),))
+
+    @property
+    def names(self):
+        """Parameter names, in the schema order"""
+        return tuple(param.name for param in self)
+
+
+def config_path(file_name):
+    """Absolute path of `file_name`, relative names are in `CONFIG_DIR`, or
+    else in the working directory"""
+    if os.path.isabs(file_name):
+        return os.path.abspath(file_name)
+    path = os.path.join(CONFIG_DIR, file_name)
+    if not os.path.exists(path) and os.path.exists(file_name):
+        return os.path.abspath(file_name)
+    return path
+
+
+def load_config(file_name):
+    """Parsed JSON of a config file, read once per process
+
+    The returned dict is shared, use `ConfigSchema.load` for parameters, or
+    copy it before changing it.
+    """
+    path = config_path(file_name)
+    config = _configs.get(path)
+    if config is None:
+        try:
+            with open(path) as data_file:
+                config = json.load(data_file)
+        except ValueError as err:
+            raise ConfigError('%s is not valid JSON: %s' % (path, err))
+        if not isinstance(config, dict):
+            raise ConfigError('%s does not hold a JSON object' % path)
+        _configs[path] = config
+        log.debug('parsed config %s', path)
+    return config
+
+
+def clear_config_cache():
+    """Forgets every parsed config file and validated section"""
+    _configs.clear()
+    _param_sets.clear()
+
+
+class ConfigSchema(object):
+    """Defaults and validation of one config section
+
+    Parameters
+    ----------
+    section : str
+        name of the section in the config files
+    params : sequence of Param
+        every parameter with its default value, description and unit
+
+    Attributes
+    ----------
+    defaults : ParamSet
+        the schema defaults
+    """
+
+    def __init__(self, section, params):
+        self.section = section
+        self.params = tuple(params)
+        self.defaults = ParamSet(self.params)
+
+    def validate(self, config, strict=False, source='config'):
+        """`ParamSet` of a config section, in the schema units
+
+        Args
+        ----
+        config : dict
+            the section, one ``{"val": ..., "desc": ..., "unit": ...}``
+            entry per parameter. Missing parameters keep their defaults, and
+            a missing desc or unit is the schema one.
+        strict : bool
+            raise on entries the schema does not know, instead of logging
+            them
+        source : str
+            name of the config in error messages
+
+        Returns
+        -------
+        ParamSet
+            the validated parameters
+        """
+        if not isinstance(config, dict):
+            raise ConfigError('%s section %s is not a JSON object' % (source, self.section))
+
+        unknown = sorted(set(config) - set(self.defaults.names))
+        if unknown:
+            if strict:
+                raise ConfigError('%s section %s has unknown entries: %s' %
+                                  (source, self.section, ', '.join(unknown)))
+            log.warning('%s section %s ignores unknown entries: %s', source, self.section, ', '.join(unknown))
+
+        params = []
+        for default in self.params:
+            entry = config.get(default.name)
+            if entry is None:
+                params.append(default)
+                continue
+            if not isinstance(entry, dict) or 'val' not in entry:
+                raise ConfigError('%s entry %s.%s needs a "val"' % (source, self.section, default.name))
+
+            try:
+                val = float(entry['val'])
+            except (TypeError, ValueError):
+                raise ConfigError('%s entry %s.%s is not a number: %r' %
+                                  (source, self.section, default.name, entry['val']))
+
+            unit = str(entry.get('unit', default.unit))
+            if unit != default.unit:
+                try:
+                    val = convert_units(val, unit, default.unit)
+                except (TypeError, ValueError, KeyError):
+                    raise ConfigError('%s entry %s.%s unit %r does not convert to %r' %
+                                      (source, self.section, default.name, unit, default.unit))
+
+            # str() drops the u prefix of Python 2 JSON strings
+            params.append(Param(default.name, val, str(entry.get('desc', default.desc)), default.unit))
+
+        return ParamSet(params)
+
+    def load(self, config=None, strict=False):
+        """`ParamSet` from a config
+
+        Args
+        ----
+        config : str or dict
+            ``None`` for the defaults, the name of a config file, which is
+            parsed and validated once per process, or a section dict
+        strict : bool
+            raise on entries the schema does not know
+
+        Returns
+        -------
+        ParamSet
+            the validated parameters, shared by every caller of the same file
+        """
+        if config is None:
+            return self.defaults
+        if not isinstance(config, six.string_types):
+            return self.validate(config, strict)
+
+        path = config_path(config)
+        # the defaults and units of the schema change the validated values
+        key = (path, self.section, self.params, strict)
+        params = _param_sets.get(key)
+        if params is None:
+            sections = load_config(path)
+            if self.section not in sections:
+                raise ConfigError('%s has no section %s' % (path, self.section))
+            params = _param_sets[key] = self.validate(sections[self.section], strict, path)
+        return params
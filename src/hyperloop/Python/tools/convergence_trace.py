@@ -0,0 +1,317 @@
+"""
+Lightweight convergence tracing for the nonlinear solvers of a model.
+
+`ConvergenceTrace.attach` walks a group (e.g. `FlowPath`, `SteadyStateVacuum`,
+`TubeTemp` or `MotorGroup`) and wraps every iterative nonlinear solver it
+finds in a `TracedSolver`, including the ones nested inside the pycycle
+elements. Every solve appends one `SolveRecord` (iteration count, final
+residual norm, converged or not) and every solver iteration appends one
+`IterationRecord` (residual norm) to a bounded in-memory buffer that can be
+dumped to csv after a sweep.
+
+Example
+-------
+    trace = ConvergenceTrace()
+    prob.root = MotorGroup()
+    trace.attach(prob.root)
+    prob.setup()
+    for power in sweep:
+        trace.set_point(design_power=power)
+        prob['design_power'] = power
+        prob.run()
+    trace.dump('motor_trace.csv')
+"""
+from __future__ import print_function
+import csv
+from collections import deque, namedtuple
+
+import numpy as np
+from openmdao.recorders.base_recorder import BaseRecorder
+from openmdao.solvers.solver_base import NonLinearSolver
+
+IterationRecord = namedtuple('IterationRecord', 'solve pathname solver iteration norm')
+SolveRecord = namedtuple('SolveRecord', 'solve pathname solver iterations norm converged point')
+
+
+class ConvergenceTrace(object):
+    """Buffer of nonlinear solver iteration counts, residual norms and failures.
+
+    Parameters
+    ----------
+    maxlen : int
+        Maximum number of records of each kind kept in the buffer. The oldest
+        records are dropped first. Default is 100000.
+    record_iterations : bool
+        Record the residual norm of every solver iteration as well as the per
+        solve summary. Default is True.
+    """
+
+    def __init__(self, maxlen=100000, record_iterations=True):
+        self.solves = deque(maxlen=maxlen)
+        self.iterations = deque(maxlen=maxlen)
+        self.record_iterations = record_iterations
+        self.point = None
+
+        self._solve_count = 0
+        self._active = []
+        self._traced = set()
+
+    def attach(self, system):
+        """Wraps the iterative nonlinear solvers of `system` and its subgroups
+        in a `TracedSolver`.
+
+        Must be called before `Problem.setup` so the iteration recorders are
+        started with the rest of the model. The wrapped solvers keep their
+        options, so ``group.nl_solver.options`` can still be changed after.
+
+        Returns
+        -------
+        int
+            number of solvers that were wrapped
+        """
+        count = 0
+        for group in system.subgroups(recurse=True, include_self=True):
+            solver = group.nl_solver
+            if 'maxiter' not in solver.options or id(solver) in self._traced:
+                continue
+            self._traced.add(id(solver))
+            group.nl_solver = TracedSolver(solver, self)
+            if self.record_iterations:
+                solver.add_recorder(_IterationRecorder(self, solver))
+            count += 1
+        return count
+
+    def set_point(self, **kwargs):
+        """Labels the following solves with the design point being evaluated."""
+        self.point = kwargs if kwargs else None
+
+    def clear(self):
+        """Empties the buffer."""
+        self.solves.clear()
+        self.iterations.clear()
+        self._solve_count = 0
+
+    def failures(self):
+        """Returns the `SolveRecord` of every solve that did not converge."""
+        return [rec for rec in self.solves if not rec.converged]
+
+    def summary(self):
+        """Returns per-solver totals keyed by the pathname of the solved group.
+
+        Returns
+        -------
+        dict
+            pathname -> dict with ``solves``, ``failures``, ``total_iterations``,
+            ``max_iterations`` and ``mean_iterations``
+        """
+        stats = {}
+        for rec in self.solves:
+            s = stats.setdefault(rec.pathname, {'solves': 0, 'failures': 0,
+                                                'total_iterations': 0,
+                                                'max_iterations': 0})
+            s['solves'] += 1
+            s['failures'] += 0 if rec.converged else 1
+            s['total_iterations'] += rec.iterations
+            s['max_iterations'] = max(s['max_iterations'], rec.iterations)
+        for s in stats.values():
+            s['mean_iterations'] = float(s['total_iterations']) / s['solves']
+        return stats
+
+    def dump(self, file_name):
+        """Writes the buffer to a csv file.
+
+        Solve summaries have ``kind`` ``solve``; per iteration residual norms
+        have ``kind`` ``iteration`` and share the ``solve`` id of their solve.
+        """
+        with open(file_name, 'w') as f:
+            writer = csv.writer(f)
+            writer.writerow(['kind', 'solve', 'pathname', 'solver', 'iteration',
+                             'norm', 'converged', 'point'])
+            for rec in self.solves:
+                point = '' if rec.point is None else ' '.join(
+                    '%s=%r' % item for item in sorted(rec.point.items()))
+                writer.writerow(['solve', rec.solve, rec.pathname, rec.solver,
+                                 rec.iterations, repr(rec.norm),
+                                 int(rec.converged), point])
+            for rec in self.iterations:
+                writer.writerow(['iteration', rec.solve, rec.pathname, rec.solver,
+                                 rec.iteration, repr(rec.norm), '', ''])
+
+    def _record_iteration(self, solver, norm):
+        solve = self._active[-1] if self._active else 0
+        pathname = solver.pathname.rsplit('.', 1)[0]
+        self.iterations.append(IterationRecord(solve, pathname, type(solver).__name__,
+                                               solver.iter_count, norm))
+
+
+class TracedSolver(NonLinearSolver):
+    """Nonlinear solver that runs `solver` and records every solve to a
+    `ConvergenceTrace`.
+
+    The options, recorders and iteration count are the ones of the wrapped
+    solver. A solve counts as converged when its final residual norm meets
+    the ``atol`` or ``rtol`` of the wrapped solver, relative to the first
+    residual norm of that solve, like the solvers' own stopping test.
+
+    Parameters
+    ----------
+    solver : NonLinearSolver
+        the solver to trace
+    trace : ConvergenceTrace
+        buffer the solves are recorded to
+    """
+
+    def __init__(self, solver, trace):
+        self.solver = solver
+        self.trace = trace
+
+    @property
+    def options(self):
+        return self.solver.options
+
+    @property
+    def recorders(self):
+        return self.solver.recorders
+
+    @property
+    def supports(self):
+        return self.solver.supports
+
+    @property
+    def iter_count(self):
+        return self.solver.iter_count
+
+    @property
+    def pathname(self):
+        return self.solver.pathname
+
+    @pathname.setter
+    def pathname(self, pathname):
+        self.solver.pathname = '%s.%s' % (pathname.rsplit('.', 1)[0], type(self.solver).__name__)
+
+    def __getattr__(self, name):
+        # ln_solver, line_search, print_name... of the wrapped solver
+        if name in ('solver', 'trace'):
+            raise AttributeError(name)
+        return getattr(self.solver, name)
+
+    def setup(self, sub):
+        self.solver.setup(sub)
+
+    def cleanup(self):
+        self.solver.cleanup()
+
+    def print_all_convergence(self, level=2):
+        self.solver.print_all_convergence(level)
+
+    def solve(self, params, unknowns, resids, system, metadata=None):
+        trace = self.trace
+        options = self.solver.options
+        tap = _ResidTap(resids)
+
+        trace._solve_count += 1
+        trace._active.append(trace._solve_count)
+        converged = False
+        try:
+            self.solver.solve(params, unknowns, tap, system, metadata)
+            norm = resids.norm()
+            atol = options['atol'] if 'atol' in options else 0.0
+            rtol = options['rtol'] if 'rtol' in options else 0.0
+            norm0 = tap.norm0 if tap.norm0 else np.inf
+            converged = bool(norm <= atol or norm <= rtol * norm0)
+        except Exception:
+            norm = np.nan
+            raise
+        finally:
+            trace.solves.append(SolveRecord(trace._active.pop(), system.pathname,
+                                            type(self.solver).__name__, self.solver.iter_count,
+                                            norm, converged, trace.point))
+
+
+class _ResidTap(object):
+    """Residual vector handed to a traced solver, keeping the first norm the
+    solver computes, which is the reference of its ``rtol`` test."""
+
+    def __init__(self, resids):
+        self._resids = resids
+        self.norm0 = None
+
+    def norm(self):
+        norm = self._resids.norm()
+        if self.norm0 is None:
+            self.norm0 = norm
+        return norm
+
+    def __getattr__(self, name):
+        if name == '_resids':
+            raise AttributeError(name)
+        return getattr(self._resids, name)
+
+    def __getitem__(self, name):
+        return self._resids[name]
+
+    def __setitem__(self, name, val):
+        self._resids[name] = val
+
+    def __contains__(self, name):
+        return name in self._resids
+
+    def __iter__(self):
+        return iter(self._resids)
+
+    def __len__(self):
+        return len(self._resids)
+
+
+class _IterationRecorder(BaseRecorder):
+    """Solver recorder that hands the residual norm of each iteration to a
+    `ConvergenceTrace`."""
+
+    def __init__(self, trace, solver):
+        super(_IterationRecorder, self).__init__()
+        self.options['record_metadata'] = False
+        self.options['record_unknowns'] = False
+        self.options['record_resids'] = True
+        self.options['record_derivs'] = False
+        self.trace = trace
+        self.solver = solver
+
+    def record_metadata(self, group):
+        pass
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+        if hasattr(resids, 'norm'):
+            norm = resids.norm()
+        else:
+            norm = np.sqrt(sum(np.sum(np.abs(val)**2) for val in resids.values()))
+        self.trace._record_iteration(self.solver, norm)
+
+    def record_derivatives(self, derivs, metadata):
+        pass
+
+
+if __name__ == '__main__':
+    from openmdao.api import Problem
+    from hyperloop.Python.pod.drivetrain.electric_motor import MotorGroup
+
+    prob = Problem()
+    prob.root = MotorGroup()
+
+    trace = ConvergenceTrace()
+    trace.attach(prob.root)
+    prob.setup(check=False)
+
+    prob['motor_max_current'] = 450.0
+    prob['motor_LD_ratio'] = 0.83
+    prob['design_torque'] = -420.169
+    prob['motor_size.kappa'] = 0.5
+    prob['motor_size.core_radius_ratio'] = 0.7
+
+    for design_power in (-50000.0, -110000.0, -200000.0):
+        trace.set_point(design_power=design_power)
+        prob['design_power'] = design_power
+        prob.run()
+
+    for pathname, stats in sorted(trace.summary().items()):
+        print('%s: %d solves, %d failures, %.1f mean iterations' %
+              (pathname or 'root', stats['solves'], stats['failures'], stats['mean_iterations']))
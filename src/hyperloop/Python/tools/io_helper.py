@@ -1,6 +1,7 @@
-import json
+import copy
 from pprint import pprint
-import os
+
+from hyperloop.Python.tools.config import load_config
 """
 Basics:
 I chose JSON because:
@@ -13,11 +14,8 @@ c) JSON is easily and quickly parsed, and can be edited in a easy-to-use viewer
 
 class InputHelper(object):
     def __init__(self, file_name):
-        self.data = None
-        parent_dir = os.path.dirname(os.path.dirname(__file__))
-        abs_path = os.path.join(parent_dir, 'configs/' + file_name)
-        with open(abs_path) as data_file:
-            self.data = json.load(data_file)
+        # parsed once per process, copied so callers can't change the cache
+        self.data = copy.deepcopy(load_config(file_name))
 
     def get_config(self, member):
         return self.data[member]
@@ -0,0 +1,96 @@
+"""
+Logging of component diagnostics.
+
+Every module logs through the standard library logger named after the module
+(``get_logger(__name__)``), so the loggers form one tree per subsystem::
+
+    hyperloop.Python                      all diagnostics
+    hyperloop.Python.pod                  pod models (levitation, drivetrain, ...)
+    hyperloop.Python.tube                 tube models
+    hyperloop.Python.mission              trajectory and mission models
+    hyperloop.Python.tools                helpers and configuration loading
+
+Modules at the package root log under the subsystem they belong to instead,
+e.g. `sample_mission` logs to ``hyperloop.Python.mission.sample_mission``.
+
+The package root has a `logging.NullHandler` and nothing is printed unless an
+application configures logging or calls `enable_diagnostics`. Messages are
+formatted lazily (``log.debug('mass %f', m)``), so a disabled message only
+costs a level check. Hot loops guard expensive arguments with
+``if log.isEnabledFor(DEBUG):``.
+
+Example
+-------
+    from hyperloop.Python.tools.log import enable_diagnostics
+    enable_diagnostics('pod.magnetic_levitation')
+    prob.run()
+"""
+from __future__ import print_function
+import logging
+from logging import DEBUG, INFO, WARNING
+
+ROOT = 'hyperloop.Python'
+
+SUBSYSTEMS = ('pod', 'tube', 'mission', 'tools')
+
+DEFAULT_FORMAT = '%(name)s %(levelname)s: %(message)s'
+
+logging.getLogger(ROOT).addHandler(logging.NullHandler())
+
+# subsystem logger name -> handler added by `enable_diagnostics`
+_handlers = {}
+
+
+def get_logger(name=ROOT):
+    """Returns the logger of a module of the package, use with ``__name__``"""
+    return logging.getLogger(name)
+
+
+def _logger_name(subsystem):
+    if subsystem is None:
+        return ROOT
+    if subsystem.startswith(ROOT):
+        return subsystem
+    return '%s.%s' % (ROOT, subsystem)
+
+
+def enable_diagnostics(subsystem=None, level=DEBUG, stream=None, fmt=DEFAULT_FORMAT):
+    """Prints the diagnostics of a subsystem
+
+    Args
+    ----
+    subsystem : str
+        dotted name relative to the package, e.g. ``'pod'`` or
+        ``'pod.magnetic_levitation'``. Defaults to the whole package.
+    level : int
+        lowest level printed
+    stream : file
+        output stream, defaults to stderr
+    fmt : str
+        `logging.Formatter` format of the messages
+
+    Returns
+    -------
+    logging.Logger
+        the subsystem logger
+    """
+    name = _logger_name(subsystem)
+    logger = logging.getLogger(name)
+    disable_diagnostics(subsystem)
+
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(fmt))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    _handlers[name] = handler
+    return logger
+
+
+def disable_diagnostics(subsystem=None):
+    """Removes the handler added by `enable_diagnostics` and resets the level"""
+    name = _logger_name(subsystem)
+    logger = logging.getLogger(name)
+    handler = _handlers.pop(name, None)
+    if handler is not None:
+        logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
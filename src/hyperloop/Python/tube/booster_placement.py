@@ -0,0 +1,319 @@
+"""
+Booster station placement along a route profile.
+
+`PropulsionMechanics` sizes one boost from `v0` to `vf`, and `SampleMission`
+spaces boosts uniformly. On a graded route the pod slows down much faster
+uphill than on the flat, so `place_boosters` places stations at the segment
+boundaries of the actual route instead.
+
+Between stations the pod coasts against aerodynamic drag, magnetic drag and
+gravity. With ``E = v**2/2`` and constant grade and tube pressure over a
+segment the equation of motion is linear in `E`::
+
+    dE/dx = -(a + b*E),  a = g*sin(theta) + (D_mag - pod_thrust)/m_pod,  b = rho*Cd*S/m_pod
+
+so each segment is the closed form affine map ``E_out = alpha*E_in + beta``
+and the speed at every boundary downstream of a station follows from
+cumulative sums, for all route variants at once. A station boosts the pod
+back to `vf` with ``m_pod*(vf**2 - v**2)/(2*eta)`` of energy.
+
+With no energy weight the greedy placement, boosting only where the next
+segment would drop below `v_min`, gives the fewest stations. With an energy
+weight a dynamic program over the boundaries trades stations against boost
+energy: more frequent, smaller boosts fly slower on average and lose less to
+drag.
+"""
+from __future__ import print_function
+from collections import namedtuple
+
+import numpy as np
+from openmdao.api import Component
+
+BoosterPlan = namedtuple('BoosterPlan', 'stations n_stations energy v feasible')
+
+
+def route_grades(elevation, segment_length):
+    """Grade angle (rad) of each segment between elevations at its ends (m)"""
+    return np.arctan(np.diff(elevation, axis=-1) / segment_length)
+
+
+def coast_maps(segment_length, theta=0.0, p_tube=100.0, m_pod=3100.0, Cd=.2, S=1.4, D_mag=150.0,
+               pod_thrust=0.0, R=286.9, T_ambient=293.0, g=9.81):
+    """Affine maps of the specific kinetic energy over each coasting segment
+
+    All arguments broadcast against each other.
+
+    Args
+    ----
+    segment_length : ndarray
+        length of each segment (m)
+    theta : ndarray
+        grade of each segment (rad)
+    p_tube : ndarray
+        tube pressure of each segment (Pa)
+    others
+        the pod parameters of `PropulsionMechanics`, with `pod_thrust` the
+        nozzle thrust less the ram drag (N)
+
+    Returns
+    -------
+    tuple
+        ``(alpha, beta)`` with ``v_out**2/2 = alpha*v_in**2/2 + beta``
+    """
+    rho = p_tube / (R * T_ambient)
+    a = g * np.sin(theta) + (D_mag - pod_thrust) / m_pod
+    b = rho * Cd * S / m_pod
+    x = b * segment_length
+    # (1 - exp(-x))/x, tending to 1 without air
+    decay = np.where(x > 1e-12, -np.expm1(-x) / np.where(x > 1e-12, x, 1.0), 1.0 - .5 * x)
+    return np.exp(-x), -a * segment_length * decay
+
+
+def _coast_from(alpha, beta, i, E0):
+    """Specific energy at every boundary after `i`, coasting from `i` with `E0`"""
+    log_alpha = np.log(alpha[..., i:])
+    S = np.cumsum(log_alpha, axis=-1)
+    C = np.cumsum(beta[..., i:] * np.exp(-S), axis=-1)
+    return np.exp(S) * (E0[..., np.newaxis] + C)
+
+
+def place_boosters(segment_length, vf=335.0, v_min=300.0, v_start=0.0, energy_weight=0.0, eta=.8,
+                   m_pod=3100.0, **kwargs):
+    """Booster stations of one or many route variants
+
+    A station is always placed at the start of the route, to launch the pod
+    from `v_start`, and the pod must reach the end faster than `v_min`.
+
+    Args
+    ----
+    segment_length : ndarray
+        length of each segment (m), route variants along the leading axes
+    vf : float
+        speed after each boost (m/s)
+    v_min : float
+        lowest allowed speed (m/s)
+    v_start : float
+        speed of the pod entering the first station (m/s)
+    energy_weight : float
+        stations worth one J of boost energy per pod, zero for the fewest
+        stations
+    eta : float
+        efficiency of the boosters
+    m_pod : float
+        total mass of the pod (kg)
+    kwargs
+        the other arguments of `coast_maps`, per segment or per variant
+
+    Returns
+    -------
+    BoosterPlan
+        ``stations`` flags the segment starts with a station, ``n_stations``
+        and boost ``energy`` per pod (J) of each variant, ``v`` the speed at
+        every segment boundary before boosting (m/s), and ``feasible``
+        whether `v_min` holds everywhere
+    """
+    alpha, beta = coast_maps(segment_length, m_pod=m_pod, **kwargs)
+    alpha, beta = np.broadcast_arrays(alpha, beta)
+    shape = alpha.shape[:-1]
+    n = alpha.shape[-1]
+    E_f = .5 * vf**2
+    E_min = .5 * v_min**2
+
+    if energy_weight == 0.0:
+        stations = _greedy(alpha, beta, E_f, E_min)
+    else:
+        stations = _dynamic_program(alpha, beta, E_f, E_min, .5 * v_start**2,
+                                    energy_weight * m_pod / eta)
+
+    # fly the plan
+    E = np.zeros(shape + (n + 1,))
+    E[..., 0] = .5 * v_start**2
+    E_cur = np.full(shape, E_f)
+    for j in range(n):
+        E_cur = np.where(stations[..., j], E_f, E_cur)
+        E_cur = alpha[..., j] * E_cur + beta[..., j]
+        E[..., j + 1] = E_cur
+
+    boost = np.where(stations, E_f - E[..., :-1], 0.0)
+    return BoosterPlan(stations=stations,
+                       n_stations=np.sum(stations, axis=-1),
+                       energy=m_pod * np.sum(boost, axis=-1) / eta,
+                       v=np.sqrt(2 * np.maximum(E, 0.0)),
+                       feasible=np.all(E[..., 1:] >= E_min * (1 - 1e-12), axis=-1))
+
+
+def _greedy(alpha, beta, E_f, E_min):
+    """Boost only where coasting the next segment would drop below `E_min`"""
+    stations = np.zeros(alpha.shape, dtype=bool)
+    stations[..., 0] = True
+    E_cur = np.full(alpha.shape[:-1], E_f)
+    for j in range(alpha.shape[-1]):
+        if j > 0:
+            stations[..., j] = alpha[..., j] * E_cur + beta[..., j] < E_min
+            E_cur = np.where(stations[..., j], E_f, E_cur)
+        E_cur = alpha[..., j] * E_cur + beta[..., j]
+    return stations
+
+
+def _dynamic_program(alpha, beta, E_f, E_min, E_start, weight):
+    """Fewest ``stations + weight*sum(E_f - E)`` placement, over every boundary"""
+    shape = alpha.shape[:-1]
+    n = alpha.shape[-1]
+    index = np.indices(shape)
+
+    # best[..., j]: cost up to a station at boundary j, j == n is the end
+    best = np.full(shape + (n + 1,), np.inf)
+    parent = np.zeros(shape + (n + 1,), dtype=int)
+    best[..., 0] = 1.0 + weight * (E_f - E_start)
+    for i in range(n):
+        E = _coast_from(alpha, beta, i, np.full(shape, E_f))
+        reachable = np.minimum.accumulate(E, axis=-1) >= E_min
+        cost = best[..., i, np.newaxis] + np.concatenate(
+            (1.0 + weight * (E_f - E[..., :-1]), np.zeros(shape + (1,))), axis=-1)
+        cost = np.where(reachable, cost, np.inf)
+        better = cost < best[..., i + 1:]
+        best[..., i + 1:] = np.where(better, cost, best[..., i + 1:])
+        parent[..., i + 1:] = np.where(better, i, parent[..., i + 1:])
+
+    # walk back from the end, vectorized over the variants
+    stations = np.zeros(shape + (n,), dtype=bool)
+    stations[..., 0] = True
+    node = np.full(shape, n)
+    for step in range(n):
+        node = parent[tuple(index) + (node,)]
+        stations[tuple(index) + (node,)] = True
+        if np.all(node == 0):
+            break
+    # unreachable ends fall back to the greedy stations
+    return np.where(np.isfinite(best[..., n, np.newaxis]), stations, _greedy(alpha, beta, E_f, E_min))
+
+
+class BoosterPlacement(Component):
+    """
+    Params
+    ------
+    segment_length : ndarray
+        Length of each route segment (m)
+    theta : ndarray
+        Grade of each segment (rad)
+    p_tube : ndarray
+        Tube pressure of each segment (Pa)
+    vf : float
+        Speed after each boost. Default value is 335 m/s
+    v_min : float
+        Lowest allowed speed. Default value is 300 m/s
+    v_start : float
+        Speed entering the first station. Default value is 0 m/s
+    energy_weight : float
+        Stations worth one kJ of boost energy per pod. Default value is 0,
+        for the fewest stations
+    m_pod : float
+        total mass of pod. Default value is 3100 kg
+    eta : float
+        Efficiency of propulsion system. Default value is .8
+    Cd : float
+        Drag coefficient of pod. Default value is .2
+    S : float
+        Reference area of the pod. Default value is 1.4 m**2
+    D_mag : float
+        Drag force from magnetic levitation. Default value is 150 N
+    nozzle_thrust : float
+        Thrust produced by pod compressed air. Default value is 0 N
+    ram_drag : float
+        Drag produced by inlet ram pressure. Default value is 0 N
+    R : float
+        Ideal gas constant of air. Default value is 286.9 J/(kg*K)
+    T_ambient : float
+        Tunnel ambient temperature. Default value is 293 K
+    g : float
+        Gravitational acceleration. Default value is 9.81 m/s**2
+
+    Returns
+    -------
+    stations : ndarray
+        1 at the start of each segment with a booster station
+    n_stations : float
+        Number of booster stations
+    energy : float
+        Boost energy per pod trip (J)
+    v : ndarray
+        Speed at each segment boundary before boosting (m/s)
+    feasible : float
+        1 if the speed stays above `v_min` along the route
+
+    Notes
+    -----
+    Stations sit on segment boundaries, so the segments set the placement
+    resolution. `place_boosters` places stations for many route variants at
+    once. The nozzle thrust and ram drag default to zero, since with the
+    `PropulsionMechanics` values the pod never slows down.
+    """
+
+    def __init__(self, n_segments=100):
+        super(BoosterPlacement, self).__init__()
+        self.deriv_options['type'] = 'fd'
+
+        self.add_param('segment_length', np.full(n_segments, 600.0e3 / n_segments), units='m',
+                       desc='Length of each route segment')
+        self.add_param('theta', np.zeros(n_segments), units='rad', desc='Grade of each segment')
+        self.add_param('p_tube', np.full(n_segments, 100.0), units='Pa', desc='Tube pressure')
+        self.add_param('vf', val=335.0, desc='Top Speed', units='m/s')
+        self.add_param('v_min', val=300.0, desc='Minimum Speed', units='m/s')
+        self.add_param('v_start', val=0.0, desc='Entrance Speed', units='m/s')
+        self.add_param('energy_weight', val=0.0, desc='stations per kJ of boost energy', units='1/kJ')
+        self.add_param('m_pod', val=3100.0, desc='mass of the pod', units='kg')
+        self.add_param('eta', val=.8, desc='LSM efficiency')
+        self.add_param('Cd', val=.2, desc='Aerodynamic drag coefficient')
+        self.add_param('S', val=1.4, desc='Frontal Area', units='m**2')
+        self.add_param('D_mag', val=150.0, units='N', desc='Magnetic Drag')
+        self.add_param('nozzle_thrust', val=0.0, units='N', desc='Thrust of Pod Nozzle')
+        self.add_param('ram_drag', val=0.0, units='N', desc='Drag from inlet ram pressure')
+        self.add_param('R', val=286.9, desc='Ideal gas constant of air', units='J/(kg*K)')
+        self.add_param('T_ambient', val=293.0, desc='Ambient Temperature', units='K')
+        self.add_param('g', val=9.81, desc='Gravity', units='m/s**2')
+
+        self.add_output('stations', np.zeros(n_segments), desc='booster station at each segment start')
+        self.add_output('n_stations', 0.0, desc='number of booster stations')
+        self.add_output('energy', 0.0, units='J', desc='boost energy per pod trip')
+        self.add_output('v', np.zeros(n_segments + 1), units='m/s', desc='speed at each boundary')
+        self.add_output('feasible', 0.0, desc='speed stays above v_min')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        plan = place_boosters(params['segment_length'], vf=params['vf'], v_min=params['v_min'],
+                              v_start=params['v_start'], energy_weight=params['energy_weight'] / 1.0e3,
+                              eta=params['eta'], m_pod=params['m_pod'], theta=params['theta'],
+                              p_tube=params['p_tube'], Cd=params['Cd'], S=params['S'],
+                              D_mag=params['D_mag'],
+                              pod_thrust=params['nozzle_thrust'] - params['ram_drag'], R=params['R'],
+                              T_ambient=params['T_ambient'], g=params['g'])
+
+        unknowns['stations'] = plan.stations.astype(float)
+        unknowns['n_stations'] = plan.n_stations
+        unknowns['energy'] = plan.energy
+        unknowns['v'] = plan.v
+        unknowns['feasible'] = float(plan.feasible)
+
+
+if __name__ == '__main__':
+    import time
+
+    # 300 variants of a 600 km route in 1 km segments, with a 1 km pass at random places
+    rng = np.random.RandomState(0)
+    x = np.linspace(0.0, 600.0e3, 601)
+    ridge = rng.uniform(100.0e3, 500.0e3, (300, 1))
+    elevation = 1000.0 * np.exp(-((x - ridge) / 30.0e3)**2) + 50.0 * np.sin(x / 40.0e3)
+    length = np.diff(x)
+    theta = route_grades(elevation, length)
+
+    start = time.time()
+    fewest = place_boosters(length, theta=theta)
+    cheaper = place_boosters(length, theta=theta, energy_weight=1.0 / 20.0e6)
+    elapsed = time.time() - start
+
+    flat = place_boosters(length)
+    print('%d variants placed in %f s' % (len(theta), elapsed))
+    print('flat route stations %d, energy %f MJ' % (flat.n_stations, flat.energy / 1e6))
+    print('graded stations %d to %d, mean energy %f MJ' %
+          (np.min(fewest.n_stations), np.max(fewest.n_stations), np.mean(fewest.energy) / 1e6))
+    print('trading 20 MJ per station: mean stations %f, mean energy %f MJ' %
+          (np.mean(cheaper.n_stations), np.mean(cheaper.energy) / 1e6))
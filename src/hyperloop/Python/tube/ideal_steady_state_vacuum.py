@@ -0,0 +1,331 @@
+"""
+Closed-form ideal-gas version of steady_state_vacuum.py. The power needed to
+pump the tube leakage from tube pressure back up to atmosphere is computed
+analytically, optionally for a multistage pump train with intercooling, so
+the group needs no pycycle equilibrium solves and provides analytic partials.
+"""
+from __future__ import print_function
+import numpy as np
+
+from openmdao.api import Component, Group, IndepVarComp, Problem
+from openmdao.units.units import convert_units as cu
+
+HP2W = cu(1.0, 'hp', 'W')
+FTLBF2NM = cu(1.0, 'ft*lbf', 'N*m')
+
+
+def intercooled_compression_power(m_dot, T_in, PR, eff, n_stages=1, T_intercool=None,
+                                  gamma=1.4, R=287.0):
+    """Power to compress an ideal gas through `n_stages` equal pressure ratio
+    stages, cooling the flow back to `T_intercool` between stages
+
+    All array arguments broadcast against each other.
+
+    Args
+    ----
+    m_dot : float or ndarray
+        mass flow rate (kg/s)
+    T_in : float or ndarray
+        inlet total temperature (K)
+    PR : float or ndarray
+        overall pressure ratio (unitless)
+    eff : float or ndarray
+        adiabatic efficiency of each stage (unitless)
+    n_stages : int
+        number of stages
+    T_intercool : float or ndarray
+        stage inlet temperature after each intercooler (K). Defaults to `T_in`
+    gamma : float
+        ratio of specific heats (unitless)
+    R : float
+        gas constant (J/(kg*K))
+
+    Returns
+    -------
+    power : ndarray
+        power absorbed by the pump train, positive (W)
+    partials : dict
+        derivatives of `power` with respect to ``m_dot``, ``T_in``, ``PR``,
+        ``eff`` and ``T_intercool``
+    """
+    if T_intercool is None:
+        T_intercool = T_in
+    n = float(n_stages)
+    cp = gamma * R / (gamma - 1.0)
+    k = (gamma - 1.0) / gamma
+
+    # temperature ratio factor of a single stage
+    tau = PR**(k / n)
+    f = tau - 1.0
+    T_sum = T_in + (n - 1.0) * T_intercool
+    power = m_dot * cp * T_sum * f / eff
+
+    partials = {'m_dot': cp * T_sum * f / eff,
+                'T_in': m_dot * cp * f / eff,
+                'T_intercool': m_dot * cp * (n - 1.0) * f / eff,
+                'PR': m_dot * cp * T_sum / eff * (k / n) * tau / PR,
+                'eff': -power / eff}
+    return power, partials
+
+
+class LeakageRate(Component):
+    """
+    Air leaking into the tube through the pod airlocks, ``3*A_tube*L_pod``
+    every departure as in `SteadyStateVacuum`.
+
+    Params
+    ------
+    A_tube : float
+        Tube cross sectional area (m**2)
+    L_pod : float
+        Pod length (m)
+    pod_period : float
+        Time between pod departures (s)
+
+    Returns
+    -------
+    m_dot : float
+        Leakage rate (kg/s)
+    """
+
+    def __init__(self):
+        super(LeakageRate, self).__init__()
+
+        self.add_param('A_tube', val=40.0, desc='tube cross sectional area', units='m**2')
+        self.add_param('L_pod', val=22.0, desc='pod length', units='m')
+        self.add_param('pod_period', val=120.0, desc='time between pod departures', units='s')
+
+        self.add_output('m_dot', val=0.0, desc='leakage rate', units='kg/s')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['m_dot'] = 3.0 * params['A_tube'] * params['L_pod'] / params['pod_period']
+
+    def linearize(self, params, unknowns, resids):
+        J = {}
+        J['m_dot', 'A_tube'] = 3.0 * params['L_pod'] / params['pod_period']
+        J['m_dot', 'L_pod'] = 3.0 * params['A_tube'] / params['pod_period']
+        J['m_dot', 'pod_period'] = -3.0 * params['A_tube'] * params['L_pod'] / params['pod_period']**2
+        return J
+
+
+class VacuumFlowStart(Component):
+    """
+    Suction state of the vacuum pumps.
+
+    Params
+    ------
+    P : float
+        Tube total pressure (Pa)
+    T : float
+        Tube total temperature (K)
+    W : float
+        Leakage rate (kg/s)
+
+    Returns
+    -------
+    Fl_O:tot:P : float
+        Pump suction total pressure (Pa)
+    Fl_O:tot:T : float
+        Pump suction total temperature (K)
+    Fl_O:stat:W : float
+        Pump mass flow rate (kg/s)
+    """
+
+    def __init__(self):
+        super(VacuumFlowStart, self).__init__()
+
+        self.add_param('P', val=850.0, desc='tube total pressure', units='Pa')
+        self.add_param('T', val=320.0, desc='tube total temperature', units='K')
+        self.add_param('W', val=0.0, desc='leakage rate', units='kg/s')
+
+        self.add_output('Fl_O:tot:P', val=850.0, desc='suction total pressure', units='Pa')
+        self.add_output('Fl_O:tot:T', val=320.0, desc='suction total temperature', units='K')
+        self.add_output('Fl_O:stat:W', val=0.0, desc='pump mass flow rate', units='kg/s')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['Fl_O:tot:P'] = params['P']
+        unknowns['Fl_O:tot:T'] = params['T']
+        unknowns['Fl_O:stat:W'] = params['W']
+
+    def linearize(self, params, unknowns, resids):
+        J = {}
+        J['Fl_O:tot:P', 'P'] = 1.0
+        J['Fl_O:tot:T', 'T'] = 1.0
+        J['Fl_O:stat:W', 'W'] = 1.0
+        return J
+
+
+class IdealVacuumCompressor(Component):
+    """
+    Ideal-gas pump train compressing the leakage flow from tube pressure to
+    atmospheric pressure.
+
+    Params
+    ------
+    Fl_I:tot:P : float
+        Suction total pressure (Pa)
+    Fl_I:tot:T : float
+        Suction total temperature (K)
+    Fl_I:stat:W : float
+        Pump mass flow rate (kg/s)
+    Pa : float
+        Discharge (atmospheric) pressure (Pa)
+    effDes : float
+        Adiabatic efficiency of each stage (unitless)
+    T_intercool : float
+        Stage inlet temperature after each intercooler (K)
+    Nmech : float
+        Shaft speed (rpm)
+
+    Returns
+    -------
+    PR : float
+        Overall pressure ratio (unitless)
+    power : float
+        Total power required by vacuum at steady state, negative (hp)
+    trq : float
+        Total torque required by the pumps (ft*lbf)
+
+    Notes
+    -----
+    With ``n_stages=1`` this is the single adiabatic compressor of
+    `SteadyStateVacuum`. With more stages the pressure ratio is split evenly
+    and the flow is cooled to ``T_intercool`` before every stage after the
+    first.
+    """
+
+    def __init__(self, n_stages=1, gamma=1.4, R=287.0):
+        super(IdealVacuumCompressor, self).__init__()
+
+        self.n_stages = n_stages
+        self.gamma = gamma
+        self.R = R
+
+        self.add_param('Fl_I:tot:P', val=850.0, desc='suction total pressure', units='Pa')
+        self.add_param('Fl_I:tot:T', val=320.0, desc='suction total temperature', units='K')
+        self.add_param('Fl_I:stat:W', val=0.0, desc='pump mass flow rate', units='kg/s')
+        self.add_param('Pa', val=101.3e3, desc='discharge pressure', units='Pa')
+        self.add_param('effDes', val=0.8, desc='adiabatic efficiency of each stage', units='unitless')
+        self.add_param('T_intercool', val=320.0, desc='stage inlet temperature after intercooling', units='K')
+        self.add_param('Nmech', val=10000.0, desc='shaft speed', units='rpm')
+
+        self.add_output('PR', val=1.0, desc='overall pressure ratio', units='unitless')
+        self.add_output('power', val=0.0, desc='steady state pump power', units='hp')
+        self.add_output('trq', val=0.0, desc='pump torque', units='ft*lbf')
+
+    def _power(self, params):
+        PR = params['Pa'] / params['Fl_I:tot:P']
+        power, partials = intercooled_compression_power(params['Fl_I:stat:W'], params['Fl_I:tot:T'], PR,
+                                                        params['effDes'], self.n_stages,
+                                                        params['T_intercool'], self.gamma, self.R)
+        omega = params['Nmech'] * 2.0 * np.pi / 60.0
+        return PR, power, partials, omega
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        PR, power, partials, omega = self._power(params)
+
+        unknowns['PR'] = PR
+        unknowns['power'] = -power / HP2W
+        unknowns['trq'] = -power / omega / FTLBF2NM
+
+    def linearize(self, params, unknowns, resids):
+        PR, power, partials, omega = self._power(params)
+        P = params['Fl_I:tot:P']
+
+        dpower = {'Fl_I:stat:W': partials['m_dot'],
+                  'Fl_I:tot:T': partials['T_in'],
+                  'T_intercool': partials['T_intercool'],
+                  'effDes': partials['eff'],
+                  'Pa': partials['PR'] / P,
+                  'Fl_I:tot:P': -partials['PR'] * PR / P}
+
+        J = {}
+        for name, deriv in dpower.items():
+            J['power', name] = -deriv / HP2W
+            J['trq', name] = -deriv / omega / FTLBF2NM
+        J['trq', 'Nmech'] = power / omega**2 * (2.0 * np.pi / 60.0) / FTLBF2NM
+        J['PR', 'Pa'] = 1.0 / P
+        J['PR', 'Fl_I:tot:P'] = -PR / P
+        return J
+
+
+class IdealSteadyStateVacuum(Group):
+    """
+    Params
+    ------
+    fl_start.P : float
+        Tube total pressure (Pa)
+    fl_start.T : float
+        Tube total temperature (K)
+    A_tube : float
+        Tube cross sectional area (m**2)
+    L_pod : float
+        Pod length (m)
+    pod_period : float
+        Time between pod departures (s)
+
+    Returns
+    -------
+    fl_start.W : float
+        Leakage rate (kg/s)
+    comp.trq : float
+        Total torque required by motor (ft*lbf)
+    comp.power : float
+        Total power required by vacuum at steady state (hp)
+
+    Notes
+    -----
+    Closed-form replacement for `SteadyStateVacuum`, selected in `TubeGroup`
+    with ``vacuum_model='ideal'``. Uses the same leakage model and design
+    values. ``n_stages`` > 1 models an intercooled multistage pump train.
+    """
+
+    def __init__(self, n_stages=1):
+        super(IdealSteadyStateVacuum, self).__init__()
+
+        des_vars = (('effDes', 0.8),
+                    ('shaft_Nmech', 10000.),
+                    ('Pa', 101.3e3, {'units' : 'Pa'}))
+
+        self.add('input_vars', IndepVarComp(des_vars))
+
+        self.add('fl_start', VacuumFlowStart())
+        self.add('comp', IdealVacuumCompressor(n_stages=n_stages))
+        self.add('q1', LeakageRate(), promotes = ['m_dot', 'pod_period', 'A_tube', 'L_pod'])
+
+        # connect components
+        self.connect('fl_start.Fl_O:tot:P', 'comp.Fl_I:tot:P')
+        self.connect('fl_start.Fl_O:tot:T', ['comp.Fl_I:tot:T', 'comp.T_intercool'])
+        self.connect('fl_start.Fl_O:stat:W', 'comp.Fl_I:stat:W')
+
+        self.connect('input_vars.effDes', 'comp.effDes')
+        self.connect('input_vars.shaft_Nmech', 'comp.Nmech')
+        self.connect('input_vars.Pa', 'comp.Pa')
+        self.connect('m_dot', 'fl_start.W')
+
+if __name__ == '__main__':
+    prob = Problem()
+    root = prob.root = Group()
+
+    root.add('p', IdealSteadyStateVacuum(n_stages=3))
+
+    params = (('Pt', 850.0, {'units': 'Pa'}),
+              ('T', 320.0, {'units': 'K'}),
+              ('L_pod', 22.0, {'units' : 'm'}),
+              ('A_tube', 40.0, {'units' : 'm**2'}),
+              ('pod_period', 120.0, {'units' : 's'}))
+
+    prob.root.add('des_vars', IndepVarComp(params))
+
+    prob.root.connect('des_vars.Pt', 'p.fl_start.P')
+    prob.root.connect('des_vars.T', 'p.fl_start.T')
+    prob.root.connect('des_vars.A_tube', 'p.A_tube')
+    prob.root.connect('des_vars.L_pod', 'p.L_pod')
+    prob.root.connect('des_vars.pod_period', 'p.pod_period')
+
+    prob.setup()
+    prob.run()
+
+    print("Leakage rate:          %.6f kg/s" % (prob['p.m_dot']))
+    print("Pressure ratio:        %.6f " % (prob['p.comp.PR']))
+    print("Compressor Power Reqd: %.6f hp" % (prob['p.comp.power']))
@@ -0,0 +1,369 @@
+"""
+Transient pump-down and leak simulation of a sectioned tube.
+
+`Vacuum` sizes the pumps with one exponential pump-down of the whole tube
+volume. `simulate_pump_down` follows the pressure of every section between
+isolation valves instead::
+
+    V_i*dp_i/dt = Q_leak_i + Q_outgas_i - sum_k n_ik*S_k(p_i)*p_i + Q_valve_i
+
+where the leak throughput falls as the section approaches atmosphere, the
+wall outgassing decays as ``1/t``, and each pump stage `k` only runs below
+its switch-on pressure, with a speed that falls to zero at its ultimate
+pressure. Open valves couple neighbouring sections through their
+conductance.
+
+The equations are stiff near the ultimate pressures, so they are integrated
+with backward Euler and an adaptive step. Each step is a Newton iteration
+on all sections at once, with the tridiagonal Jacobian of the valve
+coupling solved by `scipy.linalg.solve_banded`.
+"""
+from __future__ import print_function
+from collections import namedtuple
+
+import numpy as np
+from scipy.linalg import solve_banded
+from openmdao.api import Component, Group, Problem
+
+from hyperloop.Python.tools.log import get_logger
+
+log = get_logger(__name__)
+
+PumpStage = namedtuple('PumpStage', 'speed pressure_ultimate pressure_on pwr')
+
+PumpDownHistory = namedtuple('PumpDownHistory', 'time pressure power')
+
+P_ATM = 101325.0
+
+# screw roughing pumps at the `Vacuum` rating, and roots boosters below 20 mbar
+DEFAULT_STAGES = (PumpStage(speed=2.722, pressure_ultimate=1.0, pressure_on=2.0 * P_ATM, pwr=18.5),
+                  PumpStage(speed=8.0, pressure_ultimate=0.1, pressure_on=2000.0, pwr=7.5))
+
+
+def _stage_throughput(p, stage, pressure_hold=0.0, sharpness=100.0):
+    """Pumped throughput (Pa*m**3/s) of one pump of a stage, its pressure derivative and duty"""
+    speed, p_ult, p_on, pwr = [np.asarray(x, dtype=float) for x in stage]
+    # smooth switches, on below p_on and off below the hold pressure, so
+    # Newton sees a continuous Jacobian
+    ratio = (p / p_on)**sharpness
+    hold = (pressure_hold / p)**sharpness
+    on = 1.0 / ((1.0 + ratio) * (1.0 + hold))
+    don = on * sharpness * (hold / (1.0 + hold) - ratio / (1.0 + ratio)) / p
+
+    above = p > p_ult
+    q = np.where(above, speed * (p - p_ult), 0.0)
+    dq = np.where(above, speed, 0.0)
+    return q * on, dq * on + q * don, on * above
+
+
+def section_throughput(p, t, volume, wall_area, n_pumps, stages=DEFAULT_STAGES, leak_rate=0.0,
+                       outgassing_rate=0.0, outgassing_time=3600.0, valve_conductance=0.0,
+                       pressure_hold=0.0, p_ambient=P_ATM):
+    """Net gas throughput into every section and its pressure Jacobian
+
+    Args
+    ----
+    p : ndarray
+        pressure of each section (Pa)
+    t : float
+        time since the start of the pump-down (s)
+    volume : ndarray
+        volume of each section (m**3)
+    wall_area : ndarray
+        inner wall area of each section (m**2)
+    n_pumps : ndarray
+        number of pumps of each stage at each section, shape
+        ``(n_sections, n_stages)``
+    stages : sequence of PumpStage
+        pump speed (m**3/s), ultimate pressure (Pa), switch-on pressure (Pa)
+        and motor rating (kW) of each stage
+    leak_rate : ndarray
+        leak throughput of each section at vacuum (Pa*m**3/s)
+    outgassing_rate : float
+        wall outgassing after `outgassing_time` (Pa*m**3/(s*m**2))
+    outgassing_time : float
+        reference time of `outgassing_rate` (s)
+    valve_conductance : ndarray
+        conductance of the valve between each pair of neighbouring sections,
+        zero when closed (m**3/s)
+    pressure_hold : float
+        pressure below which the pumps switch off to hold the vacuum (Pa)
+    p_ambient : float
+        outside pressure (Pa)
+
+    Returns
+    -------
+    tuple
+        ``(q, dq_diag, dq_off, power)``: the net throughput (Pa*m**3/s), its
+        derivative with respect to the section's own pressure and to the
+        next section's pressure, and the pump power (kW) of each section
+    """
+    n = len(p)
+    q = np.asarray(leak_rate, dtype=float) * (1.0 - p / p_ambient)
+    dq = -np.asarray(leak_rate, dtype=float) / p_ambient + np.zeros(n)
+    q = q + outgassing_rate * wall_area * outgassing_time / (t + outgassing_time)
+
+    power = np.zeros(n)
+    for k, stage in enumerate(stages):
+        qk, dqk, duty = _stage_throughput(p, stage, pressure_hold)
+        q = q - n_pumps[:, k] * qk
+        dq = dq - n_pumps[:, k] * dqk
+        power = power + n_pumps[:, k] * stage.pwr * duty
+
+    C = np.broadcast_to(np.asarray(valve_conductance, dtype=float), (n - 1,))
+    flow = C * (p[1:] - p[:-1])
+    q[:-1] += flow
+    q[1:] -= flow
+    dq[:-1] -= C
+    dq[1:] -= C
+    return q, dq, C, power
+
+
+def simulate_pump_down(pressure_initial, volume, wall_area, n_pumps, pressure_final=850.0,
+                       t_max=86400.0, dt_initial=1.0, max_change=.05, stop_at_pressure=True,
+                       rtol=1e-8, maxiter=20, **kwargs):
+    """Integrates the pressure of every section over a pump-down
+
+    Args
+    ----
+    pressure_initial : ndarray
+        pressure of each section at the start (Pa)
+    volume : ndarray
+        volume of each section (m**3)
+    wall_area : ndarray
+        inner wall area of each section (m**2)
+    n_pumps : ndarray
+        number of pumps of each stage at each section
+    pressure_final : float
+        target pressure (Pa)
+    t_max : float
+        longest time simulated (s)
+    dt_initial : float
+        first time step (s)
+    max_change : float
+        largest relative pressure change of a step before the step shrinks
+    stop_at_pressure : bool
+        stop once every section is below `pressure_final`
+    rtol : float
+        Newton tolerance on the relative pressure update
+    maxiter : int
+        maximum Newton iterations per step
+    kwargs
+        the other arguments of `section_throughput`
+
+    Returns
+    -------
+    PumpDownHistory
+        time (s), pressure of each section (Pa) and total pump power (kW)
+        at every accepted step
+    """
+    p = np.array(pressure_initial, dtype=float)
+    volume = np.broadcast_to(np.asarray(volume, dtype=float), p.shape)
+    wall_area = np.broadcast_to(np.asarray(wall_area, dtype=float), p.shape)
+    n_pumps = np.asarray(n_pumps, dtype=float)
+    n_pumps = np.broadcast_to(n_pumps.reshape(n_pumps.shape[-1:] if n_pumps.ndim < 2 else n_pumps.shape),
+                              p.shape + n_pumps.shape[-1:])
+
+    t = 0.0
+    dt = dt_initial
+    power = np.sum(section_throughput(p, t, volume, wall_area, n_pumps, **kwargs)[3])
+    times, pressures, powers = [t], [p], [power]
+    ab = np.zeros((3, len(p)))
+
+    while t < t_max and not (stop_at_pressure and np.all(p <= pressure_final)):
+        dt = min(dt, t_max - t)
+        p_new = p.copy()
+        for it in range(maxiter):
+            q, dq, C, _ = section_throughput(p_new, t + dt, volume, wall_area, n_pumps, **kwargs)
+            resid = volume * (p_new - p) / dt - q
+            ab[0, 1:] = -C
+            ab[1] = volume / dt - dq
+            ab[2, :-1] = -C
+            step = solve_banded((1, 1), ab, -resid)
+            p_new = np.maximum(p_new + step, .5 * p_new)
+            if np.all(np.abs(step) <= rtol * p_new):
+                break
+        else:
+            dt = .5 * dt
+            log.debug('pump-down Newton failed at t=%g s, step reduced to %g s', t, dt)
+            continue
+
+        change = np.max(np.abs(p_new - p) / p)
+        if change > max_change and dt > 1e-6:
+            dt = .5 * dt
+            continue
+
+        t = t + dt
+        p = p_new
+        power = np.sum(section_throughput(p, t, volume, wall_area, n_pumps, **kwargs)[3])
+        times.append(t)
+        pressures.append(p)
+        powers.append(power)
+        if change < .5 * max_change:
+            dt = 1.5 * dt
+
+    return PumpDownHistory(time=np.array(times), pressure=np.array(pressures), power=np.array(powers))
+
+
+def time_to_pressure(history, pressure):
+    """First time each section reaches `pressure`, interpolated in log pressure
+
+    Returns
+    -------
+    ndarray
+        time of each section (s), ``inf`` where it is never reached
+    """
+    log_p = np.log(history.pressure)
+    target = np.log(pressure)
+    result = np.full(log_p.shape[1], np.inf)
+    for i in range(log_p.shape[1]):
+        below = np.nonzero(log_p[:, i] <= target)[0]
+        if len(below) == 0:
+            continue
+        j = below[0]
+        if j == 0:
+            result[i] = history.time[0]
+        else:
+            frac = (log_p[j - 1, i] - target) / (log_p[j - 1, i] - log_p[j, i])
+            result[i] = history.time[j - 1] + frac * (history.time[j] - history.time[j - 1])
+    return result
+
+
+class PumpDown(Component):
+    """
+    Params
+    ------
+    section_length : ndarray
+        Length of each section between isolation valves (m)
+    tube_area : float
+        Inner area of the tube (m**2)
+    pressure_initial : ndarray
+        Pressure of each section at the start (Pa)
+    pressure_final : float
+        Desired pressure within the tube (Pa)
+    n_pumps : ndarray
+        Number of pumps of each stage at each section
+    pump_speed : ndarray
+        Pumping speed of one pump of each stage (m**3/s)
+    pump_pressure_ultimate : ndarray
+        Pressure where the speed of each stage falls to zero (Pa)
+    pump_pressure_on : ndarray
+        Pressure below which each stage runs (Pa)
+    pwr : ndarray
+        Motor rating of each stage (kW)
+    leak_rate : float
+        Leak throughput per unit tube length at vacuum (Pa*m**2/s)
+    outgassing_rate : float
+        Wall outgassing an hour into the pump-down (Pa*m/s)
+    pressure_hold : float
+        Pressure below which the pumps switch off to hold the vacuum (Pa)
+    valve_conductance : ndarray
+        Conductance of each valve, zero when closed (m**3/s)
+    t_max : float
+        Longest time simulated (s)
+
+    Returns
+    -------
+    time_to_pressure : ndarray
+        Time for each section to reach `pressure_final` (s)
+    time_down : float
+        Time for the whole tube to reach `pressure_final` (s)
+    pressure_end : ndarray
+        Pressure of each section at the end of the simulation (Pa)
+    energy_tot : float
+        Energy used by the pumps over the pump-down (kJ)
+    pwr_peak : float
+        Peak pump power (kW)
+
+    Notes
+    -----
+    The defaults are the `Vacuum` tube, 480 km of 41 m**2, in 10 sections
+    with `DEFAULT_STAGES` pumps. Sections that never reach `pressure_final`
+    within `t_max` have an infinite `time_to_pressure`. Set one section of
+    `pressure_initial` to atmosphere and the rest to `pressure_final` for
+    the recovery after a section vent.
+    """
+
+    def __init__(self, n_sections=10, n_stages=2):
+        super(PumpDown, self).__init__()
+        self.deriv_options['type'] = 'fd'
+
+        stages = (DEFAULT_STAGES * n_stages)[:n_stages]
+        self.add_param('section_length', np.full(n_sections, 480000. / n_sections), units='m',
+                       desc='Length of each section')
+        self.add_param('tube_area', 41.0, units='m**2', desc='Area of the tube')
+        self.add_param('pressure_initial', np.full(n_sections, P_ATM), units='Pa',
+                       desc='initial Pressure before the pump down')
+        self.add_param('pressure_final', 850.0, units='Pa', desc='desired pressure within the tube')
+        self.add_param('n_pumps', np.tile([200.0, 20.0][:n_stages] + [0.0] * (n_stages - 2), (n_sections, 1)),
+                       desc='number of pumps of each stage at each section')
+        self.add_param('pump_speed', np.array([s.speed for s in stages]), units='m**3/s',
+                       desc='Pumping speed of each stage')
+        self.add_param('pump_pressure_ultimate', np.array([s.pressure_ultimate for s in stages]),
+                       units='Pa', desc='ultimate pressure of each stage')
+        self.add_param('pump_pressure_on', np.array([s.pressure_on for s in stages]), units='Pa',
+                       desc='switch on pressure of each stage')
+        self.add_param('pwr', np.array([s.pwr for s in stages]), units='kW',
+                       desc='motor rating of each stage')
+        self.add_param('leak_rate', 1e-3, desc='leak throughput per unit length, Pa*m**2/s')
+        self.add_param('outgassing_rate', 1e-7, desc='wall outgassing after an hour, Pa*m/s')
+        self.add_param('pressure_hold', 0.0, units='Pa', desc='pressure the pumps hold')
+        self.add_param('valve_conductance', np.zeros(n_sections - 1), units='m**3/s',
+                       desc='conductance of each valve')
+        self.add_param('t_max', 86400.0, units='s', desc='longest time simulated')
+
+        self.add_output('time_to_pressure', np.zeros(n_sections), units='s',
+                        desc='time for each section to reach pressure_final')
+        self.add_output('time_down', 0.0, units='s', desc='time for the tube to reach pressure_final')
+        self.add_output('pressure_end', np.zeros(n_sections), units='Pa', desc='final pressure')
+        self.add_output('energy_tot', 0.0, units='kJ', desc='total energy used by the pumps')
+        self.add_output('pwr_peak', 0.0, units='kW', desc='peak pump power')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        length = params['section_length']
+        r = np.sqrt(params['tube_area'] / np.pi)
+        stages = [PumpStage(*values) for values in zip(params['pump_speed'],
+                                                       params['pump_pressure_ultimate'],
+                                                       params['pump_pressure_on'], params['pwr'])]
+
+        history = simulate_pump_down(params['pressure_initial'], params['tube_area'] * length,
+                                     2 * np.pi * r * length, params['n_pumps'],
+                                     pressure_final=params['pressure_final'], t_max=params['t_max'],
+                                     stages=stages, leak_rate=params['leak_rate'] * length,
+                                     outgassing_rate=params['outgassing_rate'],
+                                     pressure_hold=params['pressure_hold'],
+                                     valve_conductance=params['valve_conductance'])
+
+        times = time_to_pressure(history, params['pressure_final'])
+        unknowns['time_to_pressure'] = times
+        unknowns['time_down'] = np.max(times)
+        unknowns['pressure_end'] = history.pressure[-1]
+        unknowns['energy_tot'] = np.trapz(history.power, history.time)
+        unknowns['pwr_peak'] = np.max(history.power)
+
+
+if __name__ == '__main__':
+    prob = Problem()
+    root = prob.root = Group()
+    root.add('comp', PumpDown())
+
+    prob.setup()
+    prob.run()
+
+    print('Full pump-down')
+    print('Time to pressure (min): %f' % (prob['comp.time_down'] / 60.0))
+    print('Energy (kW*h): %f' % (prob['comp.energy_tot'] / 3600.0))
+    print('Peak power (kW): %f' % prob['comp.pwr_peak'])
+
+    # one section vented to atmosphere and recovered with its own pumps, while
+    # the others hold their vacuum
+    pressure = np.full(10, 700.0)
+    pressure[3] = P_ATM
+    prob['comp.pressure_initial'] = pressure
+    prob['comp.pressure_hold'] = 800.0
+    prob.run()
+
+    print('\nRecovery after a section vent')
+    print('Time to pressure (min): %f' % (prob['comp.time_down'] / 60.0))
+    print('Energy (kW*h): %f' % (prob['comp.energy_tot'] / 3600.0))
+    print('Peak power (kW): %f' % prob['comp.pwr_peak'])
@@ -0,0 +1,370 @@
+"""
+Batched structural optimizer of the tube thickness and pylon radius.
+
+Sizes the tube thickness `t` and pylon radius `r_pylon` of many independent
+spans at once, one per route segment or design point, with the cost and
+constraints of the `tube_and_pylon.py` example::
+
+    minimize   total_material_cost
+    subject to von_mises <= Su_tube/sf          (tube yield)
+               t >= t_crit                       (tube buckling)
+               R <= pi**3*E_pylon*r_pylon**4/(16*h**2)   (pylon buckling)
+               dx > 0                            (pylons carry the pod)
+
+The example patches the pylon buckling after the optimization, here it is a
+constraint like the others. All spans are solved together by a log barrier
+method in the log of the design variables, with the analytic gradients of
+`span_performance` and a 2x2 Newton step per span, so the only loops are
+over Newton iterations and never over spans. Large batches can also be
+split over a process pool.
+
+Notes
+-----
+The pylon load ``R = 0.5*m_prime*g*dx + 0.5*m_pod*g`` simplifies to
+``pi*r_pylon**2*Su_pylon/sf``, so the pylon buckling constraint is a lower
+bound on the pylon radius, proportional to the pylon height.
+
+The span ``dx`` is not a design variable. `tube_and_pylon_sizing` sets it
+from the pylon yield capacity, so a pylon made thicker for buckling also
+carries a longer span, and the tube must thicken to carry that span. Once
+buckling is active, the tube thickness and cost grow about linearly with
+the pylon height. With a 15 t pod at 850 Pa, buckling is already active
+at 10 m. A 60 m pylon then needs a 1.8 m thick tube, and 128 m needs 4.5 m at
+about $400M/km. These thicknesses are a limit of the TubeAndPylon model,
+not realistic route designs. Treat the results for buckling-bound spans
+(``R == R_buckle``) as a flag for where the route needs another structure.
+"""
+from __future__ import print_function
+import inspect
+import multiprocessing
+from collections import namedtuple
+
+import numpy as np
+
+from hyperloop.Python.tube.tube_and_pylon import tube_and_pylon_sizing
+
+SpanDesign = namedtuple('SpanDesign', 't r_pylon total_material_cost von_mises t_crit dx R R_buckle success')
+
+
+def _keyword_defaults(func):
+    """Default values of the keyword arguments of `func`"""
+    getargspec = getattr(inspect, 'getfullargspec', None) or inspect.getargspec
+    spec = getargspec(func)
+    return dict(zip(spec.args[-len(spec.defaults):], spec.defaults))
+
+# material, pressure and load defaults of `TubeAndPylon`
+SIZING_DEFAULTS = _keyword_defaults(tube_and_pylon_sizing)
+
+# span parameters besides the ones of `tube_and_pylon_sizing`
+SPAN_PARAMS = ('tube_area', 'Su_tube')
+
+
+def _col(a):
+    """`a` with a trailing axis, to scale gradients"""
+    return np.asarray(a)[..., np.newaxis]
+
+
+def span_performance(t, r_pylon, h, tube_area=3.8013, Su_tube=152.0e6, **kwargs):
+    """Span cost and normalized constraints with their gradients
+
+    The cost, stress and loads are the ones of `tube_and_pylon_sizing`, this
+    adds their analytic gradients and the normalized constraints. All
+    arguments broadcast against each other.
+
+    Args
+    ----
+    t : float or ndarray
+        tube thickness (m)
+    r_pylon : float or ndarray
+        pylon radius (m)
+    h : float or ndarray
+        pylon height (m)
+    tube_area : float or ndarray
+        inner tube area (m**2)
+    Su_tube : float or ndarray
+        ultimate strength of the tube, the yield limit (Pa)
+    kwargs
+        the other arguments of `tube_and_pylon_sizing` (see
+        `SIZING_DEFAULTS`)
+
+    Returns
+    -------
+    dict
+        ``total_material_cost`` (USD/m) and its gradient ``dcost`` with
+        respect to (`t`, `r_pylon`) along a trailing axis of length 2, the
+        constraints ``con`` (yield, tube buckling, pylon buckling, span), all
+        feasible when positive, along a trailing axis and their gradients
+        ``dcon``, plus ``von_mises``, ``t_crit``, ``dx``, ``R`` and
+        ``R_buckle`` as in `TubeAndPylon`
+    """
+    unknown = set(kwargs) - set(SIZING_DEFAULTS)
+    if unknown:
+        raise ValueError('unknown span parameters: %s' % ', '.join(sorted(unknown)))
+    p = dict(SIZING_DEFAULTS)
+    p.update(kwargs)
+
+    shape = np.broadcast(t, r_pylon, h, tube_area, Su_tube, *p.values()).shape
+    t, r_pylon, h = [np.broadcast_to(np.asarray(x, dtype=float), shape) for x in (t, r_pylon, h)]
+    zero = np.zeros(shape)
+    sizing = tube_and_pylon_sizing(tube_area, t, r_pylon, h, **p)
+    m_prime, dx, R, R_buckle = [sizing[name] + zero for name in ('m_prime', 'dx', 'R', 'R_buckle')]
+    von_mises, t_crit = sizing['von_mises'] + zero, sizing['t_crit'] + zero
+    m_pod, g, sf = p['m_pod'], p['g'], p['sf']
+
+    r = np.sqrt(tube_area / np.pi)
+    dp = p['p_ambient'] - p['p_tunnel']
+
+    dm_prime = p['rho_tube'] * 2 * np.pi * (r + t)
+    I_tube = (np.pi / 4.0) * ((r + t)**4 - r**4)
+    dI_tube = np.pi * (r + t)**3
+
+    # pylon capacity left for the tube, and the span it carries
+    N = dx * m_prime * g
+    dN = 4 * (p['Su_pylon'] / sf) * np.pi * r_pylon
+    ddx = np.stack((-dx * dm_prime / m_prime, dN / (m_prime * g)), axis=-1)
+
+    q = m_prime * g
+    M = q * dx**2 / 8.0 + m_pod * g * dx / 2.0
+    dM = _col(q * dx / 4.0 + m_pod * g / 2.0) * ddx
+    dM[..., 0] += g * dm_prime * dx**2 / 8.0
+
+    sig_theta = dp * r / t
+    dsig_theta = np.stack((-sig_theta / t, zero), axis=-1)
+    sig_axial = dp * r / (2 * t) + M * r / I_tube + p['alpha_tube'] * p['E_tube'] * p['dT_tube']
+    dsig_axial = _col(r / I_tube) * dM
+    dsig_axial[..., 0] += -dp * r / (2 * t**2) - M * r * dI_tube / I_tube**2
+    dvon_mises = ((sig_theta[..., np.newaxis] * dsig_theta + sig_axial[..., np.newaxis] * dsig_axial +
+                   (sig_axial - sig_theta)[..., np.newaxis] * (dsig_axial - dsig_theta)) /
+                  (2.0 * von_mises[..., np.newaxis]))
+
+    m_pylon = sizing['m_pylon'] + zero
+    dcost = -(p['unit_cost_pylon'] * m_pylon / dx**2)[..., np.newaxis] * ddx
+    dcost[..., 0] += p['unit_cost_tube'] * dm_prime
+    dcost[..., 1] += p['unit_cost_pylon'] * 2 * m_pylon / (r_pylon * dx)
+
+    dR = _col(.5 * g * m_prime) * ddx
+    dR[..., 0] += .5 * g * dm_prime * dx
+    dR_buckle = np.stack((zero, 4 * R_buckle / r_pylon), axis=-1)
+
+    con = np.stack((1.0 - von_mises * sf / Su_tube,
+                    1.0 - t_crit / t,
+                    1.0 - R / R_buckle,
+                    N / (N + m_pod * g)), axis=-1)
+    dcon = np.stack((-dvon_mises * _col(sf / Su_tube),
+                     np.stack((t_crit / t**2, zero), axis=-1),
+                     -(dR * R_buckle[..., np.newaxis] - R[..., np.newaxis] * dR_buckle) /
+                     (R_buckle**2)[..., np.newaxis],
+                     np.stack((zero, dN * m_pod * g / (N + m_pod * g)**2), axis=-1)), axis=-2)
+
+    return {'total_material_cost': sizing['total_material_cost'] + zero,
+            'dcost': dcost,
+            'con': con,
+            'dcon': dcon,
+            'von_mises': von_mises,
+            't_crit': t_crit,
+            'dx': dx,
+            'R': R,
+            'R_buckle': R_buckle}
+
+
+def _barrier(z, mu, cost0, h, span):
+    """Log barrier objective in the log design variables, its gradient and Newton Hessian"""
+    x = np.exp(z)
+    perf = span_performance(x[:, 0], x[:, 1], h, **span)
+    con = perf['con']
+    feasible = np.all(con > 0.0, axis=-1)
+    con = np.where(con > 0.0, con, 1.0)
+
+    phi = perf['total_material_cost'] / cost0 - mu * np.sum(np.log(con), axis=-1)
+    phi = np.where(feasible, phi, np.inf)
+    dcon = perf['dcon'] * x[:, np.newaxis, :]
+    grad = perf['dcost'] * x / cost0[:, np.newaxis] - \
+        mu[:, np.newaxis] * np.sum(dcon / con[..., np.newaxis], axis=1)
+    return phi, grad, perf, dcon, con
+
+
+def _hessian(z, mu, cost0, h, span, dcon, con, eps=1e-6):
+    """Barrier Hessian, the cost and constraint curvatures by differences of their gradients"""
+    hess = mu[:, np.newaxis, np.newaxis] * np.einsum('nci,ncj->nij', dcon / con[..., np.newaxis],
+                                                      dcon / con[..., np.newaxis])
+    for j in range(2):
+        step = np.zeros(2)
+        step[j] = eps
+        grads = []
+        for zj in (z + step, z - step):
+            x = np.exp(zj)
+            perf = span_performance(x[:, 0], x[:, 1], h, **span)
+            grads.append((perf['dcost'] * x / cost0[:, np.newaxis],
+                          perf['dcon'] * x[:, np.newaxis, :]))
+        hess[:, :, j] += (grads[0][0] - grads[1][0]) / (2 * eps)
+        hess[:, :, j] -= mu[:, np.newaxis] * np.sum((grads[0][1] - grads[1][1]) / (2 * eps) /
+                                                   con[..., np.newaxis], axis=1)
+    hess = .5 * (hess + np.swapaxes(hess, 1, 2))
+
+    # shift to positive definite where the cost curvature is negative
+    a, b, d = hess[:, 0, 0], hess[:, 0, 1], hess[:, 1, 1]
+    min_eig = .5 * (a + d) - np.sqrt(.25 * (a - d)**2 + b**2)
+    shift = np.maximum(0.0, 1e-8 * (np.abs(a) + np.abs(d)) - min_eig)
+    hess[:, 0, 0] += shift
+    hess[:, 1, 1] += shift
+    return hess
+
+
+def _start_point(h, span, max_doublings=60):
+    """Feasible thickness and pylon radius of every span"""
+    defaults = dict(SIZING_DEFAULTS)
+    defaults.update(span)
+    Su_pylon, sf, g = defaults['Su_pylon'], defaults['sf'], defaults['g']
+
+    r_span = np.sqrt(defaults['m_pod'] * g * sf / (2 * Su_pylon * np.pi))
+    r_buckle = 4 * h / np.pi * np.sqrt(Su_pylon / (sf * defaults['E_pylon']))
+    r_pylon = 1.5 * np.maximum(r_span, r_buckle)
+
+    t = 2 * span_performance(1.0, r_pylon, h, **span)['t_crit']
+    for i in range(max_doublings):
+        con = span_performance(t, r_pylon, h, **span)['con']
+        infeasible = np.any(con <= 0.0, axis=-1)
+        if not np.any(infeasible):
+            break
+        t = np.where(infeasible, 2 * t, t)
+    return np.log(np.stack((t, r_pylon), axis=-1))
+
+
+def _optimize_chunk(args):
+    """Barrier method over one batch of spans, run in the worker processes"""
+    h, span, mu0, mu_final, tol, maxiter = args
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        return _barrier_method(h, span, mu0, mu_final, tol, maxiter)
+
+
+def _barrier_method(h, span, mu0, mu_final, tol, maxiter):
+    n = len(h)
+    z = _start_point(h, span)
+    x = np.exp(z)
+    cost0 = span_performance(x[:, 0], x[:, 1], h, **span)['total_material_cost']
+    feasible = np.isfinite(cost0)
+    cost0 = np.where(feasible, cost0, 1.0)
+
+    converged = np.ones(n, dtype=bool)
+    mu_value = mu0
+    while True:
+        mu = np.full(n, mu_value)
+        done = ~feasible
+        for it in range(maxiter):
+            phi, grad, perf, dcon, con = _barrier(z, mu, cost0, h, span)
+            hess = _hessian(z, mu, cost0, h, span, dcon, con)
+
+            det = hess[:, 0, 0] * hess[:, 1, 1] - hess[:, 0, 1]**2
+            d = -np.stack((hess[:, 1, 1] * grad[:, 0] - hess[:, 0, 1] * grad[:, 1],
+                           hess[:, 0, 0] * grad[:, 1] - hess[:, 0, 1] * grad[:, 0]), axis=-1) / det[:, np.newaxis]
+            slope = np.sum(grad * d, axis=-1)
+            done |= -slope < tol * mu
+            if np.all(done):
+                break
+
+            # backtracking line search, staying inside the barrier
+            alpha = np.where(done, 0.0, 1.0)
+            searching = ~done
+            for ls in range(40):
+                trial, _, _, _, _ = _barrier(z + alpha[:, np.newaxis] * d, mu, cost0, h, span)
+                searching &= ~(trial <= phi + 1e-4 * alpha * slope)
+                if not np.any(searching):
+                    break
+                alpha = np.where(searching, .5 * alpha, alpha)
+            alpha = np.where(searching, 0.0, alpha)
+            done |= alpha == 0.0
+            z = z + alpha[:, np.newaxis] * d
+        else:
+            converged &= done
+        if mu_value <= mu_final:
+            break
+        mu_value = max(.1 * mu_value, mu_final)
+
+    x = np.exp(z)
+    perf = span_performance(x[:, 0], x[:, 1], h, **span)
+    success = feasible & converged & np.all(perf['con'] >= 0.0, axis=-1)
+    return SpanDesign(t=x[:, 0], r_pylon=x[:, 1], total_material_cost=perf['total_material_cost'],
+                      von_mises=perf['von_mises'], t_crit=perf['t_crit'], dx=perf['dx'], R=perf['R'],
+                      R_buckle=perf['R_buckle'], success=success)
+
+
+def optimize_spans(h, processes=1, mu0=1e-2, mu_final=1e-9, tol=.1, maxiter=50, **span):
+    """Minimum material cost tube thickness and pylon radius of many spans
+
+    Args
+    ----
+    h : float or ndarray
+        pylon height of each span (m)
+    processes : int
+        number of worker processes the spans are split over, ``None`` for
+        one per cpu and ``1`` to run in this process
+    mu0 : float
+        initial barrier weight, relative to the starting cost
+    mu_final : float
+        final barrier weight
+    tol : float
+        Newton decrement tolerance of each barrier subproblem, relative to
+        its barrier weight. The cost is within about
+        ``4*mu_final`` of the optimum, relative to the start.
+    maxiter : int
+        maximum Newton iterations of each barrier subproblem
+    span
+        other parameters of `span_performance` (`SPAN_PARAMS` and
+        `SIZING_DEFAULTS`), which broadcast against `h`
+
+    Returns
+    -------
+    SpanDesign
+        the optimal design of every span, arrays shaped like the broadcast
+        of `h` and `span`
+    """
+    unknown = set(span) - set(SPAN_PARAMS) - set(SIZING_DEFAULTS)
+    if unknown:
+        raise ValueError('unknown span parameters: %s' % ', '.join(sorted(unknown)))
+
+    names = sorted(span)
+    arrays = np.broadcast_arrays(np.asarray(h, dtype=float),
+                                 *[np.asarray(span[name], dtype=float) for name in names])
+    shape = arrays[0].shape
+    arrays = [a.ravel() for a in arrays]
+
+    n_chunks = 1 if processes == 1 else (processes or multiprocessing.cpu_count())
+    chunks = np.array_split(np.arange(len(arrays[0])), min(n_chunks, max(len(arrays[0]), 1)))
+    runs = [(arrays[0][i], dict((name, a[i]) for name, a in zip(names, arrays[1:])),
+             mu0, mu_final, tol, maxiter) for i in chunks]
+
+    if len(runs) == 1:
+        results = [_optimize_chunk(runs[0])]
+    else:
+        pool = multiprocessing.Pool(processes)
+        try:
+            results = pool.map(_optimize_chunk, runs)
+        finally:
+            pool.close()
+            pool.join()
+
+    return SpanDesign(*[np.concatenate(field).reshape(shape) for field in zip(*results)])
+
+
+if __name__ == '__main__':
+    import time
+
+    from hyperloop.Python.tube.route_structure import track_profile
+
+    # 5000 segments over hilly terrain, pylons from 2 m up
+    x = np.linspace(0.0, 482803., 5000)
+    elevation = 50.0 * np.sin(x / 20000.0) + 150.0 * np.exp(-((x - 320000.0) / 15000.0)**2)
+    h = track_profile(x, elevation, max_grade=.002) - elevation
+
+    start = time.time()
+    design = optimize_spans(h, m_pod=15000.0, p_tunnel=850.0, tube_area=36.190520)
+    elapsed = time.time() - start
+
+    print('%d spans in %f s, %d converged' % (len(h), elapsed, np.sum(design.success)))
+    # see the module Notes, buckling-bound spans are not realistic designs
+    buckling = np.isclose(design.R, design.R_buckle, rtol=1e-6)
+    print('%d spans sized by pylon buckling, from h = %.2f m' % (np.sum(buckling), np.min(h[buckling])))
+    for i in (np.argmin(h), np.argmax(h)):
+        print('h %6.2f m: t %6.4f mm, r_pylon %6.3f m, dx %7.2f m, cost $%6.2f/km' %
+              (h[i], design.t[i] * 1e3, design.r_pylon[i], design.dx[i],
+               design.total_material_cost[i] * 1e3))
@@ -0,0 +1,294 @@
+"""
+Terrain following structural sizing along the whole route.
+
+`TubeAndPylon` sizes one representative span with a single pylon height.
+`RouteStructure` sizes every segment of the route at once: the track is laid
+as low as possible over the terrain, keeping at least `h_min` of clearance
+and never exceeding the grade limit, and each segment gets the pylon height
+between the track and the ground.
+
+The lowest track within a grade limit ``s`` over the required clearance
+``c(x) = elevation(x) + h_min`` is the upper envelope of the cones
+``c(x_j) - s*|x - x_j|``. Splitting the cones into the ones behind and ahead
+of each station turns the envelope into two running maxima::
+
+    z(x_i) = max(max_{j<=i}(c_j + s*x_j) - s*x_i, max_{j>=i}(c_j - s*x_j) + s*x_i)
+
+which `np.maximum.accumulate` evaluates in a single pass each way.
+
+With a shared tube thickness and pylon radius only the pylon mass and the
+pylon buckling margin change with the height, so tall pylons can buckle.
+With ``size_spans=True`` every segment gets its own thickness and pylon
+radius from `pylon_optimizer.optimize_spans`, which keeps the pylons within
+their buckling load.
+"""
+from __future__ import print_function
+
+import numpy as np
+from openmdao.api import Component, Group, Problem
+
+from hyperloop.Python.tube.tube_and_pylon import tube_and_pylon_sizing
+from hyperloop.Python.tube.pylon_optimizer import optimize_spans
+
+
+def track_profile(x, elevation, max_grade=.01, h_min=2.0):
+    """Lowest track elevation that clears the terrain within a grade limit
+
+    Args
+    ----
+    x : ndarray
+        increasing distance of each station along the route (m)
+    elevation : ndarray
+        terrain elevation of each station (m)
+    max_grade : float
+        maximum track grade (m/m)
+    h_min : float
+        minimum clearance between the terrain and the track (m)
+
+    Returns
+    -------
+    ndarray
+        track elevation of each station (m)
+    """
+    x = np.asarray(x, dtype=float)
+    clearance = np.asarray(elevation, dtype=float) + h_min
+    behind = np.maximum.accumulate(clearance + max_grade * x) - max_grade * x
+    ahead = np.maximum.accumulate((clearance - max_grade * x)[::-1])[::-1] + max_grade * x
+    return np.maximum(behind, ahead)
+
+
+def route_structure(segment_length, elevation, max_grade=.01, h_min=2.0, size_spans=False,
+                    Su_tube=152.0e6, **kwargs):
+    """Sizes the tube and pylons of every segment of a route
+
+    Args
+    ----
+    segment_length : ndarray
+        length of each segment (m)
+    elevation : ndarray
+        terrain elevation at the middle of each segment (m)
+    max_grade : float
+        maximum track grade (m/m)
+    h_min : float
+        minimum pylon height (m)
+    size_spans : bool
+        size the tube thickness and pylon radius of every segment with
+        `optimize_spans` instead of taking `t` and `r_pylon`
+    Su_tube : float
+        ultimate strength of the tube, the yield limit of `optimize_spans`
+        (Pa)
+    kwargs
+        the arguments of `tube_and_pylon_sizing`, other than `h`, and
+        without `t` and `r_pylon` when sizing the spans. Arrays give per
+        segment values.
+
+    Returns
+    -------
+    dict
+        the per segment results of `tube_and_pylon_sizing`, plus the
+        ``track_elevation`` and pylon height ``h`` (m), the tube thickness
+        ``t`` and pylon radius ``r_pylon`` (m), the pylon buckling margin
+        ``buckling_margin`` (``1 - R/R_buckle``, negative where the pylons
+        buckle), the number of pylons ``n_pylons`` and the material cost
+        ``segment_cost`` (USD) of each segment
+    """
+    segment_length = np.asarray(segment_length, dtype=float)
+    elevation = np.asarray(elevation, dtype=float)
+    x = np.cumsum(segment_length) - .5 * segment_length
+
+    track = track_profile(x, elevation, max_grade, h_min)
+    h = track - elevation
+
+    if size_spans:
+        if 't' in kwargs or 'r_pylon' in kwargs:
+            raise ValueError('t and r_pylon are sized per segment, do not pass them with size_spans')
+        design = optimize_spans(h, Su_tube=Su_tube, **kwargs)
+        kwargs.update(t=design.t, r_pylon=design.r_pylon)
+
+    result = tube_and_pylon_sizing(h=h, **kwargs)
+    result['track_elevation'] = track
+    result['h'] = h
+    result['t'] = np.broadcast_to(kwargs['t'], h.shape)
+    result['r_pylon'] = np.broadcast_to(kwargs['r_pylon'], h.shape)
+    result['buckling_margin'] = 1.0 - result['R'] / result['R_buckle']
+    result['n_pylons'] = segment_length / result['dx']
+    result['segment_cost'] = result['total_material_cost'] * segment_length
+    return result
+
+
+class RouteStructure(Component):
+    """
+    Params
+    ------
+    segment_length : ndarray
+        Length of each route segment (m)
+    elevation : ndarray
+        Terrain elevation at the middle of each segment (m)
+    max_grade : float
+        Maximum track grade. Default value is .01
+    h_min : float
+        Minimum pylon height. Default value is 2 m
+    tube_area : float
+        Inner tube area. Default is 3.8013 m**2
+    t : float
+        Thickness of the tube. Default value is 50 mm
+    r_pylon : float
+        Radius of each pylon. Default value is 1.1 m
+    m_pod : float
+        total mass of pod. Default value is 3100 kg
+    p_tunnel : float
+        Pressure of air in tube. Default value is 100 Pa
+    p_ambient : float
+        Pressure of atmosphere. Default value is 101.3e3 Pa
+    rho_tube, E_tube, v_tube, sf, g, unit_cost_tube, rho_pylon, Su_pylon, unit_cost_pylon : float
+        Material properties, as in `TubeAndPylon`
+    E_pylon, Su_tube : float
+        Pylon Young's modulus and tube ultimate strength, for the pylon
+        buckling and span sizing
+
+    Returns
+    -------
+    h : ndarray
+        Pylon height of each segment (m)
+    t_segment : ndarray
+        Tube thickness of each segment (m)
+    r_pylon_segment : ndarray
+        Pylon radius of each segment (m)
+    track_elevation : ndarray
+        Track elevation of each segment (m)
+    dx : ndarray
+        Distance between pylons of each segment (m)
+    von_mises : ndarray
+        Von Mises stress in the tube of each segment (Pa)
+    t_crit : ndarray
+        Minimum tube thickness for buckling of each segment (m)
+    m_prime : ndarray
+        Tube mass per unit length of each segment (kg/m)
+    buckling_margin : ndarray
+        Pylon buckling margin ``1 - R/R_buckle`` of each segment, negative
+        where the pylons buckle
+    n_pylons : ndarray
+        Number of pylons of each segment
+    total_material_cost : ndarray
+        Tube and pylon material cost per unit length of each segment (USD/m)
+    route_cost : float
+        Material cost of the whole route (USD)
+    route_pylons : float
+        Number of pylons of the whole route
+    route_mass : float
+        Tube and pylon mass of the whole route (kg)
+    max_von_mises : float
+        Largest Von Mises stress along the route (Pa)
+    min_buckling_margin : float
+        Smallest pylon buckling margin along the route
+
+    Notes
+    -----
+    By default every segment shares the scalar tube thickness `t` and pylon
+    radius `r_pylon`, and only the pylon height follows the terrain. With
+    ``size_spans=True`` they are sized per segment by `optimize_spans` and
+    the `t` and `r_pylon` params are not used. The defaults are a flat route
+    of the same length as `TubeTemp`.
+    """
+
+    def __init__(self, n_segments=10, size_spans=False):
+        super(RouteStructure, self).__init__()
+        self.deriv_options['type'] = 'fd'
+        self.size_spans = size_spans
+
+        self.add_param('segment_length', np.full(n_segments, 482803. / n_segments), units='m',
+                       desc='Length of each route segment')
+        self.add_param('elevation', np.zeros(n_segments), units='m', desc='Terrain elevation')
+        self.add_param('max_grade', .01, desc='Maximum track grade')
+        self.add_param('h_min', 2.0, units='m', desc='Minimum pylon height')
+
+        self.add_param('tube_area', val=3.8013, units='m**2', desc='inner tube area')
+        self.add_param('t', val=.05, units='m', desc='tube thickness')
+        self.add_param('r_pylon', val=1.1, units='m', desc='radius of pylon')
+        self.add_param('m_pod', val=3100.0, units='kg', desc='mass of pod')
+        self.add_param('p_tunnel', val=100.0, units='Pa', desc='Tunnel Pressure')
+        self.add_param('p_ambient', val=101300.0, units='Pa', desc='Ambient Pressure')
+        self.add_param('rho_tube', val=7820.0, units='kg/m**3', desc='density of steel')
+        self.add_param('E_tube', val=200.0e9, units='Pa', desc='Young\'s Modulus of tube')
+        self.add_param('v_tube', val=.3, desc='Poisson\'s ratio of tube')
+        self.add_param('sf', val=1.5, desc='safety factor')
+        self.add_param('g', val=9.81, units='m/s**2', desc='gravity')
+        self.add_param('unit_cost_tube', val=.3307, units='USD/kg',
+                       desc='cost of tube materials per unit mass')
+        self.add_param('rho_pylon', val=2400.0, units='kg/m**3', desc='density of pylon material')
+        self.add_param('Su_pylon', val=40.0e6, units='Pa', desc='ultimate strength_pylon')
+        self.add_param('E_pylon', val=41.0e9, units='Pa', desc='Young\'s Modulus of pylon')
+        self.add_param('Su_tube', val=152.0e6, units='Pa', desc='ultimate strength of tube')
+        self.add_param('unit_cost_pylon', val=.05, units='USD/kg',
+                       desc='cost of pylon materials per unit mass')
+
+        self.add_output('h', np.full(n_segments, 2.0), units='m', desc='height of pylons')
+        self.add_output('track_elevation', np.zeros(n_segments), units='m', desc='track elevation')
+        self.add_output('t_segment', np.full(n_segments, .05), units='m', desc='tube thickness')
+        self.add_output('r_pylon_segment', np.full(n_segments, 1.1), units='m', desc='radius of pylon')
+        self.add_output('dx', np.full(n_segments, 500.0), units='m', desc='distance between pylons')
+        self.add_output('von_mises', np.zeros(n_segments), units='Pa', desc='max Von Mises Stress')
+        self.add_output('t_crit', np.zeros(n_segments), units='m',
+                        desc='Minimum tunnel thickness for buckling')
+        self.add_output('m_prime', np.full(n_segments, 100.0), units='kg/m',
+                        desc='total mass of the tube per unit length')
+        self.add_output('buckling_margin', np.zeros(n_segments), desc='pylon buckling margin')
+        self.add_output('n_pylons', np.zeros(n_segments), desc='number of pylons')
+        self.add_output('total_material_cost', np.zeros(n_segments), units='USD/m',
+                        desc='cost of materials')
+        self.add_output('route_cost', 0.0, units='USD', desc='material cost of the route')
+        self.add_output('route_pylons', 0.0, desc='number of pylons of the route')
+        self.add_output('route_mass', 0.0, units='kg', desc='tube and pylon mass of the route')
+        self.add_output('max_von_mises', 0.0, units='Pa', desc='largest Von Mises Stress')
+        self.add_output('min_buckling_margin', 0.0, desc='smallest pylon buckling margin')
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        if self.size_spans:
+            design = {}
+        else:
+            design = {'t': params['t'], 'r_pylon': params['r_pylon']}
+        result = route_structure(params['segment_length'], params['elevation'],
+                                 max_grade=params['max_grade'], h_min=params['h_min'],
+                                 size_spans=self.size_spans, Su_tube=params['Su_tube'],
+                                 tube_area=params['tube_area'], m_pod=params['m_pod'],
+                                 p_tunnel=params['p_tunnel'], p_ambient=params['p_ambient'],
+                                 rho_tube=params['rho_tube'], E_tube=params['E_tube'],
+                                 v_tube=params['v_tube'], sf=params['sf'], g=params['g'],
+                                 unit_cost_tube=params['unit_cost_tube'],
+                                 rho_pylon=params['rho_pylon'], E_pylon=params['E_pylon'],
+                                 Su_pylon=params['Su_pylon'],
+                                 unit_cost_pylon=params['unit_cost_pylon'], **design)
+
+        for name in ('h', 'track_elevation', 'dx', 'von_mises', 't_crit', 'm_prime', 'n_pylons',
+                     'total_material_cost', 'buckling_margin'):
+            unknowns[name] = np.broadcast_to(result[name], params['segment_length'].shape)
+        unknowns['t_segment'] = result['t']
+        unknowns['r_pylon_segment'] = result['r_pylon']
+        unknowns['route_cost'] = np.sum(result['segment_cost'])
+        unknowns['route_pylons'] = np.sum(result['n_pylons'])
+        unknowns['route_mass'] = np.sum(result['m_prime'] * params['segment_length'] +
+                                        result['m_pylon'] * result['n_pylons'])
+        unknowns['max_von_mises'] = np.max(result['von_mises'])
+        unknowns['min_buckling_margin'] = np.min(result['buckling_margin'])
+
+
+if __name__ == '__main__':
+    prob = Problem()
+    root = prob.root = Group()
+    root.add('route', RouteStructure(n_segments=200))
+
+    prob.setup()
+
+    # rolling hills with a ridge two thirds along the way
+    x = np.linspace(0.0, 482803., 200)
+    prob['route.elevation'] = 50.0 * np.sin(x / 20000.0) + 150.0 * np.exp(-((x - 320000.0) / 15000.0)**2)
+    prob['route.segment_length'] = np.full(200, 482803. / 200)
+    prob['route.max_grade'] = .002
+
+    prob.run()
+
+    print('pylon height %f to %f m' % (np.min(prob['route.h']), np.max(prob['route.h'])))
+    print('number of pylons %f' % prob['route.route_pylons'])
+    print('route material cost $%f M' % (prob['route.route_cost'] / 1.0e6))
+    print('route mass %f kt' % (prob['route.route_mass'] / 1.0e6))
+    print('smallest pylon buckling margin %f' % prob['route.min_buckling_margin'])
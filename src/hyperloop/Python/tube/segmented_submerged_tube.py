@@ -0,0 +1,140 @@
+"""
+Submerged tube sized along a depth profile.
+
+`SubmergedTube` sizes the wall for a single `depth`. Long bay and lake
+crossings run from a few meters to tens of meters deep, and the wall
+thickness, mass and cost grow with the water pressure. `SegmentedSubmergedTube`
+sizes every segment of a bathymetry profile with `submerged_tube_sizing` and
+aggregates the length weighted `water_cost` and the `water_length` that
+`TicketCost` takes.
+"""
+from __future__ import print_function
+
+import numpy as np
+from openmdao.api import Component, Group, Problem
+
+from hyperloop.Python.tube.submerged_tube import submerged_tube_sizing
+
+
+class SegmentedSubmergedTube(Component):
+    """
+    Params
+    ------
+    segment_length : ndarray
+        Length of each segment of the crossing (m)
+    depth : ndarray
+        Depth of the tube in each segment (m)
+    p_tube : float
+        Tube pressure. Default value is 850 Pa
+    A_tube : float
+        Cross sectional area of tube. Default value is 30 m**2
+    Su : float
+        Ultimate strength of tube material. Default value is 400.0e6 Pa
+    SF : float
+        Tube safety factor. Default value is 5.0
+    rho_water : float
+        Density of sea water. Default value is 1025.0 kg/m**3
+    rho_tube : float
+        Density of tube material. Default value is 7800.0 kg/m**3
+    g : float
+        Gravitational acceleration. Default value is 9.81 m/s**2
+    Pa : float
+        Ambient pressure at sea level. Default value is 101.3e3 Pa
+    unit_cost_tube : float
+        Cost of tube materials per unit mass. Default value is .3307 USD/kg
+
+    Returns
+    -------
+    t : ndarray
+        Tube thickness of each segment (m)
+    dF_buoyancy : ndarray
+        Buoyant force per unit length of each segment (N/m)
+    m_prime : ndarray
+        Tube mass per unit length of each segment (kg/m)
+    anchor_load : ndarray
+        Net upward load per unit length on the anchors of each segment (N/m)
+    material_cost : ndarray
+        Material cost per unit length of each segment (USD/m)
+    water_cost : float
+        Length weighted material cost per unit length of the crossing (USD/m)
+    water_length : float
+        Length of the crossing (m)
+    crossing_cost : float
+        Material cost of the crossing (USD)
+    anchor_load_max : float
+        Largest anchor load per unit length (N/m)
+    anchor_load_tot : float
+        Total anchor load of the crossing (N)
+
+    Notes
+    -----
+    The defaults are 10 km at the `SubmergedTube` depth of 10 m, which
+    reproduce the `TicketCost` default `water_cost`.
+    """
+
+    def __init__(self, n_segments=10):
+        super(SegmentedSubmergedTube, self).__init__()
+        self.deriv_options['type'] = 'fd'
+
+        self.add_param('segment_length', np.full(n_segments, 10.0e3 / n_segments), units='m',
+                       desc='Length of each segment')
+        self.add_param('depth', np.full(n_segments, 10.0), units='m', desc='Tunnel depth underwater')
+        self.add_param('p_tube', val=850.0, desc='Tube pressure', units='Pa')
+        self.add_param('A_tube', val=30.0, desc='Tube cross sectional area', units='m**2')
+        self.add_param('Su', val=400.0e6, desc='Tube material yield strength', units='Pa')
+        self.add_param('SF', val=5.0, desc='Safety factor')
+        self.add_param('rho_water', val=1025.0, desc='Density of sea water', units='kg/m**3')
+        self.add_param('rho_tube', val=7800.0, desc='Density of tube material', units='kg/m**3')
+        self.add_param('g', val=9.81, desc='Gravity', units='m/s**2')
+        self.add_param('Pa', val=101.3e3, desc='Ambient pressure at sea level', units='Pa')
+        self.add_param('unit_cost_tube', val=.3307, desc='Cost of tube material per unit mass',
+                       units='USD/kg')
+
+        self.add_output('t', np.ones(n_segments), desc='Tube thickness', units='m')
+        self.add_output('dF_buoyancy', np.ones(n_segments), desc='Sectional buoyant force', units='N/m')
+        self.add_output('m_prime', np.ones(n_segments), desc='Tube mass per unit length', units='kg/m')
+        self.add_output('anchor_load', np.zeros(n_segments), desc='Anchor load per unit length',
+                        units='N/m')
+        self.add_output('material_cost', np.ones(n_segments), desc='Material cost per unit length',
+                        units='USD/m')
+        self.add_output('water_cost', 1.0, desc='Material cost per unit length underwater', units='USD/m')
+        self.add_output('water_length', 0.0, desc='Length traveled underwater', units='m')
+        self.add_output('crossing_cost', 0.0, desc='Material cost of the crossing', units='USD')
+        self.add_output('anchor_load_max', 0.0, desc='Largest anchor load per unit length', units='N/m')
+        self.add_output('anchor_load_tot', 0.0, desc='Total anchor load', units='N')
+
+    def solve_nonlinear(self, p, u, r):
+        length = p['segment_length']
+        result = submerged_tube_sizing(p['depth'], p_tube=p['p_tube'], A_tube=p['A_tube'], Su=p['Su'],
+                                       SF=p['SF'], rho_water=p['rho_water'], rho_tube=p['rho_tube'],
+                                       g=p['g'], Pa=p['Pa'], unit_cost_tube=p['unit_cost_tube'])
+
+        for name in ('t', 'dF_buoyancy', 'm_prime', 'anchor_load', 'material_cost'):
+            u[name] = result[name]
+
+        water_length = np.sum(length)
+        u['water_length'] = water_length
+        u['crossing_cost'] = np.sum(result['material_cost'] * length)
+        u['water_cost'] = u['crossing_cost'] / water_length if water_length > 0.0 else 0.0
+        u['anchor_load_max'] = np.max(result['anchor_load'])
+        u['anchor_load_tot'] = np.sum(result['anchor_load'] * length)
+
+
+if __name__ == '__main__':
+    top = Problem()
+    root = top.root = Group()
+
+    # 12 km bay crossing, shelving from 5 m to 80 m and back
+    x = np.linspace(0.0, 1.0, 24)
+    root.add('p', SegmentedSubmergedTube(n_segments=24))
+
+    top.setup()
+    top['p.segment_length'] = np.full(24, 500.0)
+    top['p.depth'] = 5.0 + 75.0 * np.sin(np.pi * x)**2
+    top.run()
+
+    print('\n')
+    print('thickness %f to %f m' % (np.min(top['p.t']), np.max(top['p.t'])))
+    print('water cost %f USD/m' % top['p.water_cost'])
+    print('water length %f m' % top['p.water_length'])
+    print('max anchor load %f kN/m' % (top['p.anchor_load_max'] / 1.0e3))
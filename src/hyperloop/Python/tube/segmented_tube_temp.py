@@ -0,0 +1,299 @@
+"""
+Along-route steady state temperature of the tube wall.
+
+`TubeTemp` balances the heat of the whole tube at one uniform ambient
+temperature and solar flux. `SegmentedTubeTemp` splits the tube into
+segments, each with its own length, ambient temperature, solar insolation,
+surface reflectance and number of pods. It solves the heat balance of every
+segment for its wall temperature. The segments only exchange heat with
+their surroundings, so the balances are independent and one vectorized
+Newton iteration solves all of them at once.
+
+`wall_heat_rates` evaluates the heat terms of `TubeWallTemp` (pod nozzle
+exhaust and solar flux in, radiation and natural convection out) for arrays
+of segments, along with the wall temperature derivative of the net heat
+release.
+"""
+from __future__ import print_function
+from math import pi
+
+import numpy as np
+from openmdao.api import Component, Group, Problem
+from openmdao.units.units import convert_units as cu
+
+from hyperloop.Python.tools.log import get_logger
+
+log = get_logger(__name__)
+
+# nozzle air unit conversions of `TubeWallTemp`
+_W_TO_SI = cu(1.0, 'lbm/s', 'kg/s')
+_CP_TO_SI = cu(1.0, 'Btu/(lbm*degR)', 'J/(kg*K)')
+_T_TO_SI = cu(1.0, 'degR', 'degK')
+
+
+def wall_heat_rates(temp_boundary, temp_outside_ambient, diameter_outer_tube, length, num_pods=0.0,
+                    nozzle_air_W=34.0, nozzle_air_Cp=1.009, nozzle_air_Tt=34.0, solar_insolation=1000.0,
+                    nn_incidence_factor=0.7, surface_reflectance=0.5, emissivity_tube=0.5,
+                    sb_constant=0.00000005670373, Nu_multiplier=1.0):
+    """Heat absorbed and released by tube segments, as in `TubeWallTemp`
+
+    All arguments broadcast against each other. The nozzle air arguments use
+    the units of `TubeWallTemp`.
+
+    Args
+    ----
+    temp_boundary : ndarray
+        Temperature of the tube wall (K)
+    temp_outside_ambient : ndarray
+        Temperature of the outside air (K)
+    diameter_outer_tube : float
+        outer diameter of the tube (m)
+    length : ndarray
+        Length of the tube segments (m)
+    num_pods : ndarray
+        Number of pods in each segment
+    nozzle_air_W : float
+        mass flow rate of the air exiting the pod nozzle (lbm/s)
+    nozzle_air_Cp : float
+        specific heat of air exiting the pod nozzle (Btu/(lbm*degR))
+    nozzle_air_Tt : float
+        temp of the air exiting the pod nozzle (degR)
+    solar_insolation : ndarray
+        solar irradiation (W/m**2)
+    nn_incidence_factor : float
+        Non-normal incidence factor
+    surface_reflectance : ndarray
+        Solar Reflectance Index
+    emissivity_tube : float
+        Emmissivity of the Tube
+    sb_constant : float
+        Stefan-Boltzmann Constant (W/((m**2)*(K**4)))
+    Nu_multiplier : float
+        fudge factor on the Nusselt number to account for a small breeze
+
+    Returns
+    -------
+    dict
+        ``total_heat_rate_pods``, ``q_total_solar``, ``q_rad_tot``,
+        ``total_q_nat_conv``, ``q_total_in`` and ``q_total_out`` (W), ``h``
+        (W/((m**2)*K)) and ``dq_net``, the derivative of
+        ``q_total_out - q_total_in`` with respect to `temp_boundary` (W/K)
+    """
+    T = np.asarray(temp_boundary, dtype=float)
+    Ta = np.asarray(temp_outside_ambient, dtype=float)
+    D = diameter_outer_tube
+
+    heat_capacity_rate = nozzle_air_W * _W_TO_SI * nozzle_air_Cp * _CP_TO_SI
+    total_heat_rate_pods = num_pods * heat_capacity_rate * (nozzle_air_Tt * _T_TO_SI - T)
+
+    # natural convection, see `TubeWallTemp` for the correlations
+    cold = Ta < 400
+    GrDelTL3 = np.where(cold, 41780000000000000000. * Ta**(-4.639), 4985000000000000000. * Ta**(-4.284))
+    Pr = np.where(cold, 1.23 * Ta**(-0.09685), 0.59 * Ta**(0.0239))
+    k = np.where(cold, 0.0001423 * Ta**(0.9138), 0.0002494 * Ta**(0.8152))
+    Ra = Pr * GrDelTL3 * np.abs(T - Ta) * D**3
+    c = 0.387 / (1 + (0.559 / Pr)**(9. / 16.))**(8. / 27.)
+    Nu = Nu_multiplier * (0.6 + c * Ra**(1. / 6.))**2
+    h = k * Nu / D
+
+    area_convection = pi * length * D
+    total_q_nat_conv = h * (T - Ta) * area_convection
+    q_rad_tot = area_convection * sb_constant * emissivity_tube * (T**4 - Ta**4)
+    q_total_solar = (1 - surface_reflectance) * nn_incidence_factor * solar_insolation * length * D
+
+    # Ra is proportional to |T - Ta|, so (T - Ta)*dh/dT only depends on Ra
+    dconv = h + k / D * Nu_multiplier * 2. * (0.6 + c * Ra**(1. / 6.)) * c * Ra**(1. / 6.) / 6.
+    dq_net = (dconv + 4. * sb_constant * emissivity_tube * T**3) * area_convection + \
+        num_pods * heat_capacity_rate
+
+    q_total_in = q_total_solar + total_heat_rate_pods
+    q_total_out = q_rad_tot + total_q_nat_conv
+    return {'total_heat_rate_pods': total_heat_rate_pods,
+            'q_total_solar': q_total_solar,
+            'q_rad_tot': q_rad_tot,
+            'total_q_nat_conv': total_q_nat_conv,
+            'q_total_in': q_total_in,
+            'q_total_out': q_total_out,
+            'h': h,
+            'dq_net': dq_net}
+
+
+def solve_segment_temps(temp_outside_ambient, diameter_outer_tube, length, temp_boundary=None,
+                        atol=1e-6, maxiter=50, **kwargs):
+    """Steady state wall temperature of every tube segment
+
+    Solves ``q_total_out = q_total_in`` of `wall_heat_rates` for all segments
+    with an elementwise Newton iteration. Keyword arguments are passed to
+    `wall_heat_rates`.
+
+    Args
+    ----
+    temp_outside_ambient : ndarray
+        Temperature of the outside air along the tube (K)
+    diameter_outer_tube : float
+        outer diameter of the tube (m)
+    length : ndarray
+        Length of the tube segments (m)
+    temp_boundary : ndarray
+        initial guess, defaults to the ambient temperature (K)
+    atol : float
+        convergence tolerance on the temperature update (K)
+    maxiter : int
+        maximum number of Newton iterations
+
+    Returns
+    -------
+    tuple
+        ``(temp_boundary, converged)``, the wall temperatures (K) and whether
+        every segment converged
+    """
+    Ta = np.asarray(temp_outside_ambient, dtype=float)
+    shape = np.broadcast(Ta, np.asarray(length), *[np.asarray(v) for v in kwargs.values()]).shape
+    T = np.broadcast_to(Ta if temp_boundary is None else temp_boundary, shape).astype(float)
+
+    for it in range(maxiter):
+        q = wall_heat_rates(T, Ta, diameter_outer_tube, length, **kwargs)
+        step = (q['q_total_out'] - q['q_total_in']) / q['dq_net']
+        # the net heat release grows with the wall temperature; limit the
+        # step so the first iterations stay in the physical range
+        step = np.clip(step, -0.5 * T, 100.0)
+        T = T - step
+        if np.all(np.abs(step) < atol):
+            return T, True
+
+    log.warning('tube segment temperatures did not converge, max update %g K', np.max(np.abs(step)))
+    return T, False
+
+
+class SegmentedTubeTemp(Component):
+    """
+    Params
+    ------
+    tube_area : float
+        tube inner area (m^2)
+    tube_thickness : float
+        tube thickness (m)
+    segment_length : ndarray
+        Length of each tube segment (m)
+    num_pods : ndarray
+        Number of pods in each segment at a given time
+    temp_outside_ambient : ndarray
+        Temperature of the outside air along the tube (K)
+    solar_insolation : ndarray
+        solar irradiation along the tube (W/m**2)
+    surface_reflectance : ndarray
+        Solar Reflectance Index along the tube
+    nozzle_air_W : float
+        mass flow rate of the air exiting the pod nozzle (lbm/s)
+    nozzle_air_Cp : float
+        specific heat of air exiting the pod nozzle (Btu/(lbm*degR))
+    nozzle_air_Tt : float
+        temp of the air exiting the pod nozzle (degR)
+    nn_incidence_factor : float
+        Non-normal incidence factor
+    emissivity_tube : float
+        Emmissivity of the Tube
+    sb_constant : float
+        Stefan-Boltzmann Constant (W/((m**2)*(K**4)))
+    Nu_multiplier : float
+        optional fudge factor on Nusslet number to account for
+        a small breeze on tube, 1 assumes no breeze
+
+    Returns
+    -------
+    temp_boundary : ndarray
+        Steady state wall temperature of each segment (K)
+    q_total_in : ndarray
+        Heat absorbed by each segment from pods and sun (W)
+    q_total_out : ndarray
+        Heat released by each segment via radiation and natural convection (W)
+    temp_max : float
+        Temperature of the hottest segment (K)
+    temp_mean : float
+        Length weighted average wall temperature (K)
+
+    Notes
+    -----
+    The default segments split the 482803 m tube of `TubeTemp` evenly, with
+    its 34 pods spread evenly along it.
+    """
+
+    def __init__(self, n_segments=10):
+        super(SegmentedTubeTemp, self).__init__()
+        self.deriv_options['type'] = 'fd'
+
+        self.add_param('tube_area', 3.9057, units='m**2', desc='tube inner area')
+        self.add_param('tube_thickness', .05, units='m', desc='tube thickness')
+        self.add_param('segment_length', np.full(n_segments, 482803. / n_segments), units='m',
+                       desc='Length of each tube segment')
+        self.add_param('num_pods', np.full(n_segments, 34. / n_segments),
+                       desc='Number of Pods in each segment at a given time')
+        self.add_param('temp_outside_ambient', np.full(n_segments, 305.6), units='K',
+                       desc='Temperature of the outside air along the tube')
+        self.add_param('solar_insolation', np.full(n_segments, 1000.), units='W/m**2',
+                       desc='solar irradiation along the tube')
+        self.add_param('surface_reflectance', np.full(n_segments, 0.5),
+                       desc='Solar Reflectance Index along the tube')
+        self.add_param('nozzle_air_W', 34., desc='mass flow rate of the air exiting the pod nozzle')
+        self.add_param('nozzle_air_Cp', 1.009, desc='specific heat of air exiting the pod nozzle')
+        self.add_param('nozzle_air_Tt', 34., desc='temp of the air exiting the pod nozzle')
+        self.add_param('nn_incidence_factor', 0.7, desc='Non-normal incidence factor')
+        self.add_param('emissivity_tube', 0.5, desc='Emmissivity of the Tube')
+        self.add_param('sb_constant', 0.00000005670373, units='W/((m**2)*(K**4))',
+                       desc='Stefan-Boltzmann Constant')
+        self.add_param('Nu_multiplier', 1.,
+                       desc='fudge factor on nusslet number to account for small breeze on tube')
+
+        self.add_output('temp_boundary', np.full(n_segments, 322.0), units='K',
+                        desc='Steady state wall temperature of each segment')
+        self.add_output('q_total_in', np.zeros(n_segments), units='W',
+                        desc='Heat absorbed by each segment')
+        self.add_output('q_total_out', np.zeros(n_segments), units='W',
+                        desc='Heat released by each segment')
+        self.add_output('temp_max', 322.0, units='K', desc='Temperature of the hottest segment')
+        self.add_output('temp_mean', 322.0, units='K', desc='Average wall temperature')
+
+    def solve_nonlinear(self, p, u, r):
+        diameter_outer_tube = 2 * np.sqrt(p['tube_area'] / pi) + p['tube_thickness']
+        kwargs = dict((name, p[name]) for name in
+                      ('num_pods', 'nozzle_air_W', 'nozzle_air_Cp', 'nozzle_air_Tt', 'solar_insolation',
+                       'nn_incidence_factor', 'surface_reflectance', 'emissivity_tube', 'sb_constant',
+                       'Nu_multiplier'))
+
+        # warm start from the previous solution
+        T, converged = solve_segment_temps(p['temp_outside_ambient'], diameter_outer_tube,
+                                           p['segment_length'], temp_boundary=u['temp_boundary'],
+                                           **kwargs)
+        q = wall_heat_rates(T, p['temp_outside_ambient'], diameter_outer_tube, p['segment_length'],
+                            **kwargs)
+
+        u['temp_boundary'] = T
+        u['q_total_in'] = q['q_total_in']
+        u['q_total_out'] = q['q_total_out']
+        u['temp_max'] = np.max(T)
+        u['temp_mean'] = np.sum(T * p['segment_length']) / np.sum(p['segment_length'])
+
+
+if __name__ == '__main__':
+    prob = Problem()
+    root = prob.root = Group()
+    root.add('tt', SegmentedTubeTemp(n_segments=600))
+
+    prob.setup()
+
+    # 600 km line running from the coast inland, sunnier and hotter inland
+    x = np.linspace(0.0, 1.0, 600)
+    prob['tt.segment_length'] = np.full(600, 1000.0)
+    prob['tt.num_pods'] = np.full(600, 34. / 600)
+    prob['tt.temp_outside_ambient'] = 290.0 + 25.0 * x
+    prob['tt.solar_insolation'] = 800.0 + 250.0 * x
+    prob['tt.nozzle_air_W'] = 1.08
+    prob['tt.nozzle_air_Cp'] = 0.28
+    prob['tt.nozzle_air_Tt'] = 1710.0
+
+    prob.run()
+
+    hottest = np.argsort(prob['tt.temp_boundary'])[::-1][:5]
+    print('hottest segments (km):  %s' % hottest)
+    print('max wall temp           %f K' % prob['tt.temp_max'])
+    print('mean wall temp          %f K' % prob['tt.temp_mean'])
@@ -3,6 +3,31 @@ from __future__ import print_function
 import numpy as np
 from openmdao.api import IndepVarComp, Component, Group, Problem
 
+def submerged_tube_sizing(depth, p_tube = 850.0, A_tube = 30.0, Su = 400.0e6, SF = 5.0, rho_water = 1025.0,
+	rho_tube = 7800.0, g = 9.81, Pa = 101.3e3, unit_cost_tube = .3307):
+	'''
+	Wall thickness, buoyancy, mass and cost of `SubmergedTube`. All arguments broadcast
+	against each other, so a whole crossing is sized in one call.
+
+	Returns
+	-------
+	dict
+		t (m), dF_buoyancy (N/m), material_cost (USD/m), m_prime (kg/m), and anchor_load,
+		the net upward load on the anchors of the displaced outer volume less the tube
+		weight (N/m)
+	'''
+	p_ambient = Pa + rho_water*depth*g
+	r = np.sqrt(A_tube/np.pi)
+	t = ((p_ambient-p_tube)*r)/(Su/SF)
+	m_prime = (np.pi*((r+t)**2)-A_tube)*rho_tube
+
+	return {'t' : t,
+		'dF_buoyancy' : rho_water*g*A_tube + np.zeros(np.shape(t)),
+		'material_cost' : m_prime*unit_cost_tube,
+		'm_prime' : m_prime,
+		'anchor_load' : (rho_water*np.pi*((r+t)**2) - m_prime)*g}
+
+
 class SubmergedTube(Component):
 	'''
 	Params
@@ -62,14 +87,12 @@ class SubmergedTube(Component):
 		'''
 		t = (p*r)/(Su/SF); p = pa + rho*g*h; F_buoyant/L = rho*A_tube*g
 		'''
-		p_ambient = p['Pa'] + p['rho_water']*p['depth']*p['g']
-		r = np.sqrt(p['A_tube']/np.pi)
-		t = ((p_ambient-p['p_tube'])*r)/(p['Su']/p['SF'])
-		
-		u['t'] = t
-		u['dF_buoyancy'] = p['rho_water']*p['g']*p['A_tube']
-		u['material_cost'] = (np.pi*((r+t)**2)-p['A_tube'])*p['rho_tube']*p['unit_cost_tube']
-		u['m_prime'] = (np.pi*((r+t)**2)-p['A_tube'])*p['rho_tube']
+		result = submerged_tube_sizing(p['depth'], p_tube = p['p_tube'], A_tube = p['A_tube'], Su = p['Su'],
+			SF = p['SF'], rho_water = p['rho_water'], rho_tube = p['rho_tube'], g = p['g'], Pa = p['Pa'],
+			unit_cost_tube = p['unit_cost_tube'])
+
+		for name in ('t', 'dF_buoyancy', 'material_cost', 'm_prime'):
+			u[name] = result[name]
 
 if __name__ == '__main__':
 	top = Problem()
@@ -0,0 +1,247 @@
+"""
+Transient tube wall temperature over daily and seasonal cycles.
+
+The steady `temp_boundary` of `TubeTemp` assumes the wall is always in
+equilibrium with the sun and the outside air, and so it misses the daily
+peaks. `simulate_tube_temp` adds the heat capacity of the tube wall to the
+heat balance of `segmented_tube_temp.wall_heat_rates`::
+
+    C*dT/dt = q_total_in(T, t) - q_total_out(T, t)
+
+and integrates it with backward Euler over time varying ambient temperature
+and solar insolation. The stiff radiation and convection terms are handled
+implicitly, so the time step only needs to resolve the weather. Each step
+solves all segments at once with an elementwise Newton iteration.
+"""
+from __future__ import print_function
+from collections import namedtuple
+from math import pi
+
+import numpy as np
+from openmdao.api import Component, Group, Problem
+
+from hyperloop.Python.tube.segmented_tube_temp import solve_segment_temps, wall_heat_rates
+from hyperloop.Python.tools.log import get_logger
+
+log = get_logger(__name__)
+
+TubeTempHistory = namedtuple('TubeTempHistory', 'time temp_boundary q_total_in q_total_out')
+
+DAY = 86400.0
+
+
+def diurnal_ambient(t, temp_mean=305.6, amplitude=8.0, peak_hour=15.0):
+    """Sinusoidal daily outside air temperature (K) at times `t` (s)"""
+    return temp_mean + amplitude * np.cos(2 * pi * (np.asarray(t) / DAY - peak_hour / 24.0))
+
+
+def diurnal_insolation(t, peak=1000.0, sunrise=6.0, sunset=18.0):
+    """Clear sky solar irradiation (W/m**2) at times `t` (s), a half sine between sunrise and sunset"""
+    hour = np.mod(np.asarray(t) / 3600.0, 24.0)
+    phase = (hour - sunrise) / (sunset - sunrise)
+    return np.where((phase > 0.0) & (phase < 1.0), peak * np.sin(pi * np.clip(phase, 0.0, 1.0)), 0.0)
+
+
+def wall_heat_capacity(tube_area, tube_thickness, length, rho_tube=7820.0, cp_tube=490.0):
+    """Heat capacity of the tube wall (J/K) of segments of `length` (m)"""
+    r_inner = np.sqrt(tube_area / pi)
+    return rho_tube * cp_tube * pi * ((r_inner + tube_thickness)**2 - r_inner**2) * length
+
+
+def simulate_tube_temp(t, temp_outside_ambient, solar_insolation, length, tube_area=3.9057,
+                       tube_thickness=.05, temp_initial=None, rho_tube=7820.0, cp_tube=490.0,
+                       atol=1e-6, maxiter=50, **kwargs):
+    """Integrates the wall temperature of tube segments over time
+
+    Args
+    ----
+    t : ndarray
+        time of each step (s)
+    temp_outside_ambient : ndarray
+        outside air temperature (K) of shape ``(len(t), n_segments)``, or
+        ``(len(t), 1)`` for the same weather along the tube
+    solar_insolation : ndarray
+        solar irradiation (W/m**2), shaped like `temp_outside_ambient`
+    length : ndarray
+        Length of each tube segment (m)
+    tube_area : float
+        tube inner area (m^2)
+    tube_thickness : float
+        tube thickness (m)
+    temp_initial : ndarray
+        wall temperature at ``t[0]`` (K), defaults to the steady state of the
+        first step
+    rho_tube : float
+        density of the tube material (kg/m**3)
+    cp_tube : float
+        specific heat of the tube material (J/(kg*K))
+    atol : float
+        Newton tolerance on the temperature update (K)
+    maxiter : int
+        maximum Newton iterations per step
+    kwargs
+        the other, time independent, arguments of `wall_heat_rates`
+
+    Returns
+    -------
+    TubeTempHistory
+        wall temperature (K) and heat absorbed and released (W) of every
+        segment at every time, arrays of shape ``(len(t), n_segments)``
+    """
+    t = np.asarray(t, dtype=float)
+    Ta = np.asarray(temp_outside_ambient, dtype=float)
+    sun = np.asarray(solar_insolation, dtype=float)
+    n_segments = np.broadcast(Ta[0], sun[0], np.asarray(length)).shape
+    Ta = np.broadcast_to(Ta, (len(t),) + n_segments)
+    sun = np.broadcast_to(sun, (len(t),) + n_segments)
+
+    D = 2 * np.sqrt(tube_area / pi) + tube_thickness
+    C = wall_heat_capacity(tube_area, tube_thickness, length, rho_tube, cp_tube)
+
+    if temp_initial is None:
+        T, _ = solve_segment_temps(Ta[0], D, length, solar_insolation=sun[0], **kwargs)
+    else:
+        T = np.broadcast_to(np.asarray(temp_initial, dtype=float), n_segments).astype(float)
+
+    temp = np.empty(Ta.shape)
+    q_in = np.empty(Ta.shape)
+    q_out = np.empty(Ta.shape)
+    q = wall_heat_rates(T, Ta[0], D, length, solar_insolation=sun[0], **kwargs)
+    temp[0], q_in[0], q_out[0] = T, q['q_total_in'], q['q_total_out']
+
+    for n in range(1, len(t)):
+        c_dt = C / (t[n] - t[n - 1])
+        T_old = T
+        for it in range(maxiter):
+            q = wall_heat_rates(T, Ta[n], D, length, solar_insolation=sun[n], **kwargs)
+            resid = c_dt * (T - T_old) + q['q_total_out'] - q['q_total_in']
+            step = np.clip(resid / (c_dt + q['dq_net']), -0.5 * T, 100.0)
+            T = T - step
+            if np.all(np.abs(step) < atol):
+                break
+        else:
+            log.warning('tube temperature step %d did not converge, max update %g K', n,
+                        np.max(np.abs(step)))
+
+        q = wall_heat_rates(T, Ta[n], D, length, solar_insolation=sun[n], **kwargs)
+        temp[n], q_in[n], q_out[n] = T, q['q_total_in'], q['q_total_out']
+
+    return TubeTempHistory(time=t, temp_boundary=temp, q_total_in=q_in, q_total_out=q_out)
+
+
+class TransientTubeTemp(Component):
+    """
+    Params
+    ------
+    time : ndarray
+        Time of each step (s)
+    temp_outside_ambient : ndarray
+        Outside air temperature at each time and segment (K)
+    solar_insolation : ndarray
+        Solar irradiation at each time and segment (W/m**2)
+    segment_length : ndarray
+        Length of each tube segment (m)
+    num_pods : ndarray
+        Number of pods in each segment at a given time
+    tube_area : float
+        tube inner area (m^2)
+    tube_thickness : float
+        tube thickness (m)
+    rho_tube : float
+        Density of the tube material (kg/m**3)
+    cp_tube : float
+        Specific heat of the tube material (J/(kg*K))
+    nozzle_air_W : float
+        mass flow rate of the air exiting the pod nozzle (lbm/s)
+    nozzle_air_Cp : float
+        specific heat of air exiting the pod nozzle (Btu/(lbm*degR))
+    nozzle_air_Tt : float
+        temp of the air exiting the pod nozzle (degR)
+
+    Returns
+    -------
+    temp_boundary : ndarray
+        Wall temperature at each time and segment (K)
+    temp_peak : ndarray
+        Peak wall temperature of each segment over the cycle (K)
+    temp_max : float
+        Peak wall temperature of the whole tube (K)
+    temp_mean : float
+        Time and length averaged wall temperature (K)
+
+    Notes
+    -----
+    The defaults are one day of `diurnal_ambient` and `diurnal_insolation`
+    weather, at `n_times` steps, over the `SegmentedTubeTemp` default
+    segments. The integration starts at the steady state of the first step.
+    """
+
+    def __init__(self, n_times=97, n_segments=10):
+        super(TransientTubeTemp, self).__init__()
+        self.deriv_options['type'] = 'fd'
+
+        t = np.linspace(0.0, DAY, n_times)
+        shape = (n_times, n_segments)
+        self.add_param('time', t, units='s', desc='Time of each step')
+        self.add_param('temp_outside_ambient', np.broadcast_to(diurnal_ambient(t)[:, np.newaxis], shape).copy(),
+                       units='K', desc='Outside air temperature')
+        self.add_param('solar_insolation', np.broadcast_to(diurnal_insolation(t)[:, np.newaxis], shape).copy(),
+                       units='W/m**2', desc='Solar irradiation')
+        self.add_param('segment_length', np.full(n_segments, 482803. / n_segments), units='m',
+                       desc='Length of each tube segment')
+        self.add_param('num_pods', np.full(n_segments, 34. / n_segments),
+                       desc='Number of Pods in each segment at a given time')
+        self.add_param('tube_area', 3.9057, units='m**2', desc='tube inner area')
+        self.add_param('tube_thickness', .05, units='m', desc='tube thickness')
+        self.add_param('rho_tube', 7820.0, units='kg/m**3', desc='Density of the tube material')
+        self.add_param('cp_tube', 490.0, units='J/(kg*K)', desc='Specific heat of the tube material')
+        self.add_param('nozzle_air_W', 34., desc='mass flow rate of the air exiting the pod nozzle')
+        self.add_param('nozzle_air_Cp', 1.009, desc='specific heat of air exiting the pod nozzle')
+        self.add_param('nozzle_air_Tt', 34., desc='temp of the air exiting the pod nozzle')
+
+        self.add_output('temp_boundary', np.full(shape, 322.0), units='K', desc='Wall temperature')
+        self.add_output('temp_peak', np.full(n_segments, 322.0), units='K',
+                        desc='Peak wall temperature of each segment')
+        self.add_output('temp_max', 322.0, units='K', desc='Peak wall temperature')
+        self.add_output('temp_mean', 322.0, units='K', desc='Average wall temperature')
+
+    def solve_nonlinear(self, p, u, r):
+        history = simulate_tube_temp(p['time'], p['temp_outside_ambient'], p['solar_insolation'],
+                                     p['segment_length'], tube_area=p['tube_area'],
+                                     tube_thickness=p['tube_thickness'], rho_tube=p['rho_tube'],
+                                     cp_tube=p['cp_tube'], num_pods=p['num_pods'],
+                                     nozzle_air_W=p['nozzle_air_W'], nozzle_air_Cp=p['nozzle_air_Cp'],
+                                     nozzle_air_Tt=p['nozzle_air_Tt'])
+        T = history.temp_boundary
+
+        u['temp_boundary'] = T
+        u['temp_peak'] = np.max(T, axis=0)
+        u['temp_max'] = np.max(T)
+        # trapezoidal time average, length weighted over the segments
+        weights = p['segment_length'] / np.sum(p['segment_length'])
+        mean = np.dot(T, weights)
+        u['temp_mean'] = np.trapz(mean, p['time']) / (p['time'][-1] - p['time'][0])
+
+
+if __name__ == '__main__':
+    prob = Problem()
+    root = prob.root = Group()
+    root.add('tt', TransientTubeTemp(n_times=24 * 4 * 3 + 1, n_segments=10))
+
+    prob.setup()
+
+    # three days, so the start up transient has died out on the last one
+    t = np.linspace(0.0, 3 * DAY, 24 * 4 * 3 + 1)
+    prob['tt.time'] = t
+    prob['tt.temp_outside_ambient'] = np.broadcast_to(diurnal_ambient(t)[:, np.newaxis], (len(t), 10))
+    prob['tt.solar_insolation'] = np.broadcast_to(diurnal_insolation(t)[:, np.newaxis], (len(t), 10))
+    prob['tt.nozzle_air_W'] = 1.08
+    prob['tt.nozzle_air_Cp'] = 0.28
+    prob['tt.nozzle_air_Tt'] = 1710.0
+
+    prob.run()
+
+    T = prob['tt.temp_boundary'][:, 0]
+    print('peak wall temp          %f K at %f h' % (np.max(T), (t[np.argmax(T)] / 3600.0) % 24.0))
+    print('min wall temp           %f K' % np.min(T))
+    print('mean wall temp          %f K' % prob['tt.temp_mean'])
@@ -3,6 +3,62 @@ from __future__ import print_function
 import numpy as np
 from openmdao.api import IndepVarComp, Component, Group, Problem, ExecComp, ScipyOptimizer
 
+
+def tube_and_pylon_sizing(tube_area, t, r_pylon, h, m_pod=3100.0, p_tunnel=100.0,
+                          p_ambient=101300.0, rho_tube=7820.0, E_tube=200.0e9, v_tube=.3,
+                          alpha_tube=0.0, dT_tube=0.0, unit_cost_tube=.3307, rho_pylon=2400.0,
+                          E_pylon=41.0e9, Su_pylon=40.0e6, unit_cost_pylon=.05, sf=1.5, g=9.81):
+    """Structural sizing of the tube and pylons of `TubeAndPylon`
+
+    All arguments broadcast against each other, so a whole route of spans
+    with different pylon heights is sized in one call.
+
+    Args
+    ----
+    tube_area : float or ndarray
+        inner tube area (m**2)
+    t : float or ndarray
+        tube thickness (m)
+    r_pylon : float or ndarray
+        pylon radius (m)
+    h : float or ndarray
+        pylon height (m)
+    others
+        the material, pressure and load params of `TubeAndPylon`
+
+    Returns
+    -------
+    dict
+        ``m_pylon``, ``m_prime``, ``von_mises``, ``total_material_cost``,
+        ``R``, ``delta``, ``dx``, ``t_crit`` and ``R_buckle`` as described in
+        `TubeAndPylon`
+    """
+    r = np.sqrt(tube_area / np.pi)
+    m_prime = rho_tube * np.pi * (((r + t)**2) - (r**2))  #Calculate mass per unit length
+    q = m_prime * g  #Calculate distributed load
+    dp = p_ambient - p_tunnel  #Calculate delta pressure
+    I_tube = (np.pi / 4.0) * (((r + t)**4) - (r**4))  #Calculate moment of inertia of tube
+
+    dx = ((2 * (Su_pylon / sf) * np.pi * (r_pylon**2)) - m_pod * g) / (m_prime * g)  #Calculate dx
+    M = (q * ((dx**2) / 8.0)) + (m_pod * g * (dx / 2.0))  #Calculate max moment
+    sig_theta = (dp * r) / t  #Calculate hoop stress
+    sig_axial = ((dp * r) / (2 * t)) + ((M * r) / I_tube) + \
+        alpha_tube * E_tube * dT_tube  #Calculate axial stress
+    von_mises = np.sqrt((((sig_theta**2) + (sig_axial**2) +
+                          ((sig_axial - sig_theta)**2)) / 2.0))  #Calculate Von Mises stress
+    m_pylon = rho_pylon * np.pi * (r_pylon**2) * h  #Calculate mass of single pylon
+
+    return {'total_material_cost': (unit_cost_tube * m_prime) + (unit_cost_pylon * m_pylon / dx),
+            'm_prime': m_prime,
+            'von_mises': von_mises,
+            'delta': (5.0 * q * (dx**4)) / (384.0 * E_tube * I_tube),
+            'm_pylon': m_pylon,
+            'R': .5 * m_prime * dx * g + .5 * m_pod * g,
+            'dx': dx,
+            't_crit': r * (((4.0 * dp * (1.0 - (v_tube**2))) / E_tube)**(1.0 / 3.0)),
+            'R_buckle': ((np.pi**3) * E_pylon * (r_pylon**4)) / (16 * (h**2))}  #Calculate pylon buckling load
+
+
 class TubeAndPylon(Component):
     """
     Notes
@@ -79,6 +135,8 @@ class TubeAndPylon(Component):
         outputs distance in between pylons in m
     t_crit :
         Minimum tube thickness to satisfy vacuum tube buckling condition in m
+    R_buckle : float
+        Euler buckling load of a pylon in N. Pylons buckle when R exceeds it
 
     Notes
     -----
@@ -181,6 +239,10 @@ class TubeAndPylon(Component):
                         val=0.0,
                         units='m',
                         desc='Minimum tunnel thickness for buckling')
+        self.add_output('R_buckle',
+                        val=0.0,
+                        units='N',
+                        desc='Buckling load of pylon')
 
     def solve_nonlinear(self, params, unknowns, resids):
         '''total material cost = ($/kg_tunnel)*m_prime + ($/kg_pylon)*m_pylon*(1/dx)
@@ -191,66 +253,18 @@ class TubeAndPylon(Component):
 
         '''
 
-        rho_tube = params['rho_tube']
-        E_tube = params['E_tube']
-        v_tube = params['v_tube']
-        alpha_tube = params['alpha_tube']
-        dT_tube = params['dT_tube']
-        unit_cost_tube = params['unit_cost_tube']
-        g = params['g']
-        tube_area = params['tube_area']
-        #r = params['r']
-        t = params['t']
-        m_pod = params['m_pod']
-        p_tunnel = params['p_tunnel']
-        p_ambient = params['p_ambient']
-        Su_pylon = params['Su_pylon']
-        sf = params['sf']
-        rho_pylon = params['rho_pylon']
-        E_pylon = params['E_pylon']
-        r_pylon = params['r_pylon']
-        unit_cost_pylon = params['unit_cost_pylon']
-        h = params['h']
-        vac_weight = params['vac_weight']
-
-        #Compute intermediate variable
-        r = np.sqrt(tube_area/np.pi)
-        #print(r)
-        q = rho_tube * np.pi * ((
-            (r + t)**2) - (r**2)) * g  #Calculate distributed load
-        dp = p_ambient - p_tunnel  #Calculate delta pressure
-        I_tube = (np.pi / 4.0) * ((
-            (r + t)**4) - (r**4))  #Calculate moment of inertia of tube
-
-        m_prime = rho_tube * np.pi * ((
-            (r + t)**2) - (r**2))  #Calculate mass per unit length
-        dx = ((2 * (Su_pylon / sf) * np.pi *
-               (r_pylon**2)) - m_pod * g) / (m_prime * g)  #Calculate dx
-        M = (q * (
-            (dx**2) / 8.0)) + (m_pod * g * (dx / 2.0))  #Calculate max moment
-        sig_theta = (dp * r) / t  #Calculate hoop stress
-        sig_axial = ((dp * r) / (2 * t)) + (
-            (M * r) / I_tube
-        ) + alpha_tube * E_tube * dT_tube  #Calculate axial stress
-        von_mises = np.sqrt((((sig_theta**2) + (sig_axial**2) + (
-            (sig_axial - sig_theta)**2)) /
-                    2.0))  #Calculate Von Mises stress
-        m_pylon = rho_pylon * np.pi * (r_pylon**
-                                    2) * h  #Calculate mass of single pylon
-
-        unknowns['total_material_cost'] = (unit_cost_tube * (rho_tube * np.pi * ((
-            (r + t)**2) - (r**2)))) + (unit_cost_pylon * m_pylon * (1 / (
-                ((2 * (Su_pylon / sf) * np.pi * (r_pylon**2)) - m_pod * g) /
-                (m_prime * g))))
-        unknowns['m_prime'] = m_prime
-        unknowns['von_mises'] = von_mises
-        unknowns['delta'] = (5.0 * q * (dx**4)) / (384.0 * E_tube * I_tube)
-        unknowns['m_pylon'] = m_pylon
-        unknowns['R'] = .5 * m_prime * dx * g + .5 * m_pod * g
-        unknowns['dx'] = dx
-        unknowns['t_crit'] = r * ((
-            (4.0 * dp * (1.0 - (v_tube**2))) / E_tube)**(1.0 / 3.0))
-
+        result = tube_and_pylon_sizing(
+            params['tube_area'], params['t'], params['r_pylon'], params['h'],
+            m_pod=params['m_pod'], p_tunnel=params['p_tunnel'], p_ambient=params['p_ambient'],
+            rho_tube=params['rho_tube'], E_tube=params['E_tube'], v_tube=params['v_tube'],
+            alpha_tube=params['alpha_tube'], dT_tube=params['dT_tube'],
+            unit_cost_tube=params['unit_cost_tube'], rho_pylon=params['rho_pylon'],
+            E_pylon=params['E_pylon'], Su_pylon=params['Su_pylon'], unit_cost_pylon=params['unit_cost_pylon'],
+            sf=params['sf'], g=params['g'])
+
+        for name in ('total_material_cost', 'm_prime', 'von_mises', 'delta', 'm_pylon', 'R', 'dx',
+                     't_crit', 'R_buckle'):
+            unknowns[name] = result[name]
 
 if __name__ == '__main__':
 
@@ -5,7 +5,7 @@ from hyperloop.Python.tube.tube_wall_temp import TubeTemp, TempBalance
 from hyperloop.Python.tube.tube_and_pylon import TubeAndPylon
 from hyperloop.Python.tube.propulsion_mechanics import PropulsionMechanics
 from hyperloop.Python.tube.tube_power import TubePower
-from hyperloop.Python.tube.steady_state_vacuum import SteadyStateVacuum
+from hyperloop.Python.tube.ideal_steady_state_vacuum import IdealSteadyStateVacuum
 from hyperloop.Python.tube.submerged_tube import SubmergedTube
 
 class TubeGroup(Group):
@@ -79,11 +79,27 @@ class TubeGroup(Group):
     -------
     temp_boundary : float
         Ambient temperature inside tube (K)
+
+    Notes
+    -----
+    ``vacuum_model`` selects the steady state vacuum model: 'pycycle' for
+    `SteadyStateVacuum` or 'ideal' for the closed-form
+    `IdealSteadyStateVacuum`. ``vacuum_stages`` sets the number of
+    intercooled pump stages of the ideal model.
     """
 
-    def __init__(self):
+    def __init__(self, vacuum_model='pycycle', vacuum_stages=1):
         super(TubeGroup, self).__init__()
 
+        if vacuum_model == 'pycycle':
+            # pycycle is only needed by this model
+            from hyperloop.Python.tube.steady_state_vacuum import SteadyStateVacuum
+            steady_state_vacuum = SteadyStateVacuum()
+        elif vacuum_model == 'ideal':
+            steady_state_vacuum = IdealSteadyStateVacuum(n_stages=vacuum_stages)
+        else:
+            raise ValueError("vacuum_model must be 'pycycle' or 'ideal', not '%s'" % vacuum_model)
+
         # Adding in components to Tube Group
         self.add('Vacuum', Vacuum(), promotes=['tube_area',
         									                     'tube_length',
@@ -114,7 +130,7 @@ class TubeGroup(Group):
         self.add('TubePower', TubePower(), promotes=['num_thrust',
                                                      'time_thrust'])
 
-        self.add('SteadyStateVacuum', SteadyStateVacuum(), promotes = ['fl_start.W', 'comp.power', 'pod_period', 'L_pod'])
+        self.add('SteadyStateVacuum', steady_state_vacuum, promotes = ['fl_start.W', 'comp.power', 'pod_period', 'L_pod'])
 
         self.add('SubmergedTube', SubmergedTube(), promotes = ['depth'])
 
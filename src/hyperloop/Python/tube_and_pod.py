@@ -12,7 +12,7 @@ import numpy as np
 import matplotlib.pylab as plt 
 
 class TubeAndPod(Group):
-    def __init__(self):
+    def __init__(self, cycle_model='pycycle', vacuum_model='pycycle', vacuum_stages=1):
         """TODOs
 
         Params
@@ -83,15 +83,23 @@ class TubeAndPod(Group):
         ----------
         .. [1] Friend, Paul. Magnetic Levitation Train Technology 1. Thesis.
            Bradley University, 2004. N.p.: n.p., n.d. Print.
+
+        Notes
+        -----
+        ``cycle_model`` selects the pod compressor cycle, 'pycycle' or the
+        ideal-gas fast mode 'ideal', see `Cycle`. ``vacuum_model`` and
+        ``vacuum_stages`` select the steady state vacuum model of the tube,
+        'pycycle' or the closed-form 'ideal', see `TubeGroup`.
         """
         super(TubeAndPod, self).__init__()
 
-        self.add('tube', TubeGroup(), promotes=['pressure_initial', 'pwr', 'num_pods', 'Cd',
+        tube = TubeGroup(vacuum_model=vacuum_model, vacuum_stages=vacuum_stages)
+        self.add('tube', tube, promotes=['pressure_initial', 'pwr', 'num_pods', 'Cd',
                                               'speed', 'time_down', 'gamma', 'pump_weight',
                                               'electricity_price', 'tube_thickness', 'r_pylon',
                                               'tube_length', 'h', 'vf', 'v0', 'num_thrust', 'time_thrust', 
                                               'fl_start.W', 'depth', 'pod_period'])
-        self.add('pod', PodGroup(), promotes=['pod_mach', 'tube_pressure', 'comp.map.PRdes',
+        self.add('pod', PodGroup(cycle_model=cycle_model), promotes=['pod_mach', 'tube_pressure', 'comp.map.PRdes',
                                               'nozzle.Ps_exhaust', 'comp_inlet_area', 'des_time',
                                               'time_of_flight', 'motor_max_current', 'motor_LD_ratio',
                                               'motor_oversize_factor', 'inverter_efficiency', 'battery_cross_section_area',